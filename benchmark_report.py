@@ -0,0 +1,234 @@
+"""Benchmark PDF report generation against synthetic machine fleets.
+
+Example::
+
+    python benchmark_report.py --machines 100 --hours 24 --output bench.json
+
+Export directories are synthesised in the ``hourly_data_saving`` CSV format,
+then every requested layout/source combination is rendered in a fresh process
+so peak RSS is measured per run.  Every case reports exactly the synthetic
+machines, whatever layout the dashboard has saved.  Results are printed (or
+written) as JSON.
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None
+
+from hourly_data_saving import METRICS_FILENAME
+
+LAYOUTS = ("standard", "optimized")
+# ``csv`` reads the exports per report; ``aggregator`` renders from the
+# rolling aggregates used by scheduled reports
+SOURCES = ("csv", "aggregator")
+#: Seconds an isolated case may run before it is reported as failed.
+CASE_TIMEOUT = 600
+
+
+def synthesize_exports(export_dir, machines, hours=24, sample_seconds=60, seed=0,
+                       end=None):
+    """Write ``machines`` metrics CSVs covering ``hours`` up to ``end``.
+
+    Rows use the columns written by :func:`hourly_data_saving.append_metrics`
+    with one row every ``sample_seconds``.  Returns the number of rows per
+    machine.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now()
+    samples = max(1, int(hours * 3600 // sample_seconds))
+    fieldnames = (["timestamp", "capacity", "accepts", "rejects", "objects_per_min"]
+                  + [f"counter_{i}" for i in range(1, 13)] + ["mode"])
+
+    for machine in range(1, machines + 1):
+        machine_dir = os.path.join(export_dir, str(machine))
+        os.makedirs(machine_dir, exist_ok=True)
+        with open(os.path.join(machine_dir, METRICS_FILENAME), "w", newline="",
+                  encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(fieldnames)
+            for k in range(samples):
+                ts = end - timedelta(seconds=sample_seconds * (samples - k))
+                capacity = rng.uniform(1000, 2000)
+                rejects = rng.uniform(10, 50)
+                writer.writerow(
+                    [ts.strftime("%Y-%m-%d %H:%M:%S"), f"{capacity:.1f}",
+                     f"{capacity - rejects:.1f}", f"{rejects:.1f}", rng.randint(100, 200)]
+                    + [rng.randint(0, 30) for _ in range(12)]
+                    + ["live"]
+                )
+    return samples
+
+
+def synthetic_manifest(machines):
+    """Return the report manifest naming the machines of :func:`synthesize_exports`."""
+    return {str(machine): f"Machine {machine}" for machine in range(1, machines + 1)}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case(export_dir, layout="standard", source="csv", manifest=None):
+    """Render one report into a temporary file and return its measurements.
+
+    Both sources report the machines in ``manifest``; pass
+    :func:`synthetic_manifest` so they are compared on the same fleet.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout '{layout}'")
+    if source not in SOURCES:
+        raise ValueError(f"unknown source '{source}'")
+
+    import generate_report
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "report.pdf")
+        start = time.perf_counter()
+        if source == "aggregator":
+            aggregator = generate_report.ReportAggregator(export_dir)
+            aggregator.seed()
+            target = aggregator.dataset(manifest=manifest)
+        else:
+            target = generate_report.ReportDataset(export_dir, manifest)
+        if layout == "optimized":
+            pages = generate_report.draw_layout_optimized(pdf_path, target)
+        else:
+            pages = generate_report.draw_layout_standard(pdf_path, target)
+        wall_time = time.perf_counter() - start
+        size = os.path.getsize(pdf_path)
+
+    return {
+        "layout": layout,
+        "source": source,
+        "wall_time_s": round(wall_time, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+        "pages": pages,
+        "output_bytes": size,
+    }
+
+
+def _run_case_in_child(args, results):
+    results.put(run_case(*args))
+
+
+def run_isolated(export_dir, layout, source, manifest=None, timeout=CASE_TIMEOUT):
+    """Run :func:`run_case` in a fresh process so peak RSS covers one report.
+
+    A child that crashes or runs longer than ``timeout`` seconds yields a
+    result with an ``error`` field instead of measurements.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_run_case_in_child,
+                       args=((export_dir, layout, source, manifest), results))
+    proc.start()
+    deadline = time.monotonic() + timeout
+    error = None
+    while True:
+        try:
+            result = results.get(timeout=1)
+            break
+        except queue.Empty:
+            if not proc.is_alive():
+                # The result may still be in flight from a child that just exited
+                try:
+                    result = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    error = f"benchmark process exited with code {proc.exitcode}"
+            elif time.monotonic() > deadline:
+                proc.terminate()
+                error = f"timed out after {timeout}s"
+            if error:
+                break
+    proc.join()
+    if error:
+        return {"layout": layout, "source": source, "error": error}
+    return result
+
+
+def run_benchmark(machines, hours=24, sample_seconds=60, layouts=LAYOUTS,
+                  sources=("csv",), export_dir=None, isolate=True, seed=0):
+    """Synthesise a fleet and benchmark each layout/source combination."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_dir = export_dir or tmp_dir
+        synth_start = time.perf_counter()
+        rows = synthesize_exports(export_dir, machines, hours, sample_seconds, seed)
+        synth_time = time.perf_counter() - synth_start
+
+        manifest = synthetic_manifest(machines)
+        runner = run_isolated if isolate else run_case
+        results = [runner(export_dir, layout, source, manifest)
+                   for source in sources for layout in layouts]
+
+    return {
+        "config": {
+            "machines": machines,
+            "hours": hours,
+            "sample_seconds": sample_seconds,
+            "rows_per_machine": rows,
+            "synthesis_time_s": round(synth_time, 3),
+            "cpu_count": os.cpu_count(),
+            "python": sys.version.split()[0],
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF report generation")
+    parser.add_argument("--machines", type=int, default=100)
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--sample-seconds", type=int, default=60,
+                        help="Seconds between synthetic samples (default: %(default)s)")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS),
+                        help="Comma separated layouts to run (default: %(default)s)")
+    parser.add_argument("--sources", default="csv",
+                        help=f"Comma separated inputs from {', '.join(SOURCES)} (default: %(default)s)")
+    parser.add_argument("--export-dir", help="Keep the synthetic exports in this directory")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    layouts = [name for name in args.layouts.split(",") if name]
+    sources = [name for name in args.sources.split(",") if name]
+    for name in layouts:
+        if name not in LAYOUTS:
+            parser.error(f"unknown layout '{name}'")
+    for name in sources:
+        if name not in SOURCES:
+            parser.error(f"unknown source '{name}'")
+
+    report = run_benchmark(args.machines, args.hours, args.sample_seconds,
+                           layouts, sources, export_dir=args.export_dir)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
+
+    failed = [r for r in report["results"] if "error" in r]
+    for result in failed:
+        print(f"{result['layout']}/{result['source']} failed: {result['error']}",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,6 +38,8 @@ from .settings import (
     save_email_settings,
     load_threshold_settings,
     save_threshold_settings,
+    load_report_schedules,
+    save_report_schedules,
     convert_capacity_from_kg,
     convert_capacity_to_lbs,
     convert_capacity_from_lbs,
@@ -53,6 +55,7 @@ from .layout import (
     render_floor_machine_layout_enhanced_with_selection,
 )
 from . import callbacks  # noqa: F401 - register callbacks
+from . import report_routes  # noqa: F401 - register report download route
 
 __all__ = [
     "app",
@@ -83,6 +86,8 @@ __all__ = [
     "save_email_settings",
     "load_threshold_settings",
     "save_threshold_settings",
+    "load_report_schedules",
+    "save_report_schedules",
     "convert_capacity_from_kg",
     "convert_capacity_to_lbs",
     "convert_capacity_from_lbs",
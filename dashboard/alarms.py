@@ -0,0 +1,152 @@
+"""Sensitivity threshold alarms evaluated once per poll cycle.
+
+The OPC update thread calls :meth:`AlarmEngine.check` with the latest defect
+counters of every connected machine.  Violation state is kept per machine and
+counter, so alarms and threshold emails work whether or not a dashboard is
+open, and section 6-2 only reads :meth:`AlarmEngine.active`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+from .trends import COUNTER_COUNT, DEFECT_COUNT_TAG
+
+logger = logging.getLogger(__name__)
+
+#: Key carrying :attr:`AlarmEngine.seq` in the live update stream.
+ALARM_SEQ_KEY = "alarm-seq"
+
+
+def machine_counters(connection: dict) -> list:
+    """Return the defect counters of one ``machine_connections`` entry."""
+    tags = connection.get("tags") or {}
+    counters = []
+    for i in range(1, COUNTER_COUNT + 1):
+        info = tags.get(DEFECT_COUNT_TAG.format(i))
+        data = info.get("data") if isinstance(info, dict) else None
+        value = getattr(data, "latest_value", None)
+        counters.append(value if value is not None else 0)
+    return counters
+
+
+def _default_notify(machine_id: Hashable, counter: int, is_high: bool) -> bool:
+    from .email_utils import queue_threshold_email  # runtime import to avoid cycle
+
+    address = alarm_engine.settings.get("email_address", "")
+    # A digest that exhausts its retries re-arms the alarm for the next cycle;
+    # a refused address keeps it latched so it is not retried every cycle
+    return queue_threshold_email(
+        address, counter, is_high, machine_id,
+        on_failure=lambda: alarm_engine.rearm(machine_id, counter),
+    )
+
+
+class AlarmEngine:
+    """Per-machine threshold violation tracking with a change sequence.
+
+    ``notify(machine_id, counter, is_high)`` is called once per violation that
+    lasts ``email_minutes`` while email alerts are enabled; it returns whether
+    the notification was accepted, and a refused one is retried on the next
+    cycle.  The default queues a digest email without waiting for the server
+    and calls :meth:`rearm` if the email is given up after its retries.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[dict] = None,
+        notify: Optional[Callable[[Hashable, int, bool], bool]] = None,
+    ) -> None:
+        self.settings = settings if settings is not None else {}
+        self.notify = notify or _default_notify
+        self.seq = 0
+        self._states: Dict[Hashable, dict] = {}
+        self._active: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, settings: dict) -> None:
+        """Use ``settings`` (the threshold settings dictionary) from now on."""
+        self.settings = settings
+
+    def _evaluate(
+        self, machine_id: Hashable, counters: list, now: float, due: list
+    ) -> tuple:
+        settings = self.settings
+        email_enabled = settings.get("email_enabled")
+        email_seconds = (settings.get("email_minutes") or 2) * 60
+        states = self._states.setdefault(machine_id, {})
+        alarms = []
+        for i, val in enumerate(counters, 1):
+            limits = settings.get(i, {})
+            violation = False
+            is_high = False
+            if limits.get("min_enabled") and val < limits.get("min_value", 0):
+                alarms.append(f"Sens. {i} below min")
+                violation = True
+            elif limits.get("max_enabled") and val > limits.get("max_value", 0):
+                alarms.append(f"Sens. {i} above max")
+                violation = True
+                is_high = True
+
+            if not violation:
+                states.pop(i, None)
+                continue
+            state = states.get(i)
+            if state is None:
+                state = states[i] = {"since": now, "email_sent": False}
+            if (
+                email_enabled
+                and not state["email_sent"]
+                and now - state["since"] >= email_seconds
+            ):
+                due.append((state, machine_id, i, is_high))
+        return tuple(alarms)
+
+    def check(self, machines: Dict[Hashable, list], now: Optional[float] = None) -> bool:
+        """Evaluate the counters of every machine in ``machines``.
+
+        Machines missing from ``machines`` are dropped with their alarms.
+        Returns ``True`` when any machine's active alarms changed.
+        """
+        now = time.monotonic() if now is None else now
+        due: list = []
+        with self._lock:
+            active = {
+                machine_id: self._evaluate(machine_id, counters, now, due)
+                for machine_id, counters in machines.items()
+            }
+            for machine_id in list(self._states):
+                if machine_id not in machines:
+                    del self._states[machine_id]
+            changed = active != self._active
+            if changed:
+                self.seq += 1
+                self._active = active
+
+        # Notify outside the lock so readers never wait on the mail server
+        for state, machine_id, counter, is_high in due:
+            try:
+                state["email_sent"] = bool(self.notify(machine_id, counter, is_high))
+            except Exception as exc:  # pragma: no cover - notifier errors
+                logger.error("Error sending threshold alarm for %s: %s", machine_id, exc)
+        return changed
+
+    def rearm(self, machine_id: Hashable, counter: int) -> None:
+        """Notify again for a violation whose notification was lost."""
+        with self._lock:
+            state = self._states.get(machine_id, {}).get(counter)
+            if state is not None:
+                state["email_sent"] = False
+
+    def active(self, machine_id: Hashable) -> tuple:
+        """Return the active alarm messages of ``machine_id``."""
+        with self._lock:
+            return self._active.get(machine_id, ())
+
+
+alarm_engine = AlarmEngine()
+
+__all__ = ["ALARM_SEQ_KEY", "AlarmEngine", "alarm_engine", "machine_counters"]
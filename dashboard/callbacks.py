@@ -6,11 +6,10 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-import base64
-import tempfile
 import copy
+import hashlib
+import time
 import generate_report
-from .email_utils import send_threshold_email
 
 # ``dash`` is optional during testing so fall back to light stubs when missing.
 try:  # pragma: no cover - optional dependency
@@ -64,6 +63,11 @@ except Exception:  # pragma: no cover - provide minimal stubs
 
     dbc = _BootstrapModule()  # type: ignore
 
+try:  # pragma: no cover - ``Patch`` was added in Dash 2.9
+    from dash import Patch  # type: ignore
+except Exception:  # pragma: no cover - fall back to full section renders
+    Patch = None  # type: ignore
+
 from .app import app
 
 try:  # pragma: no cover - handle missing ``callback`` attribute
@@ -96,13 +100,39 @@ from .settings import (
     load_weight_preference,
     load_theme_preference,
     save_theme_preference,
+    settings_writer,
 )
 from .layout import (
     render_new_dashboard,
     render_floor_machine_layout_with_customizable_names,
+    MACHINE_CARD_FIELDS,
     build_machine_card,
+    machine_card_class,
+    machine_card_connection,
 )
 from .images import save_uploaded_image
+from .live_updates import HEARTBEAT_INTERVAL_MS
+from .machine_summary import (
+    CAPACITY_TAG,
+    FEEDER_RUNNING_TAG,
+    GLOBAL_FAULT_TAG,
+    GLOBAL_WARNING_TAG,
+    MODEL_TAG,
+    PRESET_NAME_TAG,
+    PRESET_NUMBER_TAG,
+    SERIAL_TAG,
+    machine_summaries,
+)
+from .alarms import alarm_engine
+from .figures import build_figure
+from .trends import (
+    DEFECT_COUNT_TAG,
+    OBJECTS_PER_MIN_TAG,
+    TREND_WINDOW,
+    trend_buffers,
+)
+from .report_jobs import report_jobs
+from .report_routes import report_url
 
 
 from i18n import tr
@@ -115,29 +145,21 @@ LAYOUT_PATH = DATA_DIR / "floor_machine_layout.json"
 
 NUMERIC_FONT = "Monaco, Consolas, 'Courier New', monospace"
 
-previous_counter_values = [0] * 12
-active_alarms: list[str] = []
 machine_control_log: list[dict] = []
 threshold_settings = load_threshold_settings() or {}
-production_history: list[float] = []
-counter_history = {i: [] for i in range(1, 13)}
-last_email_times = {i: None for i in range(1, 13)}
-threshold_violation_state = {
-    i: {
-        "is_violating": False,
-        "violation_start_time": None,
-        "email_sent": False,
-    }
-    for i in range(1, 13)
-}
+# Alarms are evaluated by the OPC poller; edits to this dict apply at once
+alarm_engine.configure(threshold_settings)
 
 
 def _save_floor_machine_data(floors_data: dict, machines_data: dict) -> bool:
-    """Persist floor/machine layout to ``data/floor_machine_layout.json``."""
+    """Persist floor/machine layout to ``data/floor_machine_layout.json``.
+
+    Edits arriving in quick succession are coalesced into one atomic write.
+    """
     try:
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(LAYOUT_PATH, "w") as fh:
-            json.dump({"floors": floors_data, "machines": machines_data}, fh, indent=4)
+        settings_writer.write(
+            LAYOUT_PATH, {"floors": floors_data, "machines": machines_data}
+        )
         return True
     except Exception as exc:  # pragma: no cover - filesystem errors
         logger.error("Error saving floor/machine data: %s", exc)
@@ -168,11 +190,781 @@ def _ordinal_suffix(n: int) -> str:
         suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
     return f"{n}{suffix}"
 
-# ``send_threshold_email`` is provided by ``email_utils`` to avoid duplication.
 
+#: Machine cards shown per page of the floor grid.
+MACHINE_PAGE_SIZE = 24
+
+
+def _to_float(val: object) -> float:
+    try:
+        return float(str(val).replace(",", ""))
+    except Exception:
+        return 0.0
+
+
+def _machine_totals(machines: list) -> dict:
+    """Return capacity, accepts and rejects summed over ``machines`` in one pass."""
+    totals = {"capacity": 0.0, "accepts": 0.0, "rejects": 0.0}
+    for machine in machines:
+        for name in totals:
+            totals[name] += _to_float(machine.get(name))
+    return totals
+
+
+def _machine_totals_text(machines: list, pref: dict) -> dict:
+    """Return the floor totals of ``machines`` formatted for the summary card."""
+    totals = _machine_totals(machines)
+    return {
+        "capacity": f"{totals['capacity']:,.0f} {capacity_unit_label(pref)}",
+        "accepts": f"{totals['accepts']:,.0f} {capacity_unit_label(pref, False)}",
+        "rejects": f"{totals['rejects']:,.0f} {capacity_unit_label(pref, False)}",
+    }
+
+
+def _floor_machines(floors_data: dict, machines_data: dict) -> list:
+    """Return the machines on the selected floor, or all of them."""
+    selected = floors_data.get("selected_floor", "all")
+    machines = machines_data.get("machines", [])
+    if selected != "all":
+        # Cast IDs to strings to avoid type mismatch when filtering by floor
+        machines = [m for m in machines if str(m.get("floor_id")) == str(selected)]
+    return machines
+
+
+def _machine_page(machines: list, page, page_size: int = MACHINE_PAGE_SIZE) -> tuple:
+    """Return ``(machines on page, page, page count)`` for a 1-based ``page``.
 
+    Out of range pages are clamped, so a shrinking floor stays on its last page.
+    """
+    pages = max(1, -(-len(machines) // page_size))
+    try:
+        page = int(page or 1)
+    except (TypeError, ValueError):
+        page = 1
+    page = min(max(page, 1), pages)
+    start = (page - 1) * page_size
+    return machines[start:start + page_size], page, pages
+
+def _apply_machine_summaries(machines: list, summaries, pref: dict) -> list:
+    """Return ``machines`` with the live fields of their summary records.
+
+    Records are matched on the machine id, then on the machine's IP address.
+    Production figures are converted to the weight unit of ``pref``.
+    """
+    records = (summaries or {}).get("machines") or {}
+    if not records:
+        return machines
+    by_ip = {rec.get("ip"): rec for rec in records.values() if rec.get("ip")}
+    merged = []
+    for machine in machines:
+        record = (
+            records.get(str(machine.get("id")))
+            or by_ip.get(machine.get("selected_ip"))
+            or by_ip.get(machine.get("ip"))
+        )
+        if record is None:
+            merged.append(machine)
+            continue
+        machine = dict(machine, connected=record["connected"], status=record["status"])
+        if record["connected"]:
+            machine.update(
+                {name: record[name] for name in ("serial", "model", "preset", "feeder")}
+            )
+            for name in ("capacity", "accepts", "rejects"):
+                value = convert_capacity_from_kg(record[name], pref)
+                machine[name] = f"{value:,.0f}"
+        merged.append(machine)
+    return merged
+
+
+# Live dashboard sections refreshed by the single ``status-update-interval`` tick
+LIVE_SECTIONS = [
+    "section-1-1",
+    "section-1-2",
+    "section-2",
+    "section-3-2",
+    "section-4",
+    "section-5-1",
+    "section-5-2",
+    "section-6-1",
+    "section-6-2",
+    "section-7-1",
+    "section-7-2",
+]
+
+# Trend graph index -> section that contains it
+TREND_SECTIONS = {"production": "section-5-1", "counters": "section-6-1"}
+
+ACCEPTS_TAG = "Status.Production.Accepts"
+REJECTS_TAG = "Status.Production.Rejects"
+FEEDER_RATE_TAG = "Status.Feeders.{}Rate"
+SENSITIVITY_NAME_TAG = "Settings.ColorSort.Primary{}.Name"
+AIR_PRESSURE_TAG = "Status.Environmental.AirPressurePsi"
+
+LIVE_TAGS = [
+    CAPACITY_TAG,
+    ACCEPTS_TAG,
+    REJECTS_TAG,
+    SERIAL_TAG,
+    MODEL_TAG,
+    PRESET_NUMBER_TAG,
+    PRESET_NAME_TAG,
+    GLOBAL_FAULT_TAG,
+    GLOBAL_WARNING_TAG,
+    OBJECTS_PER_MIN_TAG,
+    AIR_PRESSURE_TAG,
+    *(FEEDER_RUNNING_TAG.format(i) for i in range(1, 5)),
+    *(FEEDER_RATE_TAG.format(i) for i in range(1, 5)),
+    *(SENSITIVITY_NAME_TAG.format(i) for i in range(1, 13)),
+    *(DEFECT_COUNT_TAG.format(i) for i in range(1, 13)),
+]
+
+
+# Tags each live section displays.  A section is only recomputed when one of
+# these tags has a newer version than the client last saw, or when the shared
+# display context (language, units, connection, thresholds, log) changes.
+_DEFECT_TAGS = [DEFECT_COUNT_TAG.format(i) for i in range(1, 13)]
+SECTION_TAGS = {
+    "section-1-1": [CAPACITY_TAG, ACCEPTS_TAG, REJECTS_TAG],
+    "section-1-2": [ACCEPTS_TAG, REJECTS_TAG, *_DEFECT_TAGS],
+    "section-2": [
+        PRESET_NUMBER_TAG,
+        PRESET_NAME_TAG,
+        GLOBAL_FAULT_TAG,
+        GLOBAL_WARNING_TAG,
+        *(FEEDER_RUNNING_TAG.format(i) for i in range(1, 5)),
+        *(FEEDER_RATE_TAG.format(i) for i in range(1, 5)),
+    ],
+    "section-3-2": [SERIAL_TAG, MODEL_TAG],
+    "section-4": [SENSITIVITY_NAME_TAG.format(i) for i in range(1, 13)],
+    "section-5-1": [OBJECTS_PER_MIN_TAG],
+    "section-5-2": _DEFECT_TAGS,
+    "section-6-1": _DEFECT_TAGS,
+    "section-6-2": [],
+    "section-7-1": [AIR_PRESSURE_TAG],
+    "section-7-2": [],
+}
+
+# Minimum seconds between recomputes of a section whose tags changed.
+# ``live`` sections follow every poll cycle, ``slow`` ones are redrawn on the
+# heartbeat tick at most, and ``on-change`` sections show operator-set data
+# that should appear as soon as it changes but never needs a timer.
+REFRESH_PERIODS = {
+    "live": 0,
+    "slow": HEARTBEAT_INTERVAL_MS / 1000,
+    "on-change": 0,
+}
+SECTION_REFRESH = {
+    "section-1-1": "live",
+    "section-1-2": "slow",
+    "section-2": "on-change",
+    "section-3-2": "on-change",
+    "section-4": "on-change",
+    "section-5-1": "live",
+    "section-5-2": "live",
+    "section-6-1": "live",
+    "section-6-2": "on-change",
+    "section-7-1": "slow",
+    "section-7-2": "on-change",
+}
+
+
+def read_live_versions() -> dict:
+    """Return the version of each live tag; ``0`` means never received."""
+    tags = app_state.tags
+    versions = {}
+    for name in LIVE_TAGS:
+        info = tags.get(name)
+        if info is not None:
+            versions[name] = getattr(info.get("data"), "version", 0)
+    return versions
+
+
+def read_live_snapshot() -> dict:
+    """Return the latest value of each tag shown on the live dashboard.
+
+    Tags that are missing or have no value yet are left out, and the snapshot
+    is empty while disconnected.
+    """
+    if not app_state.connected:
+        return {}
+    tags = app_state.tags
+    values = {}
+    for name in LIVE_TAGS:
+        info = tags.get(name)
+        if info is None:
+            continue
+        value = getattr(info.get("data"), "latest_value", None)
+        if value is not None:
+            values[name] = value
+    return values
+
+
+def _section_due(section_id, versions: dict, seen: dict, refreshed: dict,
+                 now: float) -> bool:
+    """Return whether a section has newer tags and its refresh period elapsed."""
+    last = seen.get(section_id, 0)
+    if not any(versions.get(tag, 0) > last for tag in SECTION_TAGS[section_id]):
+        return False
+    period = REFRESH_PERIODS[SECTION_REFRESH[section_id]]
+    return now - refreshed.get(section_id, 0) >= period
 
 
+def _section_signature(key) -> str:
+    """Return a short digest of the inputs a section was rendered from."""
+    return hashlib.md5(repr(key).encode("utf-8")).hexdigest()[:12]
+
+
+def _leaf_signatures(leaves: dict) -> dict:
+    return {name: _section_signature(value) for name, value in leaves.items()}
+
+
+def _graph(fig, **props):
+    return dcc.Graph(
+        figure=fig,
+        **props,
+        config={"displayModeBar": False},
+        style={"width": "100%", "height": "100%"},
+    )
+
+
+def read_trend_view():
+    """Return the trend samples of the connected machine.
+
+    The buffers are filled by the OPC poller; callbacks only read copies.
+    """
+    return trend_buffers.view(app_state.machine_id)
+
+
+def _trend_x(trend, count: int) -> list:
+    """Return the sample numbers of the newest ``count`` trend points."""
+    return list(range(trend.samples - count, trend.samples))
+
+
+def _trend_extension(trend, graph: str, since) -> tuple:
+    """Return ``extendData`` adding the samples of ``trend`` after ``since``.
+
+    The result is ``(data, trace_indices, max_points)`` as expected by
+    ``dcc.Graph.extendData``.
+    """
+    if since is None or since > trend.samples:
+        count = TREND_WINDOW
+    else:
+        count = min(trend.samples - since, TREND_WINDOW)
+    if graph == "production":
+        histories = [trend.production]
+    else:
+        histories = list(trend.counters)
+    count = min(count, *(len(hist) for hist in histories))
+    x = _trend_x(trend, count)
+    data = {
+        "x": [x for _ in histories],
+        "y": [list(hist[len(hist) - count:]) for hist in histories],
+    }
+    return data, list(range(len(histories))), TREND_WINDOW
+
+
+def _production_values(values: dict, pref: dict) -> tuple:
+    """Return capacity, accepts and rejects converted to the weight unit."""
+    return (
+        convert_capacity_from_kg(values.get(CAPACITY_TAG, 0), pref),
+        convert_capacity_from_kg(values.get(ACCEPTS_TAG, 0), pref),
+        convert_capacity_from_kg(values.get(REJECTS_TAG, 0), pref),
+    )
+
+
+def _leaf(*indices, prop: str = "children") -> tuple:
+    """Return the patch path of ``prop`` on a component nested in a section.
+
+    ``indices`` walk ``children`` lists from the section's root component.
+    """
+    path: list = []
+    for index in indices:
+        path += ["props", "children", index]
+    return (*path, "props", prop)
+
+
+# Leaf properties updated in place once a section's skeleton is on the page
+SECTION_LEAVES = {
+    "section-1-1": {
+        "capacity": _leaf(1),
+        "accepts": _leaf(2),
+        "rejects": _leaf(3),
+    },
+    "section-2": {
+        "preset": _leaf(1),
+        "status": _leaf(2),
+        "status_style": _leaf(2, prop="style"),
+        "feeder": _leaf(3),
+        "feeder_style": _leaf(3, prop="style"),
+        **{f"rate_{i}": _leaf(4, i - 1) for i in range(1, 5)},
+        **{f"rate_style_{i}": _leaf(4, i - 1, prop="style") for i in range(1, 5)},
+    },
+    "section-3-2": {
+        "serial": _leaf(1),
+        "model": _leaf(2),
+        "status": _leaf(3),
+    },
+    "section-4": {f"name_{i}": _leaf(1, i - 1) for i in range(1, 13)},
+}
+
+
+def _leaf_patch(leaves: dict, paths: dict):
+    """Return a ``Patch`` setting each of ``leaves`` at its path."""
+    patch = Patch()
+    for name, value in leaves.items():
+        target = patch
+        *parents, last = paths[name]
+        for key in parents:
+            target = target[key]
+        target[last] = value
+    return patch
+
+
+def _section_1_1_leaves(total_capacity, accepts, rejects, pref, lang) -> dict:
+    total = accepts + rejects
+    acc_pct = accepts / total * 100 if total else 0
+    rej_pct = rejects / total * 100 if total else 0
+    return {
+        "capacity": f"{total_capacity:,.0f} {capacity_unit_label(pref)}",
+        "accepts": f"{tr('accepts', lang)}: {accepts:,.0f} {capacity_unit_label(pref, False)} ({acc_pct:.1f}%)",
+        "rejects": f"{tr('rejects', lang)}: {rejects:,.0f} {capacity_unit_label(pref, False)} ({rej_pct:.1f}%)",
+    }
+
+
+def _render_section_1_1(leaves, lang):
+    return html.Div(
+        [
+            html.H6(tr("production_capacity_title", lang), className="text-left mb-2"),
+            html.Div(leaves["capacity"], className="fw-bold"),
+            html.Div(leaves["accepts"], className="small"),
+            html.Div(leaves["rejects"], className="small"),
+        ]
+    )
+
+
+def _render_section_1_2(accepts, rejects, counters, lang, theme="light"):
+    graph1 = _graph(
+        build_figure("split-pie", theme, lang, {"values": [accepts, rejects]})
+    )
+
+    total_counter = sum(counters)
+    labels = [str(i) for i, v in enumerate(counters, 1) if v > 0]
+    values = (
+        [v / total_counter * 100 for v in counters if v > 0] if total_counter else []
+    )
+    if values:
+        graph2 = _graph(
+            build_figure("counter-pie", theme, lang, {"labels": labels, "values": values})
+        )
+    else:
+        graph2 = html.Div(tr("no_changes_yet", lang))
+
+    return html.Div(
+        [
+            html.Div(graph1, className="col-6"),
+            html.Div(graph2, className="col-6"),
+        ],
+        className="row",
+    )
+
+
+def _machine_status(values: dict) -> dict:
+    """Return the preset, fault and feeder state shown in section 2."""
+    parts = []
+    if PRESET_NUMBER_TAG in values:
+        parts.append(str(values[PRESET_NUMBER_TAG]))
+    if values.get(PRESET_NAME_TAG):
+        parts.append(str(values[PRESET_NAME_TAG]))
+    return {
+        "preset": " ".join(parts) if parts else "N/A",
+        "fault": bool(values.get(GLOBAL_FAULT_TAG)),
+        "warning": bool(values.get(GLOBAL_WARNING_TAG)),
+        "running": any(
+            bool(values.get(FEEDER_RUNNING_TAG.format(i))) for i in range(1, 5)
+        ),
+        "rates": [values.get(FEEDER_RATE_TAG.format(i), 0) for i in range(1, 5)],
+    }
+
+
+def _section_2_leaves(status, lang) -> dict:
+    status_text = tr("good_status", lang)
+    status_style = {"backgroundColor": "#28a745", "color": "white"}
+    if status["fault"]:
+        status_text = tr("fault_status", lang)
+        status_style = {"backgroundColor": "#dc3545", "color": "white"}
+    elif status["warning"]:
+        status_text = tr("warning_status", lang)
+        status_style = {"backgroundColor": "#ffc107", "color": "black"}
+
+    running = status["running"]
+    feeder_style = {
+        "backgroundColor": "#28a745" if running else "#6c757d",
+        "color": "white",
+    }
+    leaves = {
+        "preset": status["preset"],
+        "status": status_text,
+        "status_style": status_style,
+        "feeder": tr("running_state", lang) if running else tr("stopped_state", lang),
+        "feeder_style": feeder_style,
+    }
+    for i, rate in enumerate(status["rates"], 1):
+        leaves[f"rate_{i}"] = f"F{i}: {rate}"
+        leaves[f"rate_style_{i}"] = feeder_style
+    return leaves
+
+
+def _render_section_2(leaves, lang):
+    """Display preset, status and feeder information."""
+    return html.Div(
+        [
+            html.H6(tr("machine_status_title", lang)),
+            html.Div(
+                leaves["preset"],
+                className="mb-1 p-1",
+                style={"backgroundColor": "#28a745", "color": "white"},
+            ),
+            html.Div(leaves["status"], className="mb-1 p-1", style=leaves["status_style"]),
+            html.Div(leaves["feeder"], className="mb-2 p-1", style=leaves["feeder_style"]),
+            html.Div(
+                [
+                    html.Div(
+                        leaves[f"rate_{i}"],
+                        className="me-1 p-1",
+                        style=leaves[f"rate_style_{i}"],
+                    )
+                    for i in range(1, 5)
+                ],
+                className="d-flex",
+            ),
+        ]
+    )
+
+
+def _render_section_3_1(image_src, lang):
+    """Show corporate image with a load button."""
+    if image_src:
+        image = html.Img(
+            src=image_src,
+            style={
+                "maxWidth": "100%",
+                "maxHeight": "130px",
+                "objectFit": "contain",
+                "display": "block",
+                "margin": "0 auto",
+            },
+        )
+    else:
+        image = html.Div(
+            "No custom image loaded",
+            className="text-muted text-center",
+            style={
+                "height": "130px",
+                "display": "flex",
+                "alignItems": "center",
+                "justifyContent": "center",
+            },
+        )
+
+    return html.Div(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(html.H6(tr("corporate_logo_title", lang)), width=8),
+                    dbc.Col(
+                        dbc.Button(
+                            tr("load_image_button", lang),
+                            id="load-additional-image",
+                            size="sm",
+                            color="primary",
+                        ),
+                        width=4,
+                    ),
+                ],
+                className="mb-2",
+            ),
+            image,
+        ]
+    )
+
+
+def _section_3_2_leaves(serial, model, connected, lang) -> dict:
+    status_text = tr("good_status", lang) if connected else tr("fault_status", lang)
+    return {
+        "serial": f"{tr('serial_number_label', lang)} {serial}",
+        "model": f"{tr('model_label', lang)} {model}",
+        "status": f"Status: {status_text}",
+    }
+
+
+def _render_section_3_2(leaves, lang):
+    return html.Div(
+        [
+            html.H6(tr("machine_info_title", lang)),
+            html.Div(leaves["serial"]),
+            html.Div(leaves["model"]),
+            html.Div(leaves["status"]),
+        ]
+    )
+
+
+def _section_4_leaves(names) -> dict:
+    return {f"name_{i}": f"{i}. {name}" for i, name in enumerate(names, 1)}
+
+
+def _render_section_4(leaves, lang):
+    """List sensitivity names."""
+    items = [html.Li(leaves[f"name_{i}"], className="mb-1") for i in range(1, 13)]
+    return html.Div(
+        [
+            html.H6(tr("sensitivities_title", lang)),
+            html.Ul(items, className="mb-0"),
+        ]
+    )
+
+
+def _render_section_5_1(trend, lang, theme="light"):
+    """Trend graph for production rate.
+
+    The figure is built once from the ``trend`` view; new samples are
+    appended by the tick through ``extendData``.
+    """
+    history = trend.production
+    fig = build_figure(
+        "production-trend",
+        theme,
+        lang,
+        {"x": _trend_x(trend, len(history)), "y": list(history)},
+    )
+    graph = _graph(fig, id={"type": "trend-graph", "index": "production"})
+    return html.Div(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(html.H6(tr("production_rate_objects_title", lang)), width=9),
+                    dbc.Col(
+                        dbc.Button(
+                            "Units",
+                            id={"type": "open-production-rate-units", "index": 0},
+                            size="sm",
+                            color="primary",
+                        ),
+                        width=3,
+                    ),
+                ],
+                className="mb-2",
+            ),
+            graph,
+        ]
+    )
+
+
+def _render_section_5_2(counters, theme="light"):
+    return _graph(build_figure("counter-bars", theme, None, {"y": list(counters)}))
+
+
+def _render_section_6_1(trend, lang, theme="light"):
+    """Trend graph for counter values, extended like section 5-1."""
+    fig = build_figure(
+        "counter-trend",
+        theme,
+        lang,
+        *({"x": _trend_x(trend, len(hist)), "y": list(hist)} for hist in trend.counters),
+    )
+    graph = _graph(fig, id={"type": "trend-graph", "index": "counters"})
+    return html.Div(
+        [
+            dbc.Row(
+                [
+                    dbc.Col(html.H6(tr("counter_values_trend_title", lang)), width=9),
+                    dbc.Col(
+                        dbc.Button(
+                            "Display",
+                            id={"type": "open-display", "index": 0},
+                            size="sm",
+                            color="primary",
+                        ),
+                        width=3,
+                    ),
+                ],
+                className="mb-2",
+            ),
+            graph,
+        ]
+    )
+
+
+def _render_section_6_2(alarms, lang):
+    if alarms:
+        mid = len(alarms) // 2 + len(alarms) % 2
+        left = [html.Li(a, className="text-danger mb-1") for a in alarms[:mid]]
+        right = [html.Li(a, className="text-danger mb-1") for a in alarms[mid:]]
+        alarm_display = html.Div(
+            [
+                html.Div(
+                    tr("active_alarms_title", lang),
+                    className="fw-bold text-danger mb-2",
+                ),
+                html.Div(
+                    [
+                        html.Ul(left, className="ps-3 mb-0 col-6"),
+                        html.Ul(right, className="ps-3 mb-0 col-6"),
+                    ],
+                    className="row",
+                ),
+            ]
+        )
+    else:
+        alarm_display = html.Div(tr("no_changes_yet", lang), className="text-success")
+
+    return html.Div(
+        [
+            html.H6(tr("sensitivity_threshold_alarms_title", lang)),
+            alarm_display,
+        ]
+    )
+
+
+def _render_section_7_1(value, lang):
+    """Air pressure gauge display."""
+    try:
+        import plotly.graph_objects as go
+
+        fig = go.Figure(
+            go.Indicator(
+                mode="gauge+number",
+                value=value,
+                gauge={"axis": {"range": [0, 100]}},
+            )
+        )
+        fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
+        graph = _graph(fig)
+    except Exception:  # pragma: no cover - plotly missing
+        graph = html.Div(str(value))
+    return html.Div(
+        [
+            html.H6(tr("air_pressure_title", lang)),
+            graph,
+        ]
+    )
+
+
+def _render_section_7_2(entries, lang):
+    rows = []
+    for idx, entry in enumerate(entries, start=1):
+        ts = entry.get("timestamp", "")
+        desc = f"{entry.get('tag', '')} {entry.get('action', '')}".strip()
+        if desc:
+            rows.append(html.Div(f"{idx}. {desc} {ts}", className="mb-1 small"))
+    if not rows:
+        rows.append(html.Div(tr("no_changes_yet", lang), className="text-muted"))
+
+    return html.Div(
+        [
+            html.H6(tr("machine_control_log_title", lang)),
+            *rows,
+        ]
+    )
+
+
+def live_section_renderers(values: dict, trend, pref: dict, lang: str,
+                           sections=None, theme: str = "light") -> dict:
+    """Return ``{section_id: (key, render, leaves)}`` for the live sections.
+
+    ``key`` captures everything the section's skeleton displays so unchanged
+    sections can be skipped, and ``render`` builds the component only when
+    needed.  Sections listed in :data:`SECTION_LEAVES` also return their live
+    ``leaves`` so a mounted skeleton can be patched in place; ``leaves`` is
+    ``None`` for the others.  Only ``sections`` (default: all) are computed.
+    ``trend`` is the machine's :class:`~dashboard.trends.TrendView` and
+    ``theme`` selects the figure skeletons.
+    """
+    counters = tuple(trend.latest_counters)
+
+    def production():
+        capacity, accepts, rejects = _production_values(values, pref)
+        leaves = _section_1_1_leaves(capacity, accepts, rejects, pref, lang)
+        return (lang,), lambda: _render_section_1_1(leaves, lang), leaves
+
+    def production_split():
+        _, accepts, rejects = _production_values(values, pref)
+        return (
+            (accepts, rejects, counters, lang, theme),
+            lambda: _render_section_1_2(accepts, rejects, counters, lang, theme),
+            None,
+        )
+
+    def machine_status():
+        leaves = _section_2_leaves(_machine_status(values), lang)
+        return (lang,), lambda: _render_section_2(leaves, lang), leaves
+
+    def machine_info():
+        leaves = _section_3_2_leaves(
+            values.get(SERIAL_TAG, ""), values.get(MODEL_TAG, ""), app_state.connected, lang
+        )
+        return (lang,), lambda: _render_section_3_2(leaves, lang), leaves
+
+    def sensitivities():
+        names = [
+            values.get(SENSITIVITY_NAME_TAG.format(i)) or f"Primary {i}"
+            for i in range(1, 13)
+        ]
+        leaves = _section_4_leaves(names)
+        return (lang,), lambda: _render_section_4(leaves, lang), leaves
+
+    # Trend sections only re-render for the language, theme or another
+    # machine; new points are streamed into the graphs with ``extendData``
+    machine = app_state.machine_id
+
+    def production_trend():
+        return (
+            (lang, theme, machine),
+            lambda: _render_section_5_1(trend, lang, theme),
+            None,
+        )
+
+    def counter_bars():
+        return (counters, theme), lambda: _render_section_5_2(counters, theme), None
+
+    def counter_trend():
+        return (
+            (lang, theme, machine),
+            lambda: _render_section_6_1(trend, lang, theme),
+            None,
+        )
+
+    def alarms():
+        current = alarm_engine.active(machine)
+        return (current, lang), lambda: _render_section_6_2(current, lang), None
+
+    def air_pressure():
+        pressure = values.get(AIR_PRESSURE_TAG)
+        pressure = pressure / 100 if pressure is not None else 0
+        return (pressure, lang), lambda: _render_section_7_1(pressure, lang), None
+
+    def control_log():
+        entries = machine_control_log[:20]
+        return (entries, lang), lambda: _render_section_7_2(entries, lang), None
+
+    builders = {
+        "section-1-1": production,
+        "section-1-2": production_split,
+        "section-2": machine_status,
+        "section-3-2": machine_info,
+        "section-4": sensitivities,
+        "section-5-1": production_trend,
+        "section-5-2": counter_bars,
+        "section-6-1": counter_trend,
+        "section-6-2": alarms,
+        "section-7-1": air_pressure,
+        "section-7-2": control_log,
+    }
+    return {
+        section_id: builders[section_id]()
+        for section_id in (LIVE_SECTIONS if sections is None else sections)
+    }
+
 
 @_dash_callback(
     Output("theme-selector", "value", allow_duplicate=True),
@@ -270,71 +1062,242 @@ def register_callbacks() -> None:
         )
 
     @_dash_callback(
-        Output("section-1-1", "children"),
+        *[Output(section_id, "children") for section_id in LIVE_SECTIONS],
+        Output({"type": "trend-graph", "index": ALL}, "extendData"),
         Output("production-data-store", "data"),
-        Input("current-dashboard", "data"),
+        Output("section-signature-store", "data"),
         Input("status-update-interval", "n_intervals"),
+        Input("live-update-store", "data"),
+        Input("current-dashboard", "data"),
         State("production-data-store", "data"),
+        State("section-signature-store", "data"),
         State("weight-preference-store", "data"),
         State("language-preference-store", "data"),
+        State("theme-selector", "value"),
         prevent_initial_call=True,
     )
-    def update_production_section(which, n, production_data, weight_pref, lang):
-        """Update capacity display using latest OPC tag values."""
-        if which not in ("new", "main"):
-            return no_update, no_update
+    def update_dashboard_sections(
+        n, pushed, which, production_data, signatures, weight_pref, lang, theme=None
+    ):
+        """Refresh every live section from one snapshot of the tag values.
+
+        Runs when the live update stream delivers a delta, or on the
+        fallback interval while the stream is unavailable.  Each section's
+        inputs are hashed into the per-client ``section-signature-store`` and
+        only sections whose inputs changed since the last tick are sent;
+        sections with a mounted skeleton get a ``Patch`` of the changed leaf
+        properties instead of a new component tree.
+        Trend graphs that are already on the page receive just the samples
+        the poller recorded since the client's last tick; the tick itself
+        never records trend data, so any number of clients see one history.
+
+        The tick is gated on tag versions: when no live tag changed and no
+        trend sample was taken since the client's last tick, the display
+        context is the same and the alarm engine published nothing new, it returns
+        without computing anything, and otherwise only the sections listed in
+        :data:`SECTION_TAGS` for the changed tags are recomputed, no more often
+        than their class in :data:`SECTION_REFRESH` allows.
+        """
         pref = weight_pref or {"unit": "lb", "label": "lbs", "value": 1.0}
         lang = lang or "en"
+        theme = theme or "light"
+
+        # Switching dashboards mounts empty sections, so render all of them
+        triggered = [t.get("prop_id", "") for t in callback_context.triggered or []]
+        if any(prop.startswith("current-dashboard") for prop in triggered):
+            signatures = {}
+        signatures = dict(signatures or {})
+
+        versions = read_live_versions()
+        version = max(versions.values(), default=0)
+        context = _section_signature(
+            (
+                which,
+                lang,
+                theme,
+                pref,
+                app_state.connected,
+                app_state.machine_id,
+                threshold_settings,
+                machine_control_log[:20],
+            )
+        )
+        now = time.time()
+        seen = dict(signatures.get("seen") or {})
+        refreshed = dict(signatures.get("refreshed") or {})
+        if signatures.get("context") != context:
+            dirty = list(LIVE_SECTIONS)
+        else:
+            dirty = [
+                section_id
+                for section_id in LIVE_SECTIONS
+                if _section_due(section_id, versions, seen, refreshed, now)
+            ]
+        if which not in ("new", "main") and "section-1-1" in dirty:
+            dirty.remove("section-1-1")
+
+        trend = read_trend_view()
+        last_sample = signatures.get("trend-sample")
+        # Alarms come from the poller's engine rather than from tag versions
+        alarm_seq = alarm_engine.seq
+        if signatures.get("alarms") != alarm_seq and "section-6-2" not in dirty:
+            dirty.append("section-6-2")
+        if not dirty and last_sample == trend.samples:
+            raise PreventUpdate
 
-        cap_tag = "Status.ColorSort.Sort1.Throughput.KgPerHour.Current"
-        acc_tag = "Status.Production.Accepts"
-        rej_tag = "Status.Production.Rejects"
-
-        cap_val = acc_val = rej_val = 0
-        if app_state.connected:
-            if cap_tag in app_state.tags:
-                val = app_state.tags[cap_tag]["data"].latest_value
-                cap_val = val if val is not None else 0
-            if acc_tag in app_state.tags:
-                val = app_state.tags[acc_tag]["data"].latest_value
-                acc_val = val if val is not None else 0
-            if rej_tag in app_state.tags:
-                val = app_state.tags[rej_tag]["data"].latest_value
-                rej_val = val if val is not None else 0
-
-        total_capacity = convert_capacity_from_kg(cap_val, pref)
-        accepts = convert_capacity_from_kg(acc_val, pref)
-        rejects = convert_capacity_from_kg(rej_val, pref)
-
-        total = accepts + rejects
-        acc_pct = accepts / total * 100 if total else 0
-        rej_pct = rejects / total * 100 if total else 0
-
-        data = production_data or {}
-        data.update(
-            {"capacity": total_capacity, "accepts": accepts, "rejects": rejects}
+        values = read_live_snapshot()
+
+        for section_id in dirty:
+            seen[section_id] = version
+            refreshed[section_id] = now
+        signatures["context"] = context
+        signatures["alarms"] = alarm_seq
+        signatures["version"] = version
+        signatures["seen"] = seen
+        signatures["refreshed"] = refreshed
+
+        renderers = live_section_renderers(values, trend, pref, lang, dirty, theme)
+
+        outputs = {}
+        for section_id, (key, render, leaves) in renderers.items():
+            if leaves is not None and Patch is None:
+                # Without partial updates any leaf change re-renders the section
+                key, leaves = (key, leaves), None
+            leaf_key = f"{section_id}:leaves"
+            signature = _section_signature(key)
+            if signatures.get(section_id) != signature:
+                signatures[section_id] = signature
+                outputs[section_id] = render()
+                if leaves is not None:
+                    signatures[leaf_key] = _leaf_signatures(leaves)
+            elif leaves is not None:
+                previous = signatures.get(leaf_key) or {}
+                current = _leaf_signatures(leaves)
+                changed = {
+                    name: leaves[name]
+                    for name, leaf_sig in current.items()
+                    if previous.get(name) != leaf_sig
+                }
+                if changed:
+                    signatures[leaf_key] = current
+                    outputs[section_id] = _leaf_patch(changed, SECTION_LEAVES[section_id])
+
+        signatures["trend-sample"] = trend.samples
+        extensions = []
+        for graph in _trend_graph_outputs():
+            if TREND_SECTIONS.get(graph) in outputs or last_sample == trend.samples:
+                # Freshly rendered graphs already hold the latest samples
+                extensions.append(no_update)
+            else:
+                extensions.append(_trend_extension(trend, graph, last_sample))
+
+        if not outputs and all(ext is no_update for ext in extensions):
+            # Still record the versions this client has now seen
+            return (
+                *[no_update for _ in LIVE_SECTIONS],
+                extensions,
+                no_update,
+                signatures,
+            )
+
+        production = no_update
+        if "section-1-1" in outputs:
+            capacity, accepts, rejects = _production_values(values, pref)
+            production = dict(production_data or {})
+            production.update(
+                {"capacity": capacity, "accepts": accepts, "rejects": rejects}
+            )
+
+        return (
+            *[outputs.get(section_id, no_update) for section_id in LIVE_SECTIONS],
+            extensions,
+            production,
+            signatures,
         )
 
-        content = html.Div(
-            [
-                html.H6(
-                    tr("production_capacity_title", lang), className="text-left mb-2"
-                ),
-                html.Div(
-                    f"{total_capacity:,.0f} {capacity_unit_label(pref)}",
-                    className="fw-bold",
-                ),
-                html.Div(
-                    f"{tr('accepts', lang)}: {accepts:,.0f} {capacity_unit_label(pref, False)} ({acc_pct:.1f}%)",
-                    className="small",
-                ),
-                html.Div(
-                    f"{tr('rejects', lang)}: {rejects:,.0f} {capacity_unit_label(pref, False)} ({rej_pct:.1f}%)",
-                    className="small",
-                ),
-            ]
+    def _trend_graph_outputs() -> list:
+        """Return the indices of the trend graphs currently on the page."""
+        outputs_list = getattr(callback_context, "outputs_list", None) or []
+        if len(outputs_list) <= len(LIVE_SECTIONS):
+            return []
+        return [
+            output["id"]["index"] for output in outputs_list[len(LIVE_SECTIONS)]
+        ]
+
+    globals()["update_dashboard_sections"] = update_dashboard_sections
+
+    if hasattr(app, "clientside_callback"):
+        # Subscribe to the live update stream once per page.  The stream only
+        # carries the names of changed tags; each notice pokes
+        # ``live-update-store`` so the tick above runs and reads the values
+        # on the server when the poller publishes a change; polling
+        # drops to a heartbeat while the stream is connected.  A hidden tab
+        # closes the stream and stops polling, and catches up from a fresh
+        # snapshot when it becomes visible again.
+        app.clientside_callback(
+            """
+            function(config) {
+                const dc = window.dash_clientside;
+                if (!config || !dc.set_props || window.liveUpdates) {
+                    return dc.no_update;
+                }
+                const live = window.liveUpdates = {seq: 0, connected: false, source: null};
+                const poll = function(ms) {
+                    dc.set_props("status-update-interval", {interval: ms || config.poll, disabled: !ms});
+                };
+                const notify = function(changed) {
+                    dc.set_props("live-update-store", {data: {seq: live.seq, changed: changed}});
+                };
+                const open = function() {
+                    if (!window.EventSource) {
+                        poll(config.poll);
+                        return;
+                    }
+                    const source = live.source = new EventSource(config.url);
+                    source.addEventListener("snapshot", function(e) {
+                        const msg = JSON.parse(e.data);
+                        live.seq = msg.seq;
+                        live.connected = msg.connected;
+                        poll(config.heartbeat);
+                        notify(msg.tags);
+                    });
+                    source.addEventListener("delta", function(e) {
+                        const msg = JSON.parse(e.data);
+                        live.seq = msg.seq;
+                        live.connected = msg.connected;
+                        notify(msg.changed.concat(msg.removed));
+                    });
+                    source.onerror = function() {
+                        // EventSource reconnects on its own; poll until it does
+                        poll(config.poll);
+                    };
+                };
+                const close = function() {
+                    if (live.source) {
+                        live.source.close();
+                        live.source = null;
+                    }
+                    poll(0);
+                };
+                document.addEventListener("visibilitychange", function() {
+                    if (document.hidden) {
+                        close();
+                    } else if (!live.source) {
+                        poll(config.poll);
+                        open();
+                    }
+                });
+                if (document.hidden) {
+                    close();
+                } else {
+                    open();
+                }
+                return dc.no_update;
+            }
+            """,
+            Output("live-update-store", "data"),
+            Input("live-stream-config", "data"),
         )
-        return content, data
 
     @_dash_callback(
         Output("floors-data", "data", allow_duplicate=True),
@@ -533,20 +1496,50 @@ def register_callbacks() -> None:
                     return True, name, {"type": "machine", "id": mid}
         return no_update, no_update, no_update
 
+    @_dash_callback(
+        Output("machine-summary-store", "data"),
+        Input("status-update-interval", "n_intervals"),
+        Input("live-update-store", "data"),
+        State("machine-summary-store", "data"),
+    )
+    def update_machine_summary_store(n, pushed, current):
+        """Copy the poller's machine summaries to the browser when they change."""
+        snapshot = machine_summaries.snapshot()
+        if isinstance(current, dict) and current.get("seq") == snapshot["seq"]:
+            raise PreventUpdate
+        return snapshot
+
     @_dash_callback(
         Output("machines-container", "children"),
         Input("floors-data", "data"),
         Input("machines-data", "data"),
         Input("current-dashboard", "data"),
+        Input({"type": "machine-grid-page", "index": ALL}, "active_page"),
+        State("machine-summary-store", "data"),
     )
-    def render_machine_cards(floors_data, machines_data, which):
+    def render_machine_cards(floors_data, machines_data, which, pages=None,
+                             summaries=None):
+        """Render one page of machine cards and the floor's production totals.
+
+        Only the :data:`MACHINE_PAGE_SIZE` cards on the current page are built
+        and sent, however many machines the floor has; the totals still cover
+        every machine on the floor.  Live values come from the shared
+        ``machine-summary-store`` snapshot, and later snapshots only update
+        them in place (see :func:`update_machine_cards`), so open dropdowns
+        on the cards are not reset every poll cycle.
+        """
         if which != "new":
             return no_update
-        selected = floors_data.get("selected_floor", "all")
-        machines = machines_data.get("machines", [])
-        if selected != "all":
-            # Cast IDs to strings to avoid type mismatch when filtering by floor
-            machines = [m for m in machines if str(m.get("floor_id")) == str(selected)]
+        machines = _floor_machines(floors_data, machines_data)
+
+        # A different floor starts from its first page
+        triggered = [t.get("prop_id", "") for t in callback_context.triggered or []]
+        page = pages[0] if pages else 1
+        if any(prop.startswith("floors-data") for prop in triggered):
+            page = 1
+        pref = load_weight_preference()
+        machines = _apply_machine_summaries(machines, summaries, pref)
+        page_machines, page, page_count = _machine_page(machines, page)
         from .settings import load_ip_addresses
 
         data = load_ip_addresses()
@@ -561,28 +1554,16 @@ def register_callbacks() -> None:
             ]
 
         cols = [
-            dbc.Col(build_machine_card(m, ip_options), xs=6, md=4) for m in machines
+            dbc.Col(build_machine_card(m, ip_options), xs=6, md=4)
+            for m in page_machines
         ]
         if not cols:
             return html.Div("No machines configured")
 
-        def _to_float(val: object) -> float:
-            try:
-                return float(str(val).replace(",", ""))
-            except Exception:
-                return 0.0
-
-        total_capacity = sum(_to_float(m.get("capacity")) for m in machines)
-        total_accepts = sum(_to_float(m.get("accepts")) for m in machines)
-        total_rejects = sum(_to_float(m.get("rejects")) for m in machines)
+        totals = _machine_totals_text(machines, pref)
 
-        pref = load_weight_preference()
         lang = load_language_preference()
 
-        total_capacity_fmt = f"{total_capacity:,.0f}"
-        total_accepts_fmt = f"{total_accepts:,.0f}"
-        total_rejects_fmt = f"{total_rejects:,.0f}"
-
         summary_card = dbc.Card(
             dbc.CardBody(
                 html.Div(
@@ -593,7 +1574,8 @@ def register_callbacks() -> None:
                             style={"fontSize": "1.2rem"},
                         ),
                         html.Span(
-                            f"{total_capacity_fmt} {capacity_unit_label(pref)}",
+                            totals["capacity"],
+                            id={"type": "machine-total", "index": "capacity"},
                             style={"fontFamily": NUMERIC_FONT, "fontSize": "2.5rem"},
                         ),
                         html.Span(
@@ -602,7 +1584,8 @@ def register_callbacks() -> None:
                             style={"fontSize": "1.2rem"},
                         ),
                         html.Span(
-                            f"{total_accepts_fmt} {capacity_unit_label(pref, False)}",
+                            totals["accepts"],
+                            id={"type": "machine-total", "index": "accepts"},
                             style={"fontFamily": NUMERIC_FONT, "fontSize": "2.5rem"},
                         ),
                         html.Span(
@@ -611,7 +1594,8 @@ def register_callbacks() -> None:
                             style={"fontSize": "1.2rem"},
                         ),
                         html.Span(
-                            f"{total_rejects_fmt} {capacity_unit_label(pref, False)}",
+                            totals["rejects"],
+                            id={"type": "machine-total", "index": "rejects"},
                             style={"fontFamily": NUMERIC_FONT, "fontSize": "2.5rem"},
                         ),
                     ],
@@ -621,7 +1605,66 @@ def register_callbacks() -> None:
             className="mt-2 bg-primary text-white",
         )
 
-        return html.Div([dbc.Row(cols), summary_card])
+        if page_count == 1:
+            return html.Div([dbc.Row(cols), summary_card])
+        pagination = dbc.Pagination(
+            id={"type": "machine-grid-page", "index": 0},
+            active_page=page,
+            max_value=page_count,
+            fully_expanded=False,
+            className="mt-2 justify-content-center",
+        )
+        return html.Div([dbc.Row(cols), pagination, summary_card])
+
+    @_dash_callback(
+        Output({"type": "machine-card-value", "index": ALL, "field": ALL}, "children"),
+        Output({"type": "machine-card-connection", "index": ALL}, "children"),
+        Output({"type": "machine-card-connection", "index": ALL}, "style"),
+        Output({"type": "machine-card", "index": ALL}, "className"),
+        Output({"type": "machine-total", "index": ALL}, "children"),
+        Input("machine-summary-store", "data"),
+        State({"type": "machine-card-value", "index": ALL, "field": ALL}, "id"),
+        State({"type": "machine-card", "index": ALL}, "id"),
+        State({"type": "machine-total", "index": ALL}, "id"),
+        State("floors-data", "data"),
+        State("machines-data", "data"),
+        prevent_initial_call=True,
+    )
+    def update_machine_cards(summaries, value_ids, card_ids, total_ids,
+                             floors_data, machines_data):
+        """Copy a new summary snapshot into the machine cards on the page.
+
+        Only the values shown on the cards and the floor totals change; the
+        cards themselves, and the IP dropdowns on them, stay as rendered.
+        """
+        if not card_ids:
+            raise PreventUpdate
+        pref = load_weight_preference()
+        machines = _apply_machine_summaries(
+            _floor_machines(floors_data or {}, machines_data or {}), summaries, pref
+        )
+        by_id = {str(m.get("id")): m for m in machines}
+
+        values = []
+        for value_id in value_ids:
+            machine = by_id.get(str(value_id["index"]))
+            field = value_id["field"]
+            values.append(
+                machine.get(field, MACHINE_CARD_FIELDS[field]) if machine else no_update
+            )
+        connected = [
+            bool(by_id.get(str(card_id["index"]), {}).get("connected"))
+            for card_id in card_ids
+        ]
+        connections = [machine_card_connection(state) for state in connected]
+        totals = _machine_totals_text(machines, pref)
+        return (
+            values,
+            [label for label, _ in connections],
+            [style for _, style in connections],
+            [machine_card_class(state) for state in connected],
+            [totals[total_id["index"]] for total_id in total_ids],
+        )
 
     @_dash_callback(
         Output("machines-data", "data", allow_duplicate=True),
@@ -942,41 +1985,80 @@ def register_callbacks() -> None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return {"content": csv_data, "filename": f"satake_data_export_{timestamp}.csv"}
 
+    try:
+        from dash.exceptions import PreventUpdate
+    except Exception:  # pragma: no cover - dash missing
+
+        class PreventUpdate(Exception):
+            pass
+
     @_dash_callback(
-        Output("report-download", "data"),
+        [
+            Output("report-job-store", "data"),
+            Output("report-job-interval", "disabled"),
+        ],
         Input("generate-report-btn", "n_clicks"),
         prevent_initial_call=True,
     )
     def generate_report_callback(n_clicks):
-        """Generate a PDF report when the button is clicked."""
-        try:
-            from dash.exceptions import PreventUpdate
-        except Exception:  # pragma: no cover - dash missing
-
-            class PreventUpdate(Exception):
-                pass
-
+        """Queue a background PDF report job when the button is clicked."""
         if not n_clicks:
             raise PreventUpdate
         if generate_report is None:
             raise PreventUpdate
 
-        data = generate_report.fetch_last_24h_metrics()
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            generate_report.build_report(data, tmp.name)
-            with open(tmp.name, "rb") as f:
-                pdf_bytes = f.read()
-
-        pdf_b64 = base64.b64encode(pdf_bytes).decode()
-        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return {
-            "content": pdf_b64,
-            "filename": f"production_report_{timestamp_str}.pdf",
-            "type": "application/pdf",
-            "base64": True,
-        }
+        job = report_jobs.submit()
+        return {"job_id": job.id}, False
+
+    @_dash_callback(
+        [
+            Output("report-job-status", "children"),
+            Output("report-job-interval", "disabled", allow_duplicate=True),
+        ],
+        Input("report-job-interval", "n_intervals"),
+        [
+            State("report-job-store", "data"),
+            State("language-preference-store", "data"),
+        ],
+        prevent_initial_call=True,
+    )
+    def poll_report_job(n_intervals, job_data, lang="en"):
+        """Show report progress and link to the PDF once the job finishes."""
+        status = report_jobs.status((job_data or {}).get("job_id"))
+        if status is None:
+            return "", True
+
+        state = status["status"]
+        if state == "queued":
+            return tr("report_queued", lang), False
+        if state == "running":
+            return tr("report_progress", lang).format(progress=status["progress"]), False
+        if state != "done":
+            return tr(f"report_{state}", lang), True
+
+        # The PDF is streamed by the Flask route rather than sent through a store
+        link = html.A(tr("report_ready", lang), href=report_url(status["job_id"]),
+                      className="text-white")
+        return link, True
+
+    @_dash_callback(
+        Output("report-job-status", "children", allow_duplicate=True),
+        Input("cancel-report-btn", "n_clicks"),
+        [
+            State("report-job-store", "data"),
+            State("language-preference-store", "data"),
+        ],
+        prevent_initial_call=True,
+    )
+    def cancel_report_job(n_clicks, job_data, lang="en"):
+        """Cancel the running report job, if any."""
+        if not n_clicks or not report_jobs.cancel((job_data or {}).get("job_id")):
+            raise PreventUpdate
+        return tr("report_cancelled", lang)
 
     globals()["generate_report_callback"] = generate_report_callback
+    globals()["poll_report_job"] = poll_report_job
+    globals()["cancel_report_job"] = cancel_report_job
 
     @_dash_callback(
         Output("settings-modal", "is_open"),
@@ -1053,263 +2135,18 @@ def register_callbacks() -> None:
             return False
         return is_open
 
-    @_dash_callback(
-        Output("section-1-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("production-data-store", "data"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_1_2(n, prod_data, lang):
-        lang = lang or "en"
-        accepts = (prod_data or {}).get("accepts", 0)
-        rejects = (prod_data or {}).get("rejects", 0)
-        total = accepts + rejects
-        acc_pct = accepts / total * 100 if total else 0
-        rej_pct = rejects / total * 100 if total else 0
-
-        global previous_counter_values
-
-        try:
-            import plotly.graph_objects as go
-
-            fig1 = go.Figure(
-                data=[
-                    go.Pie(
-                        labels=[tr("accepts", lang), tr("rejects", lang)],
-                        values=[accepts, rejects],
-                        hole=0.4,
-                    )
-                ]
-            )
-            fig1.update_layout(margin=dict(l=10, r=10, t=20, b=20), showlegend=False)
-
-            total_counter = sum(previous_counter_values)
-            labels = [str(i) for i, v in enumerate(previous_counter_values, 1) if v > 0]
-            values = (
-                [v / total_counter * 100 for v in previous_counter_values if v > 0]
-                if total_counter
-                else []
-            )
-            fig2 = (
-                go.Figure(data=[go.Pie(labels=labels, values=values, hole=0.4)])
-                if values
-                else go.Figure()
-            )
-            fig2.update_layout(margin=dict(l=10, r=10, t=20, b=20), showlegend=False)
-
-            graph1 = dcc.Graph(
-                figure=fig1,
-                config={"displayModeBar": False},
-                style={"width": "100%", "height": "100%"},
-            )
-            graph2 = (
-                dcc.Graph(
-                    figure=fig2,
-                    config={"displayModeBar": False},
-                    style={"width": "100%", "height": "100%"},
-                )
-                if values
-                else html.Div(tr("no_changes_yet", lang))
-            )
-        except Exception:  # pragma: no cover - plotly missing
-            graph1 = html.Div(f"{acc_pct:.1f}% / {rej_pct:.1f}%")
-            graph2 = html.Div("N/A")
-
-        return html.Div(
-            [
-                html.Div(graph1, className="col-6"),
-                html.Div(graph2, className="col-6"),
-            ],
-            className="row",
-        )
-
-    @_dash_callback(
-        Output("section-3-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_3_2(n, lang):
-        lang = lang or "en"
-        serial_tag = "Status.Info.Serial"
-        model_tag = "Status.Info.Type"
-
-        serial = model = ""
-        if app_state.connected:
-            if serial_tag in app_state.tags:
-                val = app_state.tags[serial_tag]["data"].latest_value
-                serial = val if val is not None else ""
-            if model_tag in app_state.tags:
-                val = app_state.tags[model_tag]["data"].latest_value
-                model = val if val is not None else ""
-
-        status_text = (
-            tr("good_status", lang) if app_state.connected else tr("fault_status", lang)
-        )
-        return html.Div(
-            [
-                html.H6(tr("machine_info_title", lang)),
-                html.Div(f"{tr('serial_number_label', lang)} {serial}"),
-                html.Div(f"{tr('model_label', lang)} {model}"),
-                html.Div(f"Status: {status_text}"),
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_2(n, lang):
-        """Display preset, status and feeder information."""
-        lang = lang or "en"
-        preset_num_tag = "Status.Info.PresetNumber"
-        preset_name_tag = "Status.Info.PresetName"
-        fault_tag = "Status.Faults.GlobalFault"
-        warn_tag = "Status.Faults.GlobalWarning"
-
-        preset = "N/A"
-        if app_state.connected:
-            num = app_state.tags.get(preset_num_tag, {}).get("data")
-            name = app_state.tags.get(preset_name_tag, {}).get("data")
-            num_val = getattr(num, "latest_value", None)
-            name_val = getattr(name, "latest_value", None)
-            parts = []
-            if num_val is not None:
-                parts.append(str(num_val))
-            if name_val:
-                parts.append(str(name_val))
-            if parts:
-                preset = " ".join(parts)
-
-        fault = False
-        warning = False
-        if app_state.connected:
-            if fault_tag in app_state.tags:
-                val = app_state.tags[fault_tag]["data"].latest_value
-                fault = bool(val)
-            if warn_tag in app_state.tags:
-                val = app_state.tags[warn_tag]["data"].latest_value
-                warning = bool(val)
-
-        status_text = tr("good_status", lang)
-        status_style = {"backgroundColor": "#28a745", "color": "white"}
-        if fault:
-            status_text = tr("fault_status", lang)
-            status_style = {"backgroundColor": "#dc3545", "color": "white"}
-        elif warning:
-            status_text = tr("warning_status", lang)
-            status_style = {"backgroundColor": "#ffc107", "color": "black"}
-
-        running = False
-        for i in range(1, 5):
-            tag = f"Status.Feeders.{i}IsRunning"
-            if app_state.connected and tag in app_state.tags:
-                if bool(app_state.tags[tag]["data"].latest_value):
-                    running = True
-                    break
-        feeder_text = (
-            tr("running_state", lang) if running else tr("stopped_state", lang)
-        )
-        feeder_style = {
-            "backgroundColor": "#28a745" if running else "#6c757d",
-            "color": "white",
-        }
-
-        boxes = [
-            html.Div(
-                preset,
-                className="mb-1 p-1",
-                style={"backgroundColor": "#28a745", "color": "white"},
-            ),
-            html.Div(status_text, className="mb-1 p-1", style=status_style),
-            html.Div(feeder_text, className="mb-2 p-1", style=feeder_style),
-        ]
-
-        rate_boxes = []
-        for i in range(1, 5):
-            rate = 0
-            tag = f"Status.Feeders.{i}Rate"
-            if app_state.connected and tag in app_state.tags:
-                val = app_state.tags[tag]["data"].latest_value
-                rate = val if val is not None else 0
-            rate_boxes.append(
-                html.Div(
-                    f"F{i}: {rate}",
-                    className="me-1 p-1",
-                    style={
-                        "backgroundColor": "#28a745" if running else "#6c757d",
-                        "color": "white",
-                    },
-                )
-            )
-
-        return html.Div(
-            [
-                html.H6(tr("machine_status_title", lang)),
-                *boxes,
-                html.Div(rate_boxes, className="d-flex"),
-            ]
-        )
-
     @_dash_callback(
         Output("section-3-1", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("additional-image-store", "data"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
+        Input("additional-image-store", "data"),
+        Input("language-preference-store", "data"),
     )
-    def update_section_3_1(n, img_data, lang):
-        """Show corporate image with a load button."""
-        lang = lang or "en"
-        image_src = None
-        if isinstance(img_data, dict):
-            image_src = img_data.get("image")
-        if image_src:
-            image = html.Img(
-                src=image_src,
-                style={
-                    "maxWidth": "100%",
-                    "maxHeight": "130px",
-                    "objectFit": "contain",
-                    "display": "block",
-                    "margin": "0 auto",
-                },
-            )
-        else:
-            image = html.Div(
-                "No custom image loaded",
-                className="text-muted text-center",
-                style={
-                    "height": "130px",
-                    "display": "flex",
-                    "alignItems": "center",
-                    "justifyContent": "center",
-                },
-            )
+    def update_image_section(img_data, lang):
+        """Render the corporate image section when the image or language changes.
 
-        return html.Div(
-            [
-                dbc.Row(
-                    [
-                        dbc.Col(html.H6(tr("corporate_logo_title", lang)), width=8),
-                        dbc.Col(
-                            dbc.Button(
-                                tr("load_image_button", lang),
-                                id="load-additional-image",
-                                size="sm",
-                                color="primary",
-                            ),
-                            width=4,
-                        ),
-                    ],
-                    className="mb-2",
-                ),
-                image,
-            ]
-        )
+        Kept off the live tick so the image data is not uploaded every second.
+        """
+        image_src = img_data.get("image") if isinstance(img_data, dict) else None
+        return _render_section_3_1(image_src, lang or "en")
 
     @_dash_callback(
         Output("upload-modal", "is_open"),
@@ -1357,324 +2194,15 @@ def register_callbacks() -> None:
                 f"Error uploading image: {exc}", className="text-danger"
             )
 
-    @_dash_callback(
-        Output("section-4", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_4(n, lang):
-        """List sensitivity names."""
-        lang = lang or "en"
-        items = []
-        for i in range(1, 13):
-            name = f"Primary {i}"
-            tag = f"Settings.ColorSort.Primary{i}.Name"
-            if app_state.connected and tag in app_state.tags:
-                val = app_state.tags[tag]["data"].latest_value
-                if val:
-                    name = val
-            items.append(html.Li(f"{i}. {name}", className="mb-1"))
-
-        return html.Div(
-            [
-                html.H6(tr("sensitivities_title", lang)),
-                html.Ul(items, className="mb-0"),
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-5-1", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_5_1(n, lang):
-        """Trend graph for production rate."""
-        lang = lang or "en"
-        tag = "Status.ColorSort.Sort1.Throughput.ObjectPerMin.Current"
-        val = 0
-        if app_state.connected and tag in app_state.tags:
-            raw = app_state.tags[tag]["data"].latest_value
-            val = raw if raw is not None else 0
-        production_history.append(val)
-        if len(production_history) > 60:
-            production_history[:] = production_history[-60:]
-        try:
-            import plotly.graph_objects as go
-
-            fig = go.Figure(
-                go.Scatter(x=list(range(len(production_history))), y=production_history)
-            )
-            fig.update_layout(margin=dict(l=20, r=20, t=20, b=20), showlegend=False)
-            graph = dcc.Graph(
-                figure=fig,
-                config={"displayModeBar": False},
-                style={"width": "100%", "height": "100%"},
-            )
-        except Exception:  # pragma: no cover - plotly missing
-            graph = html.Div(str(val))
-        return html.Div(
-            [
-                dbc.Row(
-                    [
-                        dbc.Col(
-                            html.H6(tr("production_rate_objects_title", lang)), width=9
-                        ),
-                        dbc.Col(
-                            dbc.Button(
-                                "Units",
-                                id={"type": "open-production-rate-units", "index": 0},
-                                size="sm",
-                                color="primary",
-                            ),
-                            width=3,
-                        ),
-                    ],
-                    className="mb-2",
-                ),
-                graph,
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-6-1", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_6_1(n, lang):
-        """Trend graph for counter values."""
-        global counter_history
-        lang = lang or "en"
-        for i, val in enumerate(previous_counter_values, 1):
-            hist = counter_history[i]
-            hist.append(val)
-            if len(hist) > 60:
-                counter_history[i] = hist[-60:]
-        try:
-            import plotly.graph_objects as go
-
-            fig = go.Figure()
-            for i in range(1, 13):
-                fig.add_trace(
-                    go.Scatter(
-                        x=list(range(len(counter_history[i]))),
-                        y=counter_history[i],
-                        name=str(i),
-                    )
-                )
-            fig.update_layout(margin=dict(l=20, r=20, t=20, b=20), showlegend=False)
-            graph = dcc.Graph(
-                figure=fig,
-                config={"displayModeBar": False},
-                style={"width": "100%", "height": "100%"},
-            )
-        except Exception:  # pragma: no cover - plotly missing
-            graph = html.Div("N/A")
-        return html.Div(
-            [
-                dbc.Row(
-                    [
-                        dbc.Col(
-                            html.H6(tr("counter_values_trend_title", lang)), width=9
-                        ),
-                        dbc.Col(
-                            dbc.Button(
-                                "Display",
-                                id={"type": "open-display", "index": 0},
-                                size="sm",
-                                color="primary",
-                            ),
-                            width=3,
-                        ),
-                    ],
-                    className="mb-2",
-                ),
-                graph,
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-7-1", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_7_1(n, lang):
-        """Air pressure gauge display."""
-        lang = lang or "en"
-        tag = "Status.Environmental.AirPressurePsi"
-        value = 0
-        if app_state.connected and tag in app_state.tags:
-            raw = app_state.tags[tag]["data"].latest_value
-            value = raw / 100 if raw is not None else 0
-        try:
-            import plotly.graph_objects as go
-
-            fig = go.Figure(
-                go.Indicator(
-                    mode="gauge+number",
-                    value=value,
-                    gauge={"axis": {"range": [0, 100]}},
-                )
-            )
-            fig.update_layout(margin=dict(l=20, r=20, t=30, b=20))
-            graph = dcc.Graph(
-                figure=fig,
-                config={"displayModeBar": False},
-                style={"width": "100%", "height": "100%"},
-            )
-        except Exception:  # pragma: no cover - plotly missing
-            graph = html.Div(str(value))
-        return html.Div(
-            [
-                html.H6(tr("air_pressure_title", lang)),
-                graph,
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-5-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        prevent_initial_call=True,
-    )
-    def update_section_5_2(n):
-        global previous_counter_values, active_alarms
-        try:
-            import plotly.graph_objects as go
-
-            TAG_PATTERN = "Status.ColorSort.Sort1.DefectCount{}.Rate.Current"
-            values = []
-            for i in range(1, 13):
-                tag = TAG_PATTERN.format(i)
-                val = previous_counter_values[i - 1]
-                if app_state.connected and tag in app_state.tags:
-                    new_val = app_state.tags[tag]["data"].latest_value
-                    if new_val is not None:
-                        val = new_val
-                values.append(val)
-
-            previous_counter_values = values
-
-            # Threshold check
-            active_alarms = []
-            now = datetime.now()
-            email_enabled = threshold_settings.get("email_enabled")
-            email_minutes = threshold_settings.get("email_minutes", 2)
-            for i, val in enumerate(values, 1):
-                settings = threshold_settings.get(i, {})
-                violation = False
-                is_high = False
-                if settings.get("min_enabled") and val < settings.get("min_value", 0):
-                    active_alarms.append(f"Sens. {i} below min")
-                    violation = True
-                elif settings.get("max_enabled") and val > settings.get("max_value", 0):
-                    active_alarms.append(f"Sens. {i} above max")
-                    violation = True
-                    is_high = True
-
-                state = threshold_violation_state[i]
-                if email_enabled:
-                    if violation and not state["is_violating"]:
-                        state["is_violating"] = True
-                        state["violation_start_time"] = now
-                        state["email_sent"] = False
-                    elif violation and state["is_violating"]:
-                        if not state["email_sent"]:
-                            elapsed = (
-                                now - state["violation_start_time"]
-                            ).total_seconds()
-                            if elapsed >= email_minutes * 60:
-                                if send_threshold_email(i, is_high=is_high):
-                                    state["email_sent"] = True
-                    elif not violation and state["is_violating"]:
-                        state["is_violating"] = False
-                        state["violation_start_time"] = None
-                        state["email_sent"] = False
-
-            fig = go.Figure(go.Bar(x=list(range(1, 13)), y=values))
-            fig.update_layout(margin=dict(l=20, r=20, t=20, b=20), showlegend=False)
-            return dcc.Graph(
-                figure=fig,
-                config={"displayModeBar": False},
-                style={"width": "100%", "height": "100%"},
-            )
-        except Exception:  # pragma: no cover - plotly missing
-            return html.Div("N/A")
-
-    @_dash_callback(
-        Output("section-6-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_6_2(n, lang):
-        lang = lang or "en"
-        alarms = active_alarms
-
-        if alarms:
-            mid = len(alarms) // 2 + len(alarms) % 2
-            left = [html.Li(a, className="text-danger mb-1") for a in alarms[:mid]]
-            right = [html.Li(a, className="text-danger mb-1") for a in alarms[mid:]]
-            alarm_display = html.Div(
-                [
-                    html.Div(
-                        tr("active_alarms_title", lang),
-                        className="fw-bold text-danger mb-2",
-                    ),
-                    html.Div(
-                        [
-                            html.Ul(left, className="ps-3 mb-0 col-6"),
-                            html.Ul(right, className="ps-3 mb-0 col-6"),
-                        ],
-                        className="row",
-                    ),
-                ]
-            )
-        else:
-            alarm_display = html.Div(
-                tr("no_changes_yet", lang), className="text-success"
-            )
-
-        return html.Div(
-            [
-                html.H6(tr("sensitivity_threshold_alarms_title", lang)),
-                alarm_display,
-            ]
-        )
-
-    @_dash_callback(
-        Output("section-7-2", "children"),
-        Input("status-update-interval", "n_intervals"),
-        State("language-preference-store", "data"),
-        prevent_initial_call=True,
-    )
-    def update_section_7_2(n, lang):
-        lang = lang or "en"
-        entries = machine_control_log[:20]
-        rows = []
-        for idx, entry in enumerate(entries, start=1):
-            ts = entry.get("timestamp", "")
-            desc = f"{entry.get('tag', '')} {entry.get('action', '')}".strip()
-            if desc:
-                rows.append(html.Div(f"{idx}. {desc} {ts}", className="mb-1 small"))
-        if not rows:
-            rows.append(html.Div(tr("no_changes_yet", lang), className="text-muted"))
-
-        return html.Div(
-            [
-                html.H6(tr("machine_control_log_title", lang)),
-                *rows,
-            ]
-        )
-
 
 register_callbacks()
 
 __all__ = [
     "register_callbacks",
     "generate_report_callback",
+    "poll_report_job",
+    "cancel_report_job",
+    "update_dashboard_sections",
     "add_ip_address",
     "update_saved_ip_list",
     "handle_delete_button",
@@ -1,7 +1,15 @@
+import atexit
+import heapq
+import itertools
 import logging
+import queue
+import threading
+from email.mime.application import MIMEApplication
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
+import time
+from typing import Callable, Hashable, Optional
 
 from .settings import load_email_settings, DEFAULT_EMAIL_SETTINGS
 
@@ -10,9 +18,20 @@ logger = logging.getLogger(__name__)
 # Load SMTP configuration once at import time
 email_settings = load_email_settings()
 
+#: Seconds threshold alarms are collected before one digest email is sent.
+DIGEST_WINDOW = 30
+#: Longest wait between delivery attempts of a failing message.
+MAX_BACKOFF = 300
+#: Seconds the interpreter waits at exit for queued emails to go out.
+EXIT_FLUSH_TIMEOUT = 10
+
 
 def send_threshold_email(sensitivity_num: int, is_high: bool = True) -> bool:
-    """Send an email notification for a threshold violation."""
+    """Send an email notification for a threshold violation.
+
+    Blocks on a fresh SMTP session; the alarm engine uses
+    :func:`queue_threshold_email` instead.
+    """
     try:
         from .callbacks import threshold_settings  # runtime import to avoid cycle
 
@@ -49,3 +68,252 @@ def send_threshold_email(sensitivity_num: int, is_high: bool = True) -> bool:
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error sending threshold email: {e}")
         return False
+
+
+def build_report_email(recipients: list, pdf_bytes: bytes, filename: str,
+                       subject: str = "Enpresor Production Report",
+                       body: str = "The latest production report is attached.") -> MIMEMultipart:
+    """Return a message carrying ``pdf_bytes`` as a PDF attachment."""
+    msg = MIMEMultipart()
+    msg["Subject"] = subject
+    msg["From"] = email_settings.get("from_address", DEFAULT_EMAIL_SETTINGS["from_address"])
+    msg["To"] = ", ".join(recipients)
+    msg.attach(MIMEText(body, "plain"))
+    attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
+    attachment.add_header("Content-Disposition", "attachment", filename=filename)
+    msg.attach(attachment)
+    return msg
+
+
+class EmailSender:
+    """Deliver queued messages from one worker thread over a reused SMTP session.
+
+    :meth:`send` only enqueues, so callers never wait on the mail server.  The
+    worker keeps its connection open while messages keep arriving and closes
+    it after ``idle_timeout`` seconds without work.  A failed delivery is
+    scheduled again up to ``retries`` times, ``backoff`` seconds later and
+    doubling the wait after each attempt; other messages go out meanwhile.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[dict] = None,
+        idle_timeout: float = 60,
+        retries: int = 3,
+        backoff: float = 5,
+    ) -> None:
+        self.settings = settings
+        self.idle_timeout = idle_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._queue: "queue.Queue" = queue.Queue()
+        # (due, order, item) of failed messages waiting for their next attempt
+        self._retry: list = []
+        self._order = itertools.count()
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def send(self, msg, to_addrs: list,
+             on_failure: Optional[Callable[[], None]] = None) -> None:
+        """Queue ``msg`` for delivery to ``to_addrs``.
+
+        ``on_failure`` is called from the worker if the message is given up
+        after its retries; it is not called when the server refuses the
+        recipients, since sending again would be refused too.
+        """
+        self._queue.put((msg, list(to_addrs), 0, on_failure))
+        self._ensure_worker()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been delivered or given up.
+
+        Returns ``False`` if ``timeout`` expires first.
+        """
+        q = self._queue
+        with q.all_tasks_done:
+            return q.all_tasks_done.wait_for(lambda: not q.unfinished_tasks, timeout)
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def _connect(self):
+        settings = self.settings or email_settings
+        server = smtplib.SMTP(
+            settings.get("smtp_server", DEFAULT_EMAIL_SETTINGS["smtp_server"]),
+            settings.get("smtp_port", DEFAULT_EMAIL_SETTINGS["smtp_port"]),
+        )
+        server.starttls()
+        username = settings.get("smtp_username")
+        password = settings.get("smtp_password")
+        if username and password:
+            server.login(username, password)
+        return server
+
+    def _close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:  # pragma: no cover - connection already gone
+                pass
+            self._server = None
+
+    def _deliver(self, msg, to_addrs: list) -> None:
+        settings = self.settings or email_settings
+        from_addr = settings.get("from_address", DEFAULT_EMAIL_SETTINGS["from_address"])
+        # A pooled connection may have been dropped by the server; retry once
+        for attempt in range(2):
+            if self._server is None:
+                self._server = self._connect()
+            try:
+                self._server.sendmail(from_addr, to_addrs, msg.as_string())
+                return
+            except smtplib.SMTPServerDisconnected:
+                self._server = None
+                if attempt:
+                    raise
+
+    def _worker(self) -> None:
+        while True:
+            timeout = self.idle_timeout
+            if self._retry:
+                timeout = max(0.0, self._retry[0][0] - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not None:
+                self._attempt(*item)
+            elif not self._retry:
+                self._close()
+            now = time.monotonic()
+            while self._retry and self._retry[0][0] <= now:
+                self._attempt(*heapq.heappop(self._retry)[2])
+
+    def _attempt(self, msg, to_addrs: list, attempt: int, on_failure) -> None:
+        """Try one delivery; reschedule it on failure or mark it done."""
+        try:
+            self._deliver(msg, to_addrs)
+            logger.info(f"Sent '{msg['Subject']}' to {', '.join(to_addrs)}")
+        except smtplib.SMTPRecipientsRefused as e:
+            # Retrying cannot help a rejected address, so neither may on_failure
+            logger.error(f"Recipients refused for {to_addrs}: {e}")
+        except Exception as e:
+            self._close()
+            if attempt >= self.retries:
+                logger.error(f"Error sending email to {to_addrs}: {e}")
+                self._give_up(on_failure)
+                return
+            delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF)
+            logger.warning(f"Error sending email to {to_addrs}: {e}; retrying in {delay}s")
+            heapq.heappush(
+                self._retry,
+                (time.monotonic() + delay, next(self._order),
+                 (msg, to_addrs, attempt + 1, on_failure)),
+            )
+            # Still unfinished, so flush() keeps waiting for the retry
+            return
+        self._queue.task_done()
+
+    def _give_up(self, on_failure) -> None:
+        try:
+            if on_failure is not None:
+                on_failure()
+        except Exception as e:  # pragma: no cover - callback errors
+            logger.error(f"Error in email failure callback: {e}")
+        finally:
+            self._queue.task_done()
+
+
+email_sender = EmailSender()
+
+
+def build_threshold_email(to_addr: str, alarms: list) -> MIMEMultipart:
+    """Return one message listing ``alarms`` as ``(machine, counter, is_high)``."""
+    lines = []
+    for machine_id, sensitivity_num, is_high in alarms:
+        threshold_type = "upper" if is_high else "lower"
+        line = f"Sensitivity {sensitivity_num} has reached the {threshold_type} threshold."
+        lines.append(f"{machine_id}: {line}" if machine_id is not None else line)
+
+    msg = MIMEMultipart()
+    msg["Subject"] = "Enpresor Alarm" if len(alarms) == 1 else f"Enpresor Alarms ({len(alarms)})"
+    msg["From"] = email_settings.get("from_address", DEFAULT_EMAIL_SETTINGS["from_address"])
+    msg["To"] = to_addr
+    msg.attach(MIMEText("\n".join(lines), "plain"))
+    return msg
+
+
+class ThresholdDigest:
+    """Group threshold alarms raised within ``window`` seconds into one email.
+
+    The first alarm for a recipient starts the window; every alarm added
+    before it closes goes into the same message on ``sender``.
+    """
+
+    def __init__(self, sender: EmailSender = email_sender, window: float = DIGEST_WINDOW) -> None:
+        self.sender = sender
+        self.window = window
+        self._pending: dict = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def add(self, to_addr: str, sensitivity_num: int, is_high: bool = True,
+            machine_id: Optional[Hashable] = None,
+            on_failure: Optional[Callable[[], None]] = None) -> None:
+        """Add one alarm; ``on_failure`` runs if its digest cannot be delivered."""
+        with self._lock:
+            self._pending.setdefault(to_addr, []).append(
+                (machine_id, sensitivity_num, is_high, on_failure)
+            )
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> int:
+        """Queue the pending digests now; return the number of messages."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for to_addr, entries in pending.items():
+            alarms = [entry[:3] for entry in entries]
+            callbacks = [entry[3] for entry in entries if entry[3] is not None]
+            self.sender.send(
+                build_threshold_email(to_addr, alarms), [to_addr],
+                on_failure=(lambda cbs=callbacks: [cb() for cb in cbs]) if callbacks else None,
+            )
+        return len(pending)
+
+
+threshold_digest = ThresholdDigest()
+
+
+def _flush_at_exit() -> None:
+    # Alarms still inside the digest window would otherwise die with the timer
+    threshold_digest.flush()
+    email_sender.flush(timeout=EXIT_FLUSH_TIMEOUT)
+
+
+atexit.register(_flush_at_exit)
+
+
+def queue_threshold_email(to_addr: str, sensitivity_num: int, is_high: bool = True,
+                          machine_id: Optional[Hashable] = None,
+                          on_failure: Optional[Callable[[], None]] = None) -> bool:
+    """Add a threshold alarm to the next digest email for ``to_addr``.
+
+    Returns immediately; ``False`` only when no address is configured.
+    ``on_failure`` is called if the digest is given up after its retries,
+    but not when ``to_addr`` is refused by the server.
+    """
+    if not to_addr:
+        logger.warning("No email address configured for notifications")
+        return False
+    threshold_digest.add(to_addr, sensitivity_num, is_high, machine_id, on_failure)
+    return True
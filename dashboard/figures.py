@@ -0,0 +1,95 @@
+"""Precompiled Plotly figure skeletons for the live dashboard.
+
+Building ``go.Figure`` objects validates every trace and layout property,
+which made figure construction the most expensive part of a dashboard tick.
+Each skeleton here is validated with ``graph_objects`` once per figure kind,
+theme and language and cached as a plain dict; a tick only fills the data
+arrays into shallow copies of the cached traces.  Returned figures share the
+cached layout, so treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+
+try:  # pragma: no cover - optional dependency
+    import plotly.graph_objects as go
+except Exception:  # pragma: no cover - plotly missing
+    go = None  # type: ignore
+
+from i18n import tr
+
+logger = logging.getLogger(__name__)
+
+THEMES = ("light", "dark")
+
+_MARGINS = {
+    "split-pie": dict(l=10, r=10, t=20, b=20),
+    "counter-pie": dict(l=10, r=10, t=20, b=20),
+    "counter-bars": dict(l=20, r=20, t=20, b=20),
+    "production-trend": dict(l=20, r=20, t=20, b=20),
+    "counter-trend": dict(l=20, r=20, t=20, b=20),
+}
+FIGURE_KINDS = tuple(_MARGINS)
+
+
+def _theme_layout(theme: str) -> dict:
+    if theme == "dark":
+        return {
+            "paper_bgcolor": "rgba(0,0,0,0)",
+            "plot_bgcolor": "rgba(0,0,0,0)",
+            "font": {"color": "#e9ecef"},
+        }
+    return {}
+
+
+def _traces(kind: str, lang: str) -> list:
+    if kind == "split-pie":
+        return [
+            {
+                "type": "pie",
+                "labels": [tr("accepts", lang), tr("rejects", lang)],
+                "hole": 0.4,
+            }
+        ]
+    if kind == "counter-pie":
+        return [{"type": "pie", "hole": 0.4}]
+    if kind == "counter-bars":
+        return [{"type": "bar", "x": list(range(1, 13))}]
+    if kind == "production-trend":
+        return [{"type": "scatter"}]
+    return [{"type": "scatter", "name": str(i)} for i in range(1, 13)]
+
+
+@lru_cache(maxsize=None)
+def figure_skeleton(kind: str, theme: str = "light", lang: str = "en") -> dict:
+    """Return the validated ``{"data", "layout"}`` skeleton for ``kind``."""
+    if kind not in _MARGINS:
+        raise ValueError(f"Unknown figure kind: {kind}")
+    theme = theme if theme in THEMES else "light"
+    skeleton = {
+        "data": _traces(kind, lang),
+        "layout": {"margin": _MARGINS[kind], "showlegend": False, **_theme_layout(theme)},
+    }
+    if go is not None:
+        # Validate once; raises on a bad property like go.Figure would per tick
+        skeleton = go.Figure(skeleton).to_plotly_json()
+    return skeleton
+
+
+def build_figure(kind: str, theme: str, lang: str, *arrays: dict) -> dict:
+    """Return a figure of ``kind`` with each trace updated from ``arrays``.
+
+    ``arrays`` holds one dict of data properties (``x``, ``y``, ``values`` …)
+    per trace; traces without a matching dict are left as in the skeleton.
+    """
+    skeleton = figure_skeleton(kind, theme or "light", lang or "en")
+    data = [
+        {**trace, **arrays[i]} if i < len(arrays) else trace
+        for i, trace in enumerate(skeleton["data"])
+    ]
+    return {"data": data, "layout": skeleton["layout"]}
+
+
+__all__ = ["FIGURE_KINDS", "THEMES", "figure_skeleton", "build_figure"]
@@ -14,6 +14,7 @@ from .settings import (
 )
 from i18n import tr
 from .images import load_saved_image
+from .live_updates import HEARTBEAT_INTERVAL_MS, LIVE_STREAM_URL, POLL_INTERVAL_MS
 
 # ``dash`` is an optional dependency during testing.  These helpers fall
 # back to lightweight stubs when the package is unavailable so that the unit
@@ -100,7 +101,10 @@ def render_dashboard_shell() -> Any:
                 [
                     dbc.Button(tr("switch_dashboards"), id="new-dashboard-btn", color="light", size="sm", className="me-2"),
                     dbc.Button(tr("generate_report"), id="generate-report-btn", color="light", size="sm", className="me-2"),
-                    dcc.Download(id="report-download"),
+                    dbc.Button(tr("cancel_report"), id="cancel-report-btn", color="light", size="sm", className="me-2"),
+                    html.Span(id="report-job-status", className="small me-2"),
+                    dcc.Store(id="report-job-store"),
+                    dcc.Interval(id="report-job-interval", interval=1000, disabled=True),
                 ],
                 className="ms-auto d-flex align-items-center",
             ),
@@ -114,8 +118,24 @@ def render_dashboard_shell() -> Any:
             dcc.Store(id="floors-data", data=floors_data),
             dcc.Store(id="machines-data", data=machines_data),
             dcc.Store(id="active-machine-store", data={"machine_id": None}),
-            dcc.Interval(id="status-update-interval", interval=1000, n_intervals=0),
+            # Fallback polling; slowed to a heartbeat once the live update
+            # stream connects and paused while the browser tab is hidden
+            dcc.Interval(
+                id="status-update-interval", interval=POLL_INTERVAL_MS, n_intervals=0
+            ),
+            dcc.Store(
+                id="live-stream-config",
+                data={
+                    "url": LIVE_STREAM_URL,
+                    "poll": POLL_INTERVAL_MS,
+                    "heartbeat": HEARTBEAT_INTERVAL_MS,
+                },
+            ),
+            dcc.Store(id="live-update-store"),
             dcc.Store(id="production-data-store"),
+            # Per-machine status records for the floor grid, one per poll cycle
+            dcc.Store(id="machine-summary-store", data={"seq": 0, "machines": {}}),
+            dcc.Store(id="section-signature-store", data={}),
             dcc.Store(id="app-mode", data={"mode": "live"}),
             dcc.Store(id="app-mode-tracker"),
             dcc.Store(id="ip-addresses-store", data=load_ip_addresses()),
@@ -565,23 +585,59 @@ def render_floor_machine_layout_enhanced_with_selection(
     )
 
 
-def build_machine_card(machine: dict, ip_options: list, *, active: bool = False, lang: str | None = None) -> Any:
-    """Return a Dash component displaying a machine summary."""
+# Machine card values refreshed in place from the machine summaries, with the
+# text shown while a machine has no summary
+MACHINE_CARD_FIELDS = {
+    "model": "N/A",
+    "serial": "N/A",
+    "preset": "N/A",
+    "status": "Unknown",
+    "feeder": "Unknown",
+    "capacity": "0",
+    "accepts": "0",
+    "rejects": "0",
+}
 
-    lang = lang or "en"
-    mid = machine.get("id")
-    connected = bool(machine.get("connected"))
 
+def machine_card_class(connected: bool, active: bool = False) -> str:
+    """Return the machine card ``className`` for its connection state."""
     if active:
-        card_class = (
+        return (
             "mb-2 machine-card-active-connected"
             if connected
             else "mb-2 machine-card-active-disconnected"
         )
-    else:
-        card_class = (
-            "mb-2 machine-card-connected" if connected else "mb-2 machine-card-disconnected"
-        )
+    return "mb-2 machine-card-connected" if connected else "mb-2 machine-card-disconnected"
+
+
+def machine_card_connection(connected: bool) -> tuple:
+    """Return the ``(children, style)`` of a machine card's connection label."""
+    return (
+        f"({'Connected' if connected else 'Not Connected'})",
+        {
+            "color": "#007bff" if connected else "#dc3545",
+            "fontSize": "1.2rem",
+            "fontWeight": "bold",
+        },
+    )
+
+
+def _card_value_id(mid: Any, field: str) -> dict:
+    return {"type": "machine-card-value", "index": mid, "field": field}
+
+
+def build_machine_card(machine: dict, ip_options: list, *, active: bool = False, lang: str | None = None) -> Any:
+    """Return a Dash component displaying a machine summary.
+
+    The live values, connection label and ``className`` carry pattern-matching
+    ids so they can be updated without rebuilding the card.
+    """
+
+    lang = lang or "en"
+    mid = machine.get("id")
+    connected = bool(machine.get("connected"))
+    card_class = machine_card_class(connected, active)
+    connection_label, connection_style = machine_card_connection(connected)
 
     overlay = html.Div(
         "",
@@ -599,12 +655,7 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
         title=f"Click to select Machine {mid}",
     )
 
-    preset = machine.get("preset", "N/A")
-    status = machine.get("status", "Unknown")
-    feeder = machine.get("feeder", "Unknown")
-    capacity = machine.get("capacity", "0")
-    accepts = machine.get("accepts", "0")
-    rejects = machine.get("rejects", "0")
+    values = {field: machine.get(field, default) for field, default in MACHINE_CARD_FIELDS.items()}
 
     dropdown = dcc.Dropdown(
         id={"type": "machine-ip-dropdown", "index": mid},
@@ -621,25 +672,22 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
             html.Small(tr("select_machine_label", lang), className="mb-1 d-block"),
             dropdown,
             html.Small(
-                f"({'Connected' if connected else 'Not Connected'})",
+                connection_label,
+                id={"type": "machine-card-connection", "index": mid},
                 className="d-block mb-1",
-                style={
-                    "color": "#007bff" if connected else "#dc3545",
-                    "fontSize": "1.2rem",
-                    "fontWeight": "bold",
-                },
+                style=connection_style,
             ),
             html.Div(
                 [
                     html.Small(tr("model_label", lang), className="fw-bold", style={"fontSize": "1.2rem"}),
-                    html.Small(machine.get("model", "N/A"), style={"fontSize": "1.2rem"}),
+                    html.Small(values["model"], id=_card_value_id(mid, "model"), style={"fontSize": "1.2rem"}),
                 ],
                 className="mb-1",
             ),
             html.Div(
                 [
                     html.Small(tr("serial_number_label", lang), className="fw-bold", style={"fontSize": "1.2rem"}),
-                    html.Small(machine.get("serial", "N/A"), style={"fontSize": "1.2rem"}),
+                    html.Small(values["serial"], id=_card_value_id(mid, "serial"), style={"fontSize": "1.2rem"}),
                 ],
                 className="mb-0",
             ),
@@ -652,21 +700,21 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
             html.Div(
                 [
                     html.Small(tr("preset_label", lang).upper(), className="fw-bold d-block", style={"fontSize": "1.2rem"}),
-                    html.Small(preset, style={"fontSize": "1.5rem", "color": "#1100FF"}),
+                    html.Small(values["preset"], id=_card_value_id(mid, "preset"), style={"fontSize": "1.5rem", "color": "#1100FF"}),
                 ],
                 className="mb-0",
             ),
             html.Div(
                 [
                     html.Small(tr("machine_status_label", lang), className="fw-bold d-block", style={"fontSize": "1.2rem"}),
-                    html.Small(status, style={"fontSize": "1.5rem", "fontWeight": "bold"}),
+                    html.Small(values["status"], id=_card_value_id(mid, "status"), style={"fontSize": "1.5rem", "fontWeight": "bold"}),
                 ],
                 className="mb-0",
             ),
             html.Div(
                 [
                     html.Small(tr("feeder_label", lang), className="fw-bold d-block", style={"fontSize": "1.2rem"}),
-                    html.Small(feeder, style={"fontSize": "1.5rem", "fontWeight": "bold"}),
+                    html.Small(values["feeder"], id=_card_value_id(mid, "feeder"), style={"fontSize": "1.5rem", "fontWeight": "bold"}),
                 ],
                 className="mb-0",
             ),
@@ -678,11 +726,11 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
         [
             dbc.Col([
                 html.Div(tr("accepts_label", lang), className="fw-bold text-center", style={"fontSize": "1.2rem"}),
-                html.Div(accepts, className="text-center", style={"fontSize": "1.9rem", "fontWeight": "bold"}),
+                html.Div(values["accepts"], id=_card_value_id(mid, "accepts"), className="text-center", style={"fontSize": "1.9rem", "fontWeight": "bold"}),
             ], md=6, sm=12),
             dbc.Col([
                 html.Div(tr("rejects_label", lang), className="fw-bold text-center", style={"fontSize": "1.2rem"}),
-                html.Div(rejects, className="text-center", style={"fontSize": "1.9rem", "fontWeight": "bold"}),
+                html.Div(values["rejects"], id=_card_value_id(mid, "rejects"), className="text-center", style={"fontSize": "1.9rem", "fontWeight": "bold"}),
             ], md=6, sm=12),
         ],
         className="mb-0",
@@ -714,7 +762,11 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
                     ),
                     dbc.Row([dbc.Col(left, md=6, sm=12), dbc.Col(right, md=6, sm=12)], className="mb-0"),
                     html.Div(
-                        html.Div(f"{capacity}", className="text-center production-data"),
+                        html.Div(
+                            f"{values['capacity']}",
+                            id=_card_value_id(mid, "capacity"),
+                            className="text-center production-data",
+                        ),
                         className="mb-0",
                     ),
                     bottom,
@@ -722,6 +774,7 @@ def build_machine_card(machine: dict, ip_options: list, *, active: bool = False,
                 style={"position": "relative"},
             ),
         ],
+        id={"type": "machine-card", "index": mid},
         className=card_class,
         style={"position": "relative", "cursor": "pointer", "flexWrap": "wrap"},
     )
@@ -1327,7 +1380,10 @@ __all__ = [
     "render_main_dashboard",
     "render_floor_machine_layout_with_customizable_names",
     "render_floor_machine_layout_enhanced_with_selection",
+    "MACHINE_CARD_FIELDS",
     "build_machine_card",
+    "machine_card_class",
+    "machine_card_connection",
     "connection_controls",
     "threshold_modal",
     "settings_modal",
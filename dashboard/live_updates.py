@@ -0,0 +1,183 @@
+"""Server-sent event channel notifying browsers of live tag changes.
+
+The OPC poller calls :meth:`LiveUpdateBroker.publish` once per cycle.  The
+broker compares the values with the previous cycle and sends only a change
+notification (the sequence number and the names of the changed tags), so
+idle clients receive nothing but an occasional keepalive comment and the
+values themselves are only sent by the dashboard callbacks that render them.
+A new subscriber first receives the current tag names as a ``snapshot`` event
+followed by ``delta`` events; a subscriber that falls too far behind is
+resynchronised with a fresh snapshot instead of replaying every missed delta.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from typing import Iterator, Optional
+
+try:  # pragma: no cover - optional dependency
+    from flask import Response
+
+    HAS_FLASK = True
+except Exception:  # pragma: no cover - flask ships with dash
+    Response = None  # type: ignore
+    HAS_FLASK = False
+
+from .app import app
+
+logger = logging.getLogger(__name__)
+
+LIVE_STREAM_URL = "/live/stream"
+#: Seconds between keepalive comments on an idle stream.
+KEEPALIVE_SECONDS = 15
+#: Deltas buffered per client before it is resynchronised with a snapshot.
+SUBSCRIBER_QUEUE_SIZE = 32
+#: Dashboard polling period while the stream is unavailable.
+POLL_INTERVAL_MS = 1000
+#: Dashboard tick period while streaming, which flushes slow sections.
+HEARTBEAT_INTERVAL_MS = 10000
+
+
+class LiveSubscriber:
+    """Bounded queue of pending deltas for one connected browser."""
+
+    def __init__(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+
+    def offer(self, delta: dict) -> None:
+        try:
+            self.queue.put_nowait(delta)
+        except queue.Full:
+            # Drop the backlog; ``None`` tells the stream to send a snapshot
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.queue.put_nowait(None)
+
+
+class LiveUpdateBroker:
+    """Track the latest tag values and fan out per-cycle change notices."""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self.seq = 0
+        self._values: dict = {}
+        self._connected = False
+        self._subscribers: set[LiveSubscriber] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, values: dict, connected: bool = True) -> Optional[dict]:
+        """Record one poll cycle and notify subscribers of the changed tags.
+
+        Returns the delta that was sent, or ``None`` when nothing changed.
+        """
+        with self._lock:
+            changed = [
+                name
+                for name, value in values.items()
+                if name not in self._values or self._values[name] != value
+            ]
+            removed = [name for name in self._values if name not in values]
+            if not changed and not removed and connected == self._connected:
+                return None
+            self.seq += 1
+            self._values = dict(values)
+            self._connected = connected
+            delta = {
+                "seq": self.seq,
+                "connected": connected,
+                "changed": changed,
+                "removed": removed,
+            }
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(delta)
+        return delta
+
+    def snapshot(self) -> dict:
+        """Return the current tag names with the sequence number they belong to."""
+        with self._lock:
+            return {
+                "seq": self.seq,
+                "connected": self._connected,
+                "tags": list(self._values),
+            }
+
+    def subscribe(self) -> LiveSubscriber:
+        subscriber = LiveSubscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stream(self, keepalive: float = KEEPALIVE_SECONDS) -> Iterator[str]:
+        """Yield server-sent event messages until the client disconnects."""
+        subscriber = self.subscribe()
+        try:
+            yield format_event("snapshot", self.snapshot())
+            while True:
+                try:
+                    delta = subscriber.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if delta is None:
+                    yield format_event("snapshot", self.snapshot())
+                else:
+                    yield format_event("delta", delta)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_event(event: str, payload: dict) -> str:
+    """Encode ``payload`` as a compact server-sent event."""
+    data = json.dumps(payload, default=str, separators=(",", ":"))
+    return f"id: {payload['seq']}\nevent: {event}\ndata: {data}\n\n"
+
+
+live_updates = LiveUpdateBroker()
+
+
+def live_stream():
+    """Stream tag change notices to one browser as ``text/event-stream``."""
+    response = Response(live_updates.stream(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Stop reverse proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def register_live_routes(server) -> bool:
+    """Attach the live update stream to the Flask ``server``."""
+    if not HAS_FLASK or server is None:
+        logger.debug("Flask server unavailable; live update stream not registered")
+        return False
+    server.add_url_rule(LIVE_STREAM_URL, "live_stream", live_stream, methods=["GET"])
+    return True
+
+
+register_live_routes(getattr(app, "server", None))
+
+__all__ = [
+    "LIVE_STREAM_URL",
+    "POLL_INTERVAL_MS",
+    "HEARTBEAT_INTERVAL_MS",
+    "LiveSubscriber",
+    "LiveUpdateBroker",
+    "format_event",
+    "live_updates",
+    "register_live_routes",
+]
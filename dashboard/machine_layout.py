@@ -1,13 +1,14 @@
 """Floor and machine layout helpers."""
 from __future__ import annotations
 
-import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 
+from .settings import _thaw, settings_cache, settings_writer
+
 logger = logging.getLogger(__name__)
 
 # Data directory lives in repository root next to ``run_dashboard.py``
@@ -20,19 +21,19 @@ def save_layout(
     machines_data: Dict[str, Any],
     path: Path = LAYOUT_PATH,
 ) -> bool:
-    """Persist ``floors_data`` and ``machines_data`` to ``path``."""
+    """Persist ``floors_data`` and ``machines_data`` to ``path``.
+
+    The write is batched and atomic, see :class:`~dashboard.settings.SettingsWriter`.
+    """
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(
-                {
-                    "floors": floors_data,
-                    "machines": machines_data,
-                    "saved_timestamp": datetime.now().isoformat(),
-                },
-                f,
-                indent=4,
-            )
+        settings_writer.write(
+            path,
+            {
+                "floors": floors_data,
+                "machines": machines_data,
+                "saved_timestamp": datetime.now().isoformat(),
+            },
+        )
         return True
     except Exception as exc:  # pragma: no cover - filesystem dependent
         logger.error("Error saving floor/machine layout: %s", exc)
@@ -44,9 +45,8 @@ def load_layout(
 ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """Return saved ``floors_data`` and ``machines_data`` from ``path``."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                data = json.load(f)
+        data = _thaw(settings_cache.get(path))
+        if data is not None:
             floors = data.get(
                 "floors",
                 {"floors": [{"id": 1, "name": "1st Floor"}], "selected_floor": "all"},
@@ -0,0 +1,137 @@
+"""Per-machine status summaries computed once per poll cycle.
+
+The OPC update thread calls :meth:`MachineSummaries.refresh` after reading
+every connected machine.  Browsers receive the result as one small
+``machine-summary-store`` snapshot, so the floor's machine cards cost one
+computation per cycle instead of one per card and client.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+# Status tags shared with the live sections in ``callbacks``
+SERIAL_TAG = "Status.Info.Serial"
+MODEL_TAG = "Status.Info.Type"
+PRESET_NUMBER_TAG = "Status.Info.PresetNumber"
+PRESET_NAME_TAG = "Status.Info.PresetName"
+GLOBAL_FAULT_TAG = "Status.Faults.GlobalFault"
+GLOBAL_WARNING_TAG = "Status.Faults.GlobalWarning"
+FEEDER_RUNNING_TAG = "Status.Feeders.{}IsRunning"
+CAPACITY_TAG = "Status.ColorSort.Sort1.Throughput.KgPerHour.Current"
+REJECT_PERCENT_TAG = "Status.ColorSort.Sort1.Total.Percentage.Current"
+DIAGNOSTIC_COUNTER_TAG = "Diagnostic.Counter"
+
+#: Key carrying :attr:`MachineSummaries.seq` in the live update stream.
+SUMMARY_SEQ_KEY = "machine-summary-seq"
+
+
+def _latest(tags: dict, name: str) -> Any:
+    info = tags.get(name)
+    data = info.get("data") if isinstance(info, dict) else None
+    return getattr(data, "latest_value", None)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def summarize_machine(connection: dict) -> dict:
+    """Return the compact status record for one ``machine_connections`` entry.
+
+    Follows the legacy ``get_machine_current_data`` and
+    ``get_machine_operational_data``; production figures are in kg per hour
+    and rounded so that jitter below 0.1 kg does not count as a change.
+    """
+    ip = connection.get("ip")
+    if not connection.get("connected"):
+        return {"connected": False, "ip": ip, "status": "Offline"}
+
+    tags = connection.get("tags") or {}
+    if _latest(tags, GLOBAL_FAULT_TAG):
+        status = "FAULT"
+    elif _latest(tags, GLOBAL_WARNING_TAG):
+        status = "WARNING"
+    else:
+        status = "GOOD"
+
+    model = _latest(tags, MODEL_TAG)
+    feeders = 2 if model == "RGB400" else 4
+    running = any(
+        bool(_latest(tags, FEEDER_RUNNING_TAG.format(i))) for i in range(1, feeders + 1)
+    )
+
+    preset = [
+        str(value)
+        for value in (_latest(tags, PRESET_NUMBER_TAG), _latest(tags, PRESET_NAME_TAG))
+        if value is not None and value != ""
+    ]
+
+    capacity = _number(_latest(tags, CAPACITY_TAG))
+    reject_percent = _number(_latest(tags, REJECT_PERCENT_TAG))
+    rejects = reject_percent / 100.0 * capacity if capacity > 0 else 0.0
+    accepts = max(capacity - rejects, 0.0)
+
+    serial = _latest(tags, SERIAL_TAG)
+    return {
+        "connected": True,
+        "ip": ip,
+        "serial": str(serial) if serial else "Unknown",
+        "model": str(model) if model else "Unknown",
+        "status": status,
+        "preset": " ".join(preset) if preset else "N/A",
+        "feeder": "Running" if running else "Stopped",
+        "capacity": round(capacity, 1),
+        "accepts": round(accepts, 1),
+        "rejects": round(rejects, 1),
+        "counter": _number(_latest(tags, DIAGNOSTIC_COUNTER_TAG)),
+    }
+
+
+class MachineSummaries:
+    """Latest summary of every connected machine with a change sequence."""
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self._machines: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, connections: Dict[str, dict]) -> bool:
+        """Summarize ``connections``; return ``True`` when anything changed."""
+        machines = {
+            str(machine_id): summarize_machine(connection)
+            for machine_id, connection in list(connections.items())
+        }
+        with self._lock:
+            if machines == self._machines:
+                return False
+            self.seq += 1
+            self._machines = machines
+            return True
+
+    def snapshot(self) -> dict:
+        """Return ``{"seq", "machines"}`` ready to send to the browser."""
+        with self._lock:
+            return {"seq": self.seq, "machines": dict(self._machines)}
+
+
+machine_summaries = MachineSummaries()
+
+__all__ = [
+    "CAPACITY_TAG",
+    "FEEDER_RUNNING_TAG",
+    "GLOBAL_FAULT_TAG",
+    "GLOBAL_WARNING_TAG",
+    "MODEL_TAG",
+    "PRESET_NAME_TAG",
+    "PRESET_NUMBER_TAG",
+    "SERIAL_TAG",
+    "SUMMARY_SEQ_KEY",
+    "MachineSummaries",
+    "machine_summaries",
+    "summarize_machine",
+]
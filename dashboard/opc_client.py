@@ -16,42 +16,114 @@ except Exception:  # pragma: no cover - optional dependency
     Client = ua = None  # type: ignore
 
 from .state import app_state, TagData
+from .live_updates import live_updates
+from .trends import TREND_INTERVAL, trend_buffers
+from .machine_summary import SUMMARY_SEQ_KEY, machine_summaries
+from .alarms import ALARM_SEQ_KEY, alarm_engine, machine_counters
 
-# Basic stubs and placeholders
-def opc_update_thread() -> None:
-    """Background polling loop that keeps tag data up to date."""
 
-    logger.info("OPC update thread started")
+def _poll_tags(tags: Dict[str, Any], label: str = "") -> None:
+    """Read every fast-update tag in ``tags`` into its ``TagData``."""
+    for tag_name, info in list(tags.items()):
+        if FAST_UPDATE_TAGS and tag_name not in FAST_UPDATE_TAGS:
+            continue
+
+        node = info.get("node")
+        data = info.get("data")
+        if not node or not data:
+            continue
 
-    while not app_state.thread_stop_flag:
         try:
-            if not app_state.client:
-                time.sleep(1)
-                continue
+            value = node.get_value()
+            data.add_value(value)
+        except Exception as exc:  # pragma: no cover - network dependent
+            logger.debug("Error reading tag %s%s: %s", label, tag_name, exc)
 
-            for tag_name, info in list(app_state.tags.items()):
-                if FAST_UPDATE_TAGS and tag_name not in FAST_UPDATE_TAGS:
-                    continue
 
-                node = info.get("node")
-                data = info.get("data")
-                if not node or not data:
-                    continue
+def poll_machine_connections() -> None:
+    """Refresh the tags of every machine connected by the reconnection loop."""
+    for machine_id, connection in list(machine_connections.items()):
+        if not connection.get("connected"):
+            continue
+        try:
+            _poll_tags(connection.get("tags") or {}, f"{machine_id}/")
+            connection["last_update"] = datetime.now()
+        except Exception as exc:  # pragma: no cover - network dependent
+            logger.warning("Error updating machine %s: %s", machine_id, exc)
+            connection["connected"] = False
+
+
+def _server_url(ip_address: str) -> str:
+    return f"opc.tcp://{ip_address}:4840"
+
+
+def alarm_counters() -> Dict[Any, list]:
+    """Return the defect counters of every connected machine by machine id.
+
+    The active machine is keyed by its server URL, as section 6-2 reads it;
+    its ``machine_connections`` entry, if any, is left out so the machine is
+    not checked (and emailed about) twice.
+    """
+    active = app_state.client and app_state.connected
+    machines = {
+        machine_id: machine_counters(connection)
+        for machine_id, connection in list(machine_connections.items())
+        if connection.get("connected")
+        and not (active and _server_url(connection.get("ip")) == app_state.machine_id)
+    }
+    if active:
+        machines[app_state.machine_id] = trend_buffers.view(
+            app_state.machine_id
+        ).latest_counters
+    return machines
 
-                try:
-                    value = node.get_value()
-                    data.add_value(value)
-                except Exception as exc:  # pragma: no cover - network dependent
-                    logger.debug("Error reading tag %s: %s", tag_name, exc)
 
-            app_state.last_update_time = datetime.now()
+def opc_update_thread() -> None:
+    """Background polling loop that keeps tag data up to date."""
+
+    logger.info("OPC update thread started")
+
+    next_cycle = time.monotonic()
+    while not app_state.thread_stop_flag:
+        # Keep a fixed cadence so trend samples are evenly spaced
+        next_cycle += TREND_INTERVAL
+        try:
+            values: Dict[str, Any] = {}
+            if app_state.client:
+                _poll_tags(app_state.tags)
+                app_state.last_update_time = datetime.now()
+                values = polled_tag_values()
+                trend_buffers.sample(app_state.machine_id, values)
+
+            poll_machine_connections()
+            machine_summaries.refresh(machine_connections)
+            alarm_engine.check(alarm_counters())
+            # New sequences wake the machine card grids and the alarm section
+            values[SUMMARY_SEQ_KEY] = machine_summaries.seq
+            values[ALARM_SEQ_KEY] = alarm_engine.seq
+            live_updates.publish(values, connected=app_state.connected)
         except Exception as exc:  # pragma: no cover - unexpected errors
             logger.error("Error in OPC update thread: %s", exc)
 
-        time.sleep(1)
+        delay = next_cycle - time.monotonic()
+        if delay < 0:
+            # A slow cycle restarts the schedule rather than bursting to catch up
+            next_cycle = time.monotonic()
+            delay = 0
+        time.sleep(delay)
 
     logger.info("OPC update thread stopped")
 
+
+def polled_tag_values() -> Dict[str, Any]:
+    """Return the latest value of every tag read by the update thread."""
+    return {
+        name: info["data"].latest_value
+        for name, info in list(app_state.tags.items())
+        if info.get("data") is not None
+        and (not FAST_UPDATE_TAGS or name in FAST_UPDATE_TAGS)
+    }
+
 # Known tags defined for the dashboard.  These mirror the mappings
 # from ``EnpresorOPCDataViewBeforeRestructureLegacy.py`` so the new
 # dashboard behaves the same as the legacy implementation.
@@ -223,6 +295,7 @@ async def connect_to_server(server_url: str, server_name: str | None = None) ->
         logger.info("Connecting to OPC UA server at %s...", server_url)
 
         app_state.client = Client(server_url)
+        app_state.machine_id = server_url
 
         if server_name:
             app_state.client.application_uri = f"urn:{server_name}"
@@ -264,6 +337,7 @@ async def disconnect_from_server() -> bool:
             app_state.client.disconnect()
 
         app_state.connected = False
+        live_updates.publish({}, connected=False)
         logger.info("Disconnected from server")
         return True
 
@@ -281,7 +355,7 @@ async def connect_and_monitor_machine_with_timeout(
     """Connect to ``ip_address`` with a shorter session timeout."""
 
     try:
-        server_url = f"opc.tcp://{ip_address}:4840"
+        server_url = _server_url(ip_address)
 
         client = Client(server_url)
         client.set_session_timeout(timeout * 1000)
@@ -541,5 +615,8 @@ __all__ = [
     "run_async",
     "pause_update_thread",
     "resume_update_thread",
+    "polled_tag_values",
+    "poll_machine_connections",
+    "alarm_counters",
 ]
 
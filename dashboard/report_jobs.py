@@ -0,0 +1,213 @@
+"""Background PDF report jobs for the dashboard.
+
+Report generation can take a long time for large floors, so the dashboard
+submits a job, polls its cheap status snapshot and downloads the finished PDF
+in a separate step instead of rendering inside a single blocking callback.
+
+Jobs are keyed by :func:`generate_report.report_fingerprint`; submitting a
+request whose inputs have not changed returns the finished (or still running)
+job for that fingerprint instead of rendering the same PDF again.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+#: Number of finished jobs kept around for download before being discarded.
+MAX_FINISHED_JOBS = 20
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = {DONE, FAILED, CANCELLED}
+
+
+class ReportCancelled(Exception):
+    """Raised from the progress hook to abort a cancelled render."""
+
+
+class ReportJob:
+    """State of a single report generation request."""
+
+    def __init__(self, options: Optional[dict] = None,
+                 fingerprint: Optional[str] = None) -> None:
+        self.id = uuid.uuid4().hex
+        self.options = dict(options or {})
+        self.fingerprint = fingerprint
+        self.status = QUEUED
+        self.done = 0
+        self.total = 0
+        self.error: Optional[str] = None
+        self.pdf_bytes: Optional[bytes] = None
+        self.created = datetime.now()
+        self.finished: Optional[datetime] = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def progress(self) -> int:
+        """Percentage of machines rendered so far."""
+        if self.status == DONE:
+            return 100
+        if not self.total:
+            return 0
+        return int(100 * self.done / self.total)
+
+    @property
+    def filename(self) -> str:
+        return f"production_report_{self.created.strftime('%Y%m%d_%H%M%S')}.pdf"
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _on_progress(self, done: int, total: int) -> None:
+        if self._cancel.is_set():
+            raise ReportCancelled(self.id)
+        self.done = done
+        self.total = total
+
+    def snapshot(self) -> dict:
+        """Return a small JSON-serialisable status dict for UI polling."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+        }
+
+
+class ReportJobManager:
+    """Queue report jobs onto a worker thread and keep their results."""
+
+    def __init__(self, max_workers: int = 1, max_finished: int = MAX_FINISHED_JOBS) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="report-job"
+        )
+        self._jobs: dict[str, ReportJob] = {}
+        self._by_fingerprint: dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, **options) -> ReportJob:
+        """Queue a report build; ``options`` are passed to ``build_report``.
+
+        Returns the cached or in-flight job when one with the same input
+        fingerprint exists.
+        """
+        fingerprint = self._fingerprint(options)
+        with self._lock:
+            existing = self._by_fingerprint.get(fingerprint)
+            if existing is not None and existing.status not in (FAILED, CANCELLED):
+                logger.debug(f"Reusing report job {existing.id} for {fingerprint}")
+                return existing
+            job = ReportJob(options, fingerprint)
+            self._jobs[job.id] = job
+            if fingerprint is not None:
+                self._by_fingerprint[fingerprint] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[ReportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: Optional[str]) -> Optional[dict]:
+        job = self.get(job_id)
+        return job.snapshot() if job else None
+
+    def cancel(self, job_id: Optional[str]) -> bool:
+        """Request cancellation; returns ``False`` for unknown or finished jobs."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return False
+        job.cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return True
+
+    def result(self, job_id: Optional[str]) -> Optional[bytes]:
+        """Return the PDF bytes of a finished job or ``None``."""
+        job = self.get(job_id)
+        if job is None or job.status != DONE:
+            return None
+        return job.pdf_bytes
+
+    def _finish(self, job: ReportJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished = datetime.now()
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in FINISHED_STATES]
+        finished.sort(key=lambda j: j.finished or j.created)
+        for job in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+            if self._by_fingerprint.get(job.fingerprint) is job:
+                del self._by_fingerprint[job.fingerprint]
+
+    @staticmethod
+    def _fingerprint(options: dict) -> Optional[str]:
+        import generate_report
+
+        try:
+            return generate_report.report_fingerprint(
+                options.get("export_dir", generate_report.METRIC_EXPORT_DIR),
+                use_optimized=options.get("use_optimized", False),
+            )
+        except Exception as exc:
+            logger.warning(f"Could not fingerprint report inputs: {exc}")
+            return None
+
+    def _run(self, job: ReportJob) -> None:
+        import generate_report
+
+        if job.cancelled:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        buffer = io.BytesIO()
+        try:
+            # build_report reads the metrics from ``export_dir`` itself
+            generate_report.build_report(
+                None, buffer, progress=job._on_progress, **job.options
+            )
+            if job.cancelled:
+                raise ReportCancelled(job.id)
+            job.pdf_bytes = buffer.getvalue()
+            self._finish(job, DONE)
+        except ReportCancelled:
+            logger.info(f"Report job {job.id} cancelled")
+            self._finish(job, CANCELLED)
+        except Exception as exc:
+            logger.error(f"Report job {job.id} failed: {exc}")
+            self._finish(job, FAILED, str(exc))
+        finally:
+            buffer.close()
+
+
+report_jobs = ReportJobManager()
+
+__all__ = [
+    "ReportCancelled",
+    "ReportJob",
+    "ReportJobManager",
+    "report_jobs",
+]
@@ -0,0 +1,80 @@
+"""Flask route streaming finished report PDFs to the browser."""
+
+from __future__ import annotations
+
+import logging
+
+try:  # pragma: no cover - optional dependency
+    from flask import Response, abort, request
+
+    HAS_FLASK = True
+except Exception:  # pragma: no cover - flask ships with dash
+    Response = abort = request = None  # type: ignore
+    HAS_FLASK = False
+
+from .app import app
+from .report_jobs import DONE, report_jobs
+
+logger = logging.getLogger(__name__)
+
+REPORT_URL_PREFIX = "/reports"
+#: Size of the pieces the PDF is written to the socket in.
+CHUNK_SIZE = 64 * 1024
+#: Finished reports never change, so browsers may reuse them for this long.
+CACHE_MAX_AGE = 3600
+
+
+def report_url(job_id: str) -> str:
+    """Return the download URL for the report produced by ``job_id``."""
+    return f"{REPORT_URL_PREFIX}/{job_id}.pdf"
+
+
+def iter_chunks(data: bytes, chunk_size: int = CHUNK_SIZE):
+    """Yield ``data`` in ``chunk_size`` pieces without copying it whole."""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size].tobytes()
+
+
+def download_report(job_id: str):
+    """Stream the PDF of a finished report job."""
+    job = report_jobs.get(job_id)
+    if job is None or job.status != DONE or job.pdf_bytes is None:
+        abort(404)
+
+    etag = job.fingerprint or job.id
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        data = job.pdf_bytes
+        response = Response(iter_chunks(data), mimetype="application/pdf")
+        response.headers["Content-Length"] = str(len(data))
+        response.headers["Content-Disposition"] = f'attachment; filename="{job.filename}"'
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"private, max-age={CACHE_MAX_AGE}"
+    return response
+
+
+def register_report_routes(server) -> bool:
+    """Attach the report download route to the Flask ``server``."""
+    if not HAS_FLASK or server is None:
+        logger.debug("Flask server unavailable; report download route not registered")
+        return False
+    server.add_url_rule(
+        f"{REPORT_URL_PREFIX}/<job_id>.pdf",
+        "download_report",
+        download_report,
+        methods=["GET"],
+    )
+    return True
+
+
+register_report_routes(getattr(app, "server", None))
+
+__all__ = [
+    "CHUNK_SIZE",
+    "download_report",
+    "iter_chunks",
+    "register_report_routes",
+    "report_url",
+]
@@ -0,0 +1,212 @@
+"""Email the production report on cron-like schedules.
+
+Schedules are stored with :func:`settings.save_report_schedules`; each one
+names a recipient group and a five-field cron expression (minute, hour, day of
+month, month, day of week).  At every minute boundary the scheduler builds one
+dataset from the :class:`generate_report.ReportAggregator`, renders each
+layout needed by the due schedules on a worker pool and queues the results on
+the pooled :class:`email_utils.EmailSender`.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from threading import Thread
+from typing import Callable, Optional
+
+from .email_utils import build_report_email, email_sender
+from .settings import load_report_schedules
+
+logger = logging.getLogger(__name__)
+
+# (lowest, highest) allowed value of each cron field
+_CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set:
+    values = set()
+    for part in field.split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if rng == "*":
+            start, stop = low, high
+        elif "-" in rng:
+            start, stop = (int(v) for v in rng.split("-", 1))
+        else:
+            start = int(rng)
+            stop = high if step > 1 else start
+        if start < low or stop > high or start > stop or step < 1:
+            raise ValueError(f"cron field '{field}' out of range {low}-{high}")
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Minimal five-field cron expression matcher."""
+
+    def __init__(self, expr: str) -> None:
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression '{expr}' must have five fields")
+        self.expr = expr
+        parsed = [
+            _parse_cron_field(field, low, high)
+            for field, (low, high) in zip(fields, _CRON_FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Cron allows both 0 and 7 for Sunday
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def matches(self, when: datetime) -> bool:
+        if (
+            when.minute not in self.minutes
+            or when.hour not in self.hours
+            or when.month not in self.months
+        ):
+            return False
+        day_ok = when.day in self.days
+        weekday_ok = (when.weekday() + 1) % 7 in self.weekdays
+        # Standard cron: when both day fields are restricted either may match
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+
+class ReportScheduler:
+    """Background thread firing due report schedules once per minute."""
+
+    def __init__(self, aggregator, sender=email_sender,
+                 load_schedules: Callable[[], list] = load_report_schedules,
+                 max_workers: int = 4) -> None:
+        self.aggregator = aggregator
+        self.sender = sender
+        self.load_schedules = load_schedules
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="report-schedule"
+        )
+        self._crons: dict[str, CronSchedule] = {}
+        self._last_run: Optional[datetime] = None
+        self._thread: Optional[Thread] = None
+        self.stop_flag = False
+
+    def _cron(self, expr: str) -> Optional[CronSchedule]:
+        if expr not in self._crons:
+            try:
+                self._crons[expr] = CronSchedule(expr)
+            except ValueError as e:
+                logger.error(f"Invalid report schedule: {e}")
+                self._crons[expr] = None
+        return self._crons[expr]
+
+    def due(self, now: datetime) -> list:
+        """Return the enabled schedules matching ``now``."""
+        schedules = []
+        for schedule in self.load_schedules():
+            if not schedule.get("enabled", True) or not schedule.get("recipients"):
+                continue
+            cron = self._cron(schedule.get("cron", ""))
+            if cron is not None and cron.matches(now):
+                schedules.append(schedule)
+        return schedules
+
+    def run_due(self, now: datetime) -> list:
+        """Render and queue every schedule due at ``now``.
+
+        All due schedules share one dataset snapshot, and each distinct layout
+        is rendered only once.  Returns the delivery futures without waiting.
+        """
+        now = now.replace(second=0, microsecond=0)
+        if now == self._last_run:
+            return []
+        self._last_run = now
+        schedules = self.due(now)
+        if not schedules:
+            return []
+
+        dataset = self.aggregator.dataset(now)
+        renders: dict[bool, Future] = {}
+        deliveries = []
+        for schedule in schedules:
+            use_optimized = bool(schedule.get("use_optimized", False))
+            if use_optimized not in renders:
+                renders[use_optimized] = self._executor.submit(
+                    self._render, dataset, use_optimized
+                )
+            deliveries.append(
+                self._executor.submit(self._deliver, schedule, renders[use_optimized], now)
+            )
+        logger.info(f"Running {len(schedules)} scheduled report(s) for {now:%H:%M}")
+        return deliveries
+
+    @staticmethod
+    def _render(dataset, use_optimized: bool) -> bytes:
+        import generate_report
+
+        buffer = io.BytesIO()
+        generate_report.build_report(None, buffer, use_optimized=use_optimized,
+                                     dataset=dataset)
+        return buffer.getvalue()
+
+    def _deliver(self, schedule: dict, render: Future, now: datetime) -> bool:
+        name = schedule.get("name", "report")
+        try:
+            pdf_bytes = render.result()
+        except Exception as e:
+            logger.error(f"Scheduled report '{name}' failed to render: {e}")
+            return False
+        msg = build_report_email(
+            schedule["recipients"],
+            pdf_bytes,
+            f"production_report_{now:%Y%m%d_%H%M}.pdf",
+            subject=f"Enpresor Production Report - {name}",
+        )
+        self.sender.send(msg, schedule["recipients"])
+        return True
+
+    def _loop(self) -> None:
+        while not self.stop_flag:
+            try:
+                self.run_due(datetime.now())
+            except Exception as e:  # pragma: no cover - keep the thread alive
+                logger.error(f"Report scheduler error: {e}")
+            # Wake shortly after the next minute boundary
+            time.sleep(60.5 - datetime.now().second)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.stop_flag = False
+        self._thread = Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+
+report_scheduler: Optional[ReportScheduler] = None
+
+
+def start_report_scheduler(export_dir: Optional[str] = None) -> ReportScheduler:
+    """Seed the report aggregates and start the schedule thread."""
+    global report_scheduler
+    import generate_report
+
+    if report_scheduler is None:
+        aggregator = generate_report.ReportAggregator(
+            export_dir or generate_report.METRIC_EXPORT_DIR
+        )
+        aggregator.seed()
+        report_scheduler = ReportScheduler(aggregator)
+    report_scheduler.start()
+    logger.info("Report scheduler started")
+    return report_scheduler
+
+
+__all__ = [
+    "CronSchedule",
+    "ReportScheduler",
+    "start_report_scheduler",
+]
@@ -2,13 +2,20 @@
 """User settings and preference helpers.
 
 Includes helpers for threshold and email configuration used when
-triggering alarm notifications.
+triggering alarm notifications.  Settings files are parsed once and kept in
+:data:`settings_cache` until they change on disk or are saved again; saves
+are batched by :data:`settings_writer` and written atomically.
 """
 
+import atexit
 import json
 import logging
 import os
+import tempfile
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,8 @@ IP_ADDRESSES_PATH = ROOT_DIR / "ip_addresses.json"
 EMAIL_SETTINGS_PATH = ROOT_DIR / "email_settings.json"
 # Contains per-sensitivity limits along with email threshold preferences
 THRESHOLD_SETTINGS_PATH = ROOT_DIR / "threshold_settings.json"
+# Cron-like schedules for emailing the production report to recipient groups
+REPORT_SCHEDULES_PATH = ROOT_DIR / "report_schedules.json"
 
 DEFAULT_EMAIL_SETTINGS = {
     "smtp_server": "smtp.postmarkapp.com",
@@ -30,19 +39,199 @@ DEFAULT_EMAIL_SETTINGS = {
 DEFAULT_WEIGHT_PREF = {"unit": "lb", "label": "lbs", "value": 1.0}
 DEFAULT_LANGUAGE = "en"
 
+#: Seconds between checks of a cached settings file for outside edits.
+SETTINGS_CHECK_INTERVAL = 1.0
+#: Seconds a save may wait so that a burst of saves becomes one write.
+SETTINGS_WRITE_DELAY = 0.5
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Return a mutable deep copy of a frozen settings view."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class SettingsCache:
+    """Parsed JSON settings files, re-read only when they change.
+
+    A file is parsed on first use and again when its modification time or
+    size changes, checked at most every ``check_interval`` seconds, or right
+    away after :meth:`invalidate`.  :meth:`get` returns a read-only view that
+    is shared between callers; the ``load_*`` helpers copy what they return.
+    """
+
+    def __init__(self, check_interval: float = SETTINGS_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        # path -> (stamp, checked_at, view or exception)
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path):
+        """Return a frozen view of the JSON in ``path``, ``None`` if missing.
+
+        Invalid JSON raises ``ValueError`` until the file is fixed.
+        """
+        key = str(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or now - entry[1] >= self.check_interval:
+            try:
+                st = os.stat(key)
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, now, self._parse(key) if stamp else None)
+            else:
+                entry = (stamp, now, entry[2])
+            with self._lock:
+                self._entries[key] = entry
+        if isinstance(entry[2], Exception):
+            raise entry[2]
+        return entry[2]
+
+    @staticmethod
+    def _parse(path: str):
+        try:
+            with open(path, "r") as f:
+                return _freeze(json.load(f))
+        except ValueError as exc:
+            return ValueError(f"{path}: {exc}")
+
+    def put(self, path: Path, view, stamp=None) -> None:
+        """Cache ``view`` for ``path``.
+
+        Without a ``stamp`` the entry is pinned and the file is not checked
+        until :meth:`invalidate` or another :meth:`put`; used for saves that
+        have not reached the disk yet.
+        """
+        checked_at = time.monotonic() if stamp else float("inf")
+        with self._lock:
+            self._entries[str(path)] = (stamp, checked_at, view)
+
+    def invalidate(self, path: Path) -> None:
+        """Forget ``path`` so the next read parses it again."""
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+
+settings_cache = SettingsCache()
+
+
+def _atomic_write_json(path: Path, data) -> None:
+    """Write ``data`` to a temporary file beside ``path`` and rename it over.
+
+    Readers, including other processes, see either the old or the new file
+    and never a partly written one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SettingsWriter:
+    """Coalesce saves into one atomic write per file every ``delay`` seconds.
+
+    A save is visible through :data:`settings_cache` immediately and reaches
+    the disk when the pending batch is flushed; later saves of the same file
+    replace earlier ones.  :meth:`update` serialises read-modify-write saves
+    so concurrent changes to different keys of one file are all kept.
+    """
+
+    def __init__(self, cache: SettingsCache, delay: float = SETTINGS_WRITE_DELAY) -> None:
+        self.cache = cache
+        self.delay = delay
+        self._pending: dict = {}
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def write(self, path: Path, data) -> None:
+        view = _freeze(data)
+        with self._lock:
+            self._pending[str(path)] = (Path(path), view)
+            self.cache.put(path, view)
+            if self.delay <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def update(self, path: Path, change) -> None:
+        """Save the result of ``change(settings)`` applied to ``path``'s dict."""
+        with self._lock:
+            try:
+                settings = _thaw(self.cache.get(path))
+            except ValueError:
+                settings = None
+            if not isinstance(settings, dict):
+                settings = {}
+            change(settings)
+            self.write(path, settings)
+
+    def flush(self) -> bool:
+        """Write every pending save now; ``False`` if any write failed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            ok = True
+            for path, view in pending.values():
+                try:
+                    _atomic_write_json(path, _thaw(view))
+                    st = os.stat(path)
+                    self.cache.put(path, view, (st.st_mtime_ns, st.st_size))
+                except Exception as e:
+                    logger.error(f"Error writing settings file {path}: {e}")
+                    self.cache.invalidate(path)
+                    ok = False
+            return ok
+
+
+settings_writer = SettingsWriter(settings_cache)
+atexit.register(settings_writer.flush)
+
+
+def _write_json(path: Path, data) -> None:
+    settings_writer.write(path, data)
+
 
 def load_display_settings(path: Path = DISPLAY_SETTINGS_PATH):
     """Load display settings from ``path``."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                loaded_settings = json.load(f)
+        loaded_settings = settings_cache.get(path)
+        if loaded_settings is not None:
             settings = {}
             for key, value in loaded_settings.items():
                 if str(key).isdigit():
-                    settings[int(key)] = value
+                    settings[int(key)] = _thaw(value)
                 else:
-                    settings[key] = value
+                    settings[key] = _thaw(value)
             return settings
         return None
     except Exception as e:  # pragma: no cover - just log
@@ -54,8 +243,7 @@ def save_display_settings(settings: dict, path: Path = DISPLAY_SETTINGS_PATH) ->
     """Save display settings to ``path``."""
     try:
         json_settings = {str(k): v for k, v in settings.items()}
-        with open(path, "w") as f:
-            json.dump(json_settings, f, indent=4)
+        _write_json(path, json_settings)
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving display settings: {e}")
@@ -65,8 +253,7 @@ def save_display_settings(settings: dict, path: Path = DISPLAY_SETTINGS_PATH) ->
 def save_ip_addresses(addresses: dict, path: Path = IP_ADDRESSES_PATH) -> bool:
     """Save IP addresses to ``path``."""
     try:
-        with open(path, "w") as f:
-            json.dump(addresses, f, indent=4)
+        _write_json(path, addresses)
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving IP addresses: {e}")
@@ -77,9 +264,8 @@ def load_ip_addresses(path: Path = IP_ADDRESSES_PATH) -> dict:
     """Load IP addresses from ``path``. Returns defaults if file is missing or invalid."""
     try:
         default_data = {"addresses": [{"ip": "192.168.0.125", "label": "Default"}]}
-        if path.exists():
-            with open(path, "r") as f:
-                addresses = json.load(f)
+        addresses = _thaw(settings_cache.get(path))
+        if addresses is not None:
             if not isinstance(addresses, dict) or "addresses" not in addresses:
                 logger.warning("Invalid format in ip_addresses.json, using default")
                 return default_data
@@ -105,10 +291,9 @@ def load_ip_addresses(path: Path = IP_ADDRESSES_PATH) -> dict:
 def load_theme_preference(path: Path = DISPLAY_SETTINGS_PATH) -> str:
     """Load the UI theme preference."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                settings = json.load(f)
-                return settings.get("app_theme", "light")
+        settings = settings_cache.get(path)
+        if settings is not None:
+            return settings.get("app_theme", "light")
         return "light"
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error loading theme preference: {e}")
@@ -118,16 +303,7 @@ def load_theme_preference(path: Path = DISPLAY_SETTINGS_PATH) -> str:
 def save_theme_preference(theme: str, path: Path = DISPLAY_SETTINGS_PATH) -> bool:
     """Save theme preference."""
     try:
-        settings = {}
-        if path.exists():
-            with open(path, "r") as f:
-                try:
-                    settings = json.load(f)
-                except json.JSONDecodeError:
-                    settings = {}
-        settings["app_theme"] = theme
-        with open(path, "w") as f:
-            json.dump(settings, f, indent=4)
+        settings_writer.update(path, lambda settings: settings.update(app_theme=theme))
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving theme preference: {e}")
@@ -137,14 +313,13 @@ def save_theme_preference(theme: str, path: Path = DISPLAY_SETTINGS_PATH) -> boo
 def load_weight_preference(path: Path = DISPLAY_SETTINGS_PATH) -> dict:
     """Load capacity unit preference."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                settings = json.load(f)
-                return {
-                    "unit": settings.get("capacity_unit", "lb"),
-                    "label": settings.get("capacity_custom_label", ""),
-                    "value": settings.get("capacity_custom_value", 1.0),
-                }
+        settings = settings_cache.get(path)
+        if settings is not None:
+            return {
+                "unit": settings.get("capacity_unit", "lb"),
+                "label": settings.get("capacity_custom_label", ""),
+                "value": settings.get("capacity_custom_value", 1.0),
+            }
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error loading capacity unit preference: {e}")
     return DEFAULT_WEIGHT_PREF.copy()
@@ -153,18 +328,14 @@ def load_weight_preference(path: Path = DISPLAY_SETTINGS_PATH) -> dict:
 def save_weight_preference(unit: str, label: str = "", value: float = 1.0, path: Path = DISPLAY_SETTINGS_PATH) -> bool:
     """Save capacity unit preference."""
     try:
-        settings = {}
-        if path.exists():
-            with open(path, "r") as f:
-                try:
-                    settings = json.load(f)
-                except json.JSONDecodeError:
-                    settings = {}
-        settings["capacity_unit"] = unit
-        settings["capacity_custom_label"] = label
-        settings["capacity_custom_value"] = value
-        with open(path, "w") as f:
-            json.dump(settings, f, indent=4)
+        settings_writer.update(
+            path,
+            lambda settings: settings.update(
+                capacity_unit=unit,
+                capacity_custom_label=label,
+                capacity_custom_value=value,
+            ),
+        )
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving capacity unit preference: {e}")
@@ -174,10 +345,9 @@ def save_weight_preference(unit: str, label: str = "", value: float = 1.0, path:
 def load_language_preference(path: Path = DISPLAY_SETTINGS_PATH) -> str:
     """Load UI language preference."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                settings = json.load(f)
-                return settings.get("language", DEFAULT_LANGUAGE)
+        settings = settings_cache.get(path)
+        if settings is not None:
+            return settings.get("language", DEFAULT_LANGUAGE)
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error loading language preference: {e}")
     return DEFAULT_LANGUAGE
@@ -186,16 +356,7 @@ def load_language_preference(path: Path = DISPLAY_SETTINGS_PATH) -> str:
 def save_language_preference(language: str, path: Path = DISPLAY_SETTINGS_PATH) -> bool:
     """Save UI language preference."""
     try:
-        settings = {}
-        if path.exists():
-            with open(path, "r") as f:
-                try:
-                    settings = json.load(f)
-                except json.JSONDecodeError:
-                    settings = {}
-        settings["language"] = language
-        with open(path, "w") as f:
-            json.dump(settings, f, indent=4)
+        settings_writer.update(path, lambda settings: settings.update(language=language))
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving language preference: {e}")
@@ -266,16 +427,15 @@ def capacity_unit_label(pref: dict, per_hour: bool = True) -> str:
 def load_email_settings(path: Path = EMAIL_SETTINGS_PATH) -> dict:
     """Load SMTP email settings."""
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                data = json.load(f)
-                return {
-                    "smtp_server": data.get("smtp_server", DEFAULT_EMAIL_SETTINGS["smtp_server"]),
-                    "smtp_port": data.get("smtp_port", DEFAULT_EMAIL_SETTINGS["smtp_port"]),
-                    "smtp_username": data.get("smtp_username", ""),
-                    "smtp_password": data.get("smtp_password", ""),
-                    "from_address": data.get("from_address", DEFAULT_EMAIL_SETTINGS["from_address"]),
-                }
+        data = settings_cache.get(path)
+        if data is not None:
+            return {
+                "smtp_server": data.get("smtp_server", DEFAULT_EMAIL_SETTINGS["smtp_server"]),
+                "smtp_port": data.get("smtp_port", DEFAULT_EMAIL_SETTINGS["smtp_port"]),
+                "smtp_username": data.get("smtp_username", ""),
+                "smtp_password": data.get("smtp_password", ""),
+                "from_address": data.get("from_address", DEFAULT_EMAIL_SETTINGS["from_address"]),
+            }
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error loading email settings: {e}")
     return DEFAULT_EMAIL_SETTINGS.copy()
@@ -284,8 +444,7 @@ def load_email_settings(path: Path = EMAIL_SETTINGS_PATH) -> dict:
 def save_email_settings(settings: dict, path: Path = EMAIL_SETTINGS_PATH) -> bool:
     """Save SMTP email settings."""
     try:
-        with open(path, "w") as f:
-            json.dump(settings, f, indent=4)
+        _write_json(path, settings)
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving email settings: {e}")
@@ -301,15 +460,14 @@ def load_threshold_settings(path: Path = THRESHOLD_SETTINGS_PATH):
     notifications are sent.
     """
     try:
-        if path.exists():
-            with open(path, "r") as f:
-                loaded_settings = json.load(f)
+        loaded_settings = settings_cache.get(path)
+        if loaded_settings is not None:
             settings = {}
             for key, value in loaded_settings.items():
                 if key in ["email_enabled", "email_address", "email_minutes"]:
-                    settings[key] = value
+                    settings[key] = _thaw(value)
                 else:
-                    settings[int(key)] = value
+                    settings[int(key)] = _thaw(value)
             return settings
         else:
             return None
@@ -322,14 +480,38 @@ def save_threshold_settings(settings: dict, path: Path = THRESHOLD_SETTINGS_PATH
     """Save threshold settings to ``path``."""
     try:
         json_settings = {str(k): v for k, v in settings.items()}
-        with open(path, "w") as f:
-            json.dump(json_settings, f, indent=4)
+        _write_json(path, json_settings)
         return True
     except Exception as e:  # pragma: no cover - just log
         logger.error(f"Error saving threshold settings: {e}")
         return False
 
 
+def load_report_schedules(path: Path = REPORT_SCHEDULES_PATH) -> list:
+    """Load scheduled report definitions from ``path``.
+
+    Each entry is a dict with ``name``, a five-field ``cron`` expression,
+    a list of ``recipients`` and optional ``use_optimized``/``enabled`` flags.
+    """
+    try:
+        data = settings_cache.get(path)
+        if data is not None:
+            return _thaw(data.get("schedules", ()))
+    except Exception as e:  # pragma: no cover - just log
+        logger.error(f"Error loading report schedules: {e}")
+    return []
+
+
+def save_report_schedules(schedules: list, path: Path = REPORT_SCHEDULES_PATH) -> bool:
+    """Save scheduled report definitions to ``path``."""
+    try:
+        _write_json(path, {"schedules": schedules})
+        return True
+    except Exception as e:  # pragma: no cover - just log
+        logger.error(f"Error saving report schedules: {e}")
+        return False
+
+
 
 __all__ = [
     "load_display_settings",
@@ -346,9 +528,15 @@ __all__ = [
     "save_email_settings",
     "load_threshold_settings",
     "save_threshold_settings",
+    "load_report_schedules",
+    "save_report_schedules",
     "convert_capacity_from_kg",
     "convert_capacity_to_lbs",
     "convert_capacity_from_lbs",
     "capacity_unit_label",
     "DEFAULT_LANGUAGE",
+    "SettingsCache",
+    "settings_cache",
+    "SettingsWriter",
+    "settings_writer",
 ]
@@ -1,6 +1,7 @@
 """Application state classes used by the dashboard."""
 
 
+import itertools
 from datetime import datetime
 
 try:  # pragma: no cover - optional dependency
@@ -8,6 +9,10 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - optional dependency
     pd = None
 
+# Shared by every tag so versions are comparable across tags; the newest
+# version of a set of tags tells whether any of them changed.
+_tag_versions = itertools.count(1)
+
 
 class AppState:
     """Simple container for OPC UA connection state."""
@@ -21,6 +26,8 @@ class AppState:
         self.thread_stop_flag = False
         self.update_thread = None
         self.tags = {}
+        # Server URL of the connected machine; keys its trend buffer
+        self.machine_id = None
 
 
 class TagData:
@@ -32,11 +39,16 @@ class TagData:
         self.timestamps = []
         self.values = []
         self.latest_value = None
+        # Bumped from ``_tag_versions`` whenever ``latest_value`` changes
+        self.version = 0
 
     def add_value(self, value, timestamp=None) -> None:
         if timestamp is None:
             timestamp = datetime.now()
 
+        if self.version == 0 or value != self.latest_value:
+            self.version = next(_tag_versions)
+
         self.timestamps.append(timestamp)
         self.values.append(value)
         self.latest_value = value
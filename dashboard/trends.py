@@ -0,0 +1,131 @@
+"""Server-side trend buffers filled by the OPC poller.
+
+The production rate and the twelve defect counters are sampled once per
+:data:`TREND_INTERVAL` for each machine, whatever the number of open
+dashboards.  Callbacks only read :class:`TrendView` copies, so rendering a
+trend never advances it and every browser sees the same samples.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Hashable, Optional
+
+#: Points kept on the production and counter trend graphs.
+TREND_WINDOW = 60
+#: Seconds between trend samples.
+TREND_INTERVAL = 1.0
+
+OBJECTS_PER_MIN_TAG = "Status.ColorSort.Sort1.Throughput.ObjectPerMin.Current"
+DEFECT_COUNT_TAG = "Status.ColorSort.Sort1.DefectCount{}.Rate.Current"
+COUNTER_COUNT = 12
+
+
+class TrendView:
+    """Immutable copy of a machine's trend buffer."""
+
+    __slots__ = ("samples", "production", "counters")
+
+    def __init__(self, samples: int, production: tuple, counters: tuple) -> None:
+        #: Number of samples ever recorded; the newest point has x ``samples - 1``
+        self.samples = samples
+        self.production = production
+        self.counters = counters
+
+    @property
+    def latest_counters(self) -> list:
+        """Return the newest value of each counter, ``0`` before any sample."""
+        return [hist[-1] if hist else 0 for hist in self.counters]
+
+
+class TrendBuffer:
+    """Fixed-size history of the production rate and counters of one machine."""
+
+    def __init__(self, window: int = TREND_WINDOW) -> None:
+        self.samples = 0
+        self.production: deque = deque(maxlen=window)
+        self.counters = [deque(maxlen=window) for _ in range(COUNTER_COUNT)]
+        self._lock = threading.Lock()
+
+    def record(self, values: dict) -> None:
+        """Append one sample taken from the tag ``values``.
+
+        A counter whose tag is missing repeats its previous value.
+        """
+        with self._lock:
+            self.production.append(values.get(OBJECTS_PER_MIN_TAG, 0))
+            for i, hist in enumerate(self.counters, 1):
+                previous = hist[-1] if hist else 0
+                hist.append(values.get(DEFECT_COUNT_TAG.format(i), previous))
+            self.samples += 1
+
+    def view(self) -> TrendView:
+        with self._lock:
+            return TrendView(
+                self.samples,
+                tuple(self.production),
+                tuple(tuple(hist) for hist in self.counters),
+            )
+
+
+class TrendRecorder:
+    """Per-machine trend buffers sampled at a fixed rate."""
+
+    def __init__(
+        self, window: int = TREND_WINDOW, interval: float = TREND_INTERVAL
+    ) -> None:
+        self.window = window
+        self.interval = interval
+        self._buffers: Dict[Hashable, TrendBuffer] = {}
+        self._due: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def buffer(self, machine_id: Hashable) -> TrendBuffer:
+        with self._lock:
+            buf = self._buffers.get(machine_id)
+            if buf is None:
+                buf = self._buffers[machine_id] = TrendBuffer(self.window)
+            return buf
+
+    def sample(
+        self, machine_id: Hashable, values: dict, now: Optional[float] = None
+    ) -> bool:
+        """Record ``values`` for ``machine_id`` if a sample is due.
+
+        Returns ``True`` when a sample was taken.  Polls arriving well before
+        the next slot are ignored, and a poller that stalled resumes the
+        schedule from now instead of back-filling the gap.
+        """
+        now = time.monotonic() if now is None else now
+        buf = self.buffer(machine_id)
+        with self._lock:
+            due = self._due.get(machine_id, now)
+            # Half an interval of slack absorbs jitter in the poll timing
+            if now < due - self.interval / 2:
+                return False
+            due += self.interval
+            self._due[machine_id] = due if due > now else now + self.interval
+        buf.record(values)
+        return True
+
+    def view(self, machine_id: Hashable) -> TrendView:
+        return self.buffer(machine_id).view()
+
+    def discard(self, machine_id: Hashable) -> None:
+        with self._lock:
+            self._buffers.pop(machine_id, None)
+            self._due.pop(machine_id, None)
+
+
+trend_buffers = TrendRecorder()
+
+__all__ = [
+    "TREND_WINDOW",
+    "TREND_INTERVAL",
+    "TrendView",
+    "TrendBuffer",
+    "TrendRecorder",
+    "trend_buffers",
+]
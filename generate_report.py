@@ -1,9 +1,17 @@
 import os
 import sys
+import copy
 import datetime
+import functools
+import hashlib
+import json
+import tempfile
 import pandas as pd
 import logging
+import threading
+from collections import deque
 from datetime import timedelta
+from typing import Callable, Optional
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
@@ -14,8 +22,18 @@ from reportlab.graphics.charts.piecharts import Pie
 from reportlab.graphics import renderPDF
 from reportlab.lib import colors
 import math  # for label angle calculations
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from hourly_data_saving import EXPORT_DIR as METRIC_EXPORT_DIR, get_historical_data
+try:  # pragma: no cover - optional dependency used to merge parallel renders
+    from pypdf import PdfWriter
+except Exception:  # pragma: no cover - optional dependency
+    PdfWriter = None
+
+from hourly_data_saving import (
+    EXPORT_DIR as METRIC_EXPORT_DIR,
+    downsample_series,
+    get_historical_data,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,54 +42,515 @@ logging.basicConfig(
 logging.getLogger().handlers.clear()
 logger = logging.getLogger(__name__)
 
+METRICS_FILENAME = 'last_24h_metrics.csv'
 
+# Page geometry shared by the standard and optimized layouts
+PAGE_MARGIN = 40
+HEADER_HEIGHT = 100
+MACHINE_SECTION_HEIGHT = 260  # INCREASED from 220 to 260 for larger sections
+MACHINE_SPACING = 20
+OPTIMIZED_MACHINES_PER_PAGE = 2
 
-def draw_header(c, width, height, page_number=None):
-    """Draw the header section on each page with optional page number"""
-    # Register Audiowide font with correct filename from Google Fonts
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Check what font files actually exist in the directory
-    logger.debug(f"Checking directory: {script_dir}")
+# Below this many machine pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+# Capacity trend points kept per machine; bounds memory for large sites
+TREND_MAX_POINTS = 300
+
+# Floor/machine layout saved by the dashboard (see dashboard.machine_layout)
+LAYOUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                           'floor_machine_layout.json')
+
+
+def _machine_sort_key(machine):
+    """Order numeric machine ids numerically ahead of named machines."""
+    return (0, int(machine), '') if machine.isdigit() else (1, 0, machine)
+
+
+def list_report_machines(csv_parent_dir):
+    """Return the machine directories in ``csv_parent_dir`` that hold metrics."""
+    return sorted(
+        (d for d in os.listdir(csv_parent_dir)
+         if os.path.isfile(os.path.join(csv_parent_dir, d, METRICS_FILENAME))),
+        key=_machine_sort_key,
+    )
+
+
+def report_manifest(machines_data, csv_parent_dir=METRIC_EXPORT_DIR, floors_data=None):
+    """Return ``{export directory: label}`` for the machines in a saved layout.
+
+    Machines are ordered floor by floor.  Each machine's metrics live in a
+    directory named after its id, or after its label for exports written by
+    older versions.  Returns ``None`` when the layout has no machines.
+    """
+    floor_order = {f.get('id'): idx for idx, f in enumerate((floors_data or {}).get('floors', []))}
+    machines = sorted((machines_data or {}).get('machines', []),
+                      key=lambda m: floor_order.get(m.get('floor_id'), len(floor_order)))
+    manifest = {}
+    for entry in machines:
+        label = entry.get('name') or f"Machine {entry.get('id')}"
+        candidates = [str(entry.get('id')), str(entry.get('name') or '')]
+        machine_dir = next(
+            (d for d in candidates if d and os.path.isdir(os.path.join(csv_parent_dir, d))),
+            candidates[0],
+        )
+        manifest[machine_dir] = label
+    return manifest or None
+
+
+def load_report_manifest(layout_path=None, csv_parent_dir=METRIC_EXPORT_DIR):
+    """Return the :func:`report_manifest` of the layout saved at ``layout_path``."""
+    layout_path = layout_path or LAYOUT_PATH
+    if not os.path.isfile(layout_path):
+        return None
     try:
-        files_in_dir = [f for f in os.listdir(script_dir) if f.lower().endswith('.ttf')]
-        logger.debug(f"TTF files found in directory: {files_in_dir}")
+        with open(layout_path, 'r') as fh:
+            data = json.load(fh)
     except Exception as e:
-        logger.debug(f"Error listing directory: {e}")
-    
-    # Try different possible filenames for Audiowide font
-    possible_font_files = [
-        'Audiowide-Regular.ttf',  # This is the actual Google Fonts filename
-        'Audiowide.ttf',
-        'audiowide-regular.ttf',
-        'audiowide.ttf'
-    ]
-    
-    font_enpresor = 'Helvetica-Bold'  # Default fallback
-    font_found = False
-    
-    for font_filename in possible_font_files:
-        font_path = os.path.join(script_dir, font_filename)
-        logger.debug(f"Trying font file: {font_path}")
-        
-        if os.path.isfile(font_path):
+        logger.error(f"Error loading machine layout for report: {e}")
+        return None
+    return report_manifest(data.get('machines'), csv_parent_dir, data.get('floors'))
+
+
+def resolve_report_manifest(csv_parent_dir, manifest=None):
+    """Return ``manifest`` or, when omitted, the one from the saved layout."""
+    if manifest is not None:
+        return manifest
+    return load_report_manifest(csv_parent_dir=csv_parent_dir)
+
+
+def report_fingerprint(csv_parent_dir, use_optimized=False, manifest=None):
+    """Return a hash of everything a report rendered now would depend on.
+
+    The key covers the layout mode, the date printed in the header, the
+    machine manifest and the modification time and size of every machine's
+    metrics CSV, so identical requests can reuse a previously rendered PDF.
+    """
+    h = hashlib.sha1()
+    mode = 'optimized' if use_optimized else 'standard'
+    h.update(f"{mode}|{datetime.datetime.now().strftime('%m/%d/%Y')}".encode())
+    manifest = resolve_report_manifest(csv_parent_dir, manifest)
+    if manifest is not None:
+        h.update(json.dumps(manifest).encode())
+        machines = list(manifest)
+    elif os.path.isdir(csv_parent_dir):
+        machines = list_report_machines(csv_parent_dir)
+    else:
+        machines = []
+    for machine in machines:
+        fp = os.path.join(csv_parent_dir, machine, METRICS_FILENAME)
+        try:
+            st = os.stat(fp)
+            h.update(f"|{machine}:{st.st_mtime_ns}:{st.st_size}".encode())
+        except OSError:
+            h.update(f"|{machine}:-".encode())
+    return h.hexdigest()
+
+
+def _column_sum(df, column):
+    """Return the numeric sum of ``column`` or 0 when it is missing."""
+    if column not in df.columns:
+        return 0
+    return pd.to_numeric(df[column], errors='coerce').sum()
+
+
+class MachineReportData:
+    """Aggregated 24h metrics for one machine, computed from a single CSV read."""
+
+    def __init__(self, machine, df):
+        self.machine = machine
+
+        # Normalise headers once so lookups no longer need case-insensitive scans
+        df = df.rename(columns=lambda col: str(col).strip().lower())
+
+        self.capacity_total = _column_sum(df, 'capacity')
+        self.accepts = _column_sum(df, 'accepts')
+        self.rejects = _column_sum(df, 'rejects')
+        self.objects_total = _column_sum(df, 'objects_per_min')
+
+        self.counter_averages = []
+        self.removed_total = 0
+        for i in range(1, 13):
+            col = f'counter_{i}'
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors='coerce')
+            self.removed_total += values.sum()
+            avg_val = values.mean()
+            if not pd.isna(avg_val):
+                self.counter_averages.append((f"S{i}", avg_val))
+
+        self.max_firing = max((avg for _, avg in self.counter_averages), default=0)
+
+        # Capacity trend used by the global summary graph
+        self.trend_times = []
+        self.trend_values = []
+        if 'capacity' in df.columns and 'timestamp' in df.columns and not df.empty:
+            trend = pd.DataFrame({
+                'timestamp': pd.to_datetime(df['timestamp'], errors='coerce'),
+                'capacity': pd.to_numeric(df['capacity'], errors='coerce'),
+            }).dropna()
+            if not trend.empty:
+                self.trend_times, self.trend_values = downsample_series(
+                    list(trend['timestamp']),
+                    [float(v) for v in trend['capacity']],
+                    TREND_MAX_POINTS,
+                )
+
+    @classmethod
+    def from_values(cls, machine, *, capacity_total, accepts, rejects, objects_total,
+                    counter_sums, counter_counts, trend_times, trend_values):
+        """Build report data from precomputed sums instead of a DataFrame.
+
+        ``counter_sums`` and ``counter_counts`` map counter numbers (1-12) to
+        the sum and number of valid samples seen for that counter.
+        """
+        data = cls.__new__(cls)
+        data.machine = machine
+        data.capacity_total = capacity_total
+        data.accepts = accepts
+        data.rejects = rejects
+        data.objects_total = objects_total
+        data.counter_averages = [
+            (f"S{i}", counter_sums[i] / counter_counts[i])
+            for i in sorted(counter_counts) if counter_counts[i]
+        ]
+        data.removed_total = sum(counter_sums.values())
+        data.max_firing = max((avg for _, avg in data.counter_averages), default=0)
+        data.trend_times, data.trend_values = downsample_series(
+            list(trend_times), list(trend_values), TREND_MAX_POINTS
+        )
+        return data
+
+    @classmethod
+    def from_csv(cls, csv_parent_dir, machine):
+        """Load ``machine`` from ``csv_parent_dir`` or return ``None`` if unavailable."""
+        fp = os.path.join(csv_parent_dir, machine, METRICS_FILENAME)
+        if not os.path.isfile(fp):
+            return None
+        try:
+            return cls(machine, pd.read_csv(fp))
+        except Exception as e:
+            logger.error(f"Error reading data for machine {machine}: {e}")
+            return None
+
+
+class ReportDataset:
+    """All report inputs, loaded once per report.
+
+    Each machine's ``last_24h_metrics.csv`` is read exactly once, one machine
+    at a time, and only its aggregates and a bounded trend are kept, so memory
+    stays small however many machines a site has.  Totals, per-machine
+    averages and the global maximum firing average are computed up front so
+    the drawing functions never touch the filesystem.
+
+    ``manifest`` maps export directory names to display labels (see
+    :func:`report_manifest`); without it every machine directory is included.
+    """
+
+    def __init__(self, csv_parent_dir, manifest=None):
+        self.csv_parent_dir = csv_parent_dir
+        if manifest is None:
+            self.machines = list_report_machines(csv_parent_dir)
+        else:
+            self.machines = list(manifest)
+        self.labels = dict(manifest or {})
+        self.machine_data = {}
+        for machine in self.machines:
+            data = MachineReportData.from_csv(csv_parent_dir, machine)
+            if data is not None:
+                self.machine_data[machine] = data
+        self._compute_totals()
+
+    @classmethod
+    def from_machine_data(cls, machine_data, csv_parent_dir=None, manifest=None):
+        """Build a dataset from already aggregated :class:`MachineReportData`."""
+        dataset = cls.__new__(cls)
+        dataset.csv_parent_dir = csv_parent_dir
+        if manifest is None:
+            dataset.machines = sorted(machine_data, key=_machine_sort_key)
+        else:
+            dataset.machines = list(manifest)
+        dataset.labels = dict(manifest or {})
+        dataset.machine_data = {m: machine_data[m] for m in dataset.machines
+                                if m in machine_data}
+        dataset._compute_totals()
+        return dataset
+
+    def _compute_totals(self):
+        loaded = self.machine_data.values()
+        self.total_capacity = sum(d.capacity_total for d in loaded)
+        self.total_accepts = sum(d.accepts for d in loaded)
+        self.total_rejects = sum(d.rejects for d in loaded)
+        self.total_objects = sum(d.objects_total for d in loaded)
+        self.total_removed = sum(d.removed_total for d in loaded)
+        self.global_max_firing = max((d.max_firing for d in loaded), default=0)
+
+    def get(self, machine):
+        """Return the :class:`MachineReportData` for ``machine`` or ``None``."""
+        return self.machine_data.get(machine)
+
+    def label(self, machine):
+        """Return the name printed for ``machine``."""
+        return self.labels.get(machine) or f"Machine {machine}"
+
+    def subset(self, machines):
+        """Return a copy limited to ``machines`` that keeps the global totals."""
+        wanted = set(machines)
+        part = copy.copy(self)
+        part.machines = [m for m in self.machines if m in wanted]
+        part.machine_data = {m: d for m, d in self.machine_data.items() if m in wanted}
+        return part
+
+
+def _as_dataset(source):
+    """Return ``source`` if it is a :class:`ReportDataset`, else build one from a path."""
+    if isinstance(source, ReportDataset):
+        return source
+    return ReportDataset(source)
+
+
+def _parse_float(value):
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(result) else result
+
+
+def _parse_timestamp(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.strptime(str(value), '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        ts = pd.to_datetime(value, errors='coerce')
+        return None if pd.isna(ts) else ts.to_pydatetime()
+
+
+class RollingMachineAggregate:
+    """Running sums over one machine's metric rows inside a sliding window."""
+
+    _TOTAL_FIELDS = ('capacity', 'accepts', 'rejects', 'objects_per_min')
+
+    def __init__(self, machine, window=timedelta(hours=24)):
+        self.machine = machine
+        self.window = window
+        self.rows = deque()
+        self.totals = dict.fromkeys(self._TOTAL_FIELDS, 0.0)
+        self.counter_sums = {}
+        self.counter_counts = {}
+        # Newest timestamp added and how many rows carried it
+        self.last_timestamp = None
+        self.last_count = 0
+
+    def _parse_row(self, row):
+        row = {str(k).strip().lower(): v for k, v in row.items()}
+        timestamp = _parse_timestamp(row.get('timestamp'))
+        if timestamp is None:
+            return None
+        values = {field: _parse_float(row.get(field)) for field in self._TOTAL_FIELDS}
+        counters = {}
+        for i in range(1, 13):
+            col = f'counter_{i}'
+            if col in row:
+                counters[i] = _parse_float(row[col])
+        return timestamp, values, counters
+
+    def _append(self, timestamp, values, counters):
+        if timestamp == self.last_timestamp:
+            self.last_count += 1
+        else:
+            self.last_timestamp, self.last_count = timestamp, 1
+        self.rows.append((timestamp, values, counters))
+        self._apply(values, counters, 1)
+
+    def extend(self, rows):
+        """Add the rows of a re-read CSV that are newer than those already added.
+
+        ``rows`` holds the file's records in time order; rows up to and including the
+        last timestamp already seen are skipped, counting duplicates of that
+        timestamp so rows written within the same second are not lost.
+        """
+        last, skip = self.last_timestamp, self.last_count
+        for parsed in map(self._parse_row, rows):
+            if parsed is None:
+                continue
+            if last is not None:
+                if parsed[0] < last:
+                    continue
+                if parsed[0] == last and skip:
+                    skip -= 1
+                    continue
+            self._append(*parsed)
+
+    def expire(self, now):
+        """Drop rows that have fallen out of the window ending at ``now``."""
+        cutoff = now - self.window
+        while self.rows and self.rows[0][0] < cutoff:
+            _, values, counters = self.rows.popleft()
+            self._apply(values, counters, -1)
+
+    def _apply(self, values, counters, sign):
+        for field, value in values.items():
+            if value is not None:
+                self.totals[field] += sign * value
+        for i, value in counters.items():
+            self.counter_counts.setdefault(i, 0)
+            self.counter_sums.setdefault(i, 0.0)
+            if value is not None:
+                self.counter_counts[i] += sign
+                self.counter_sums[i] += sign * value
+
+    def snapshot(self):
+        """Return the current window as :class:`MachineReportData`."""
+        trend = [(ts, values['capacity']) for ts, values, _ in self.rows
+                 if values['capacity'] is not None]
+        return MachineReportData.from_values(
+            self.machine,
+            capacity_total=self.totals['capacity'],
+            accepts=self.totals['accepts'],
+            rejects=self.totals['rejects'],
+            objects_total=self.totals['objects_per_min'],
+            counter_sums=dict(self.counter_sums),
+            counter_counts=dict(self.counter_counts),
+            trend_times=[ts for ts, _ in trend],
+            trend_values=[value for _, value in trend],
+        )
+
+
+class ReportAggregator:
+    """Report inputs maintained incrementally from the CSV exports.
+
+    :meth:`refresh` re-reads a machine's metrics CSV only when its size or
+    modification time changed and folds just the rows newer than those it
+    already holds into running sums.  :meth:`dataset` refreshes first, so
+    scheduled reports follow the exports written by the dashboard without
+    re-aggregating unchanged machines.
+    """
+
+    def __init__(self, export_dir=METRIC_EXPORT_DIR, window=timedelta(hours=24)):
+        self.export_dir = export_dir
+        self.window = window
+        self._machines = {}
+        # (mtime_ns, size) of each machine's CSV when it was last read
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Fold rows written to the CSV exports since the last refresh."""
+        if not os.path.isdir(self.export_dir):
+            return
+        for machine in list_report_machines(self.export_dir):
+            fp = os.path.join(self.export_dir, machine, METRICS_FILENAME)
+            try:
+                stat = os.stat(fp)
+            except OSError:
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self._files.get(machine) == stamp:
+                continue
+            try:
+                rows = pd.read_csv(fp).to_dict('records')
+            except Exception as e:
+                logger.error(f"Error reading data for machine {machine}: {e}")
+                continue
+            with self._lock:
+                self._files[machine] = stamp
+                aggregate = self._machines.get(machine)
+                if aggregate is None:
+                    aggregate = self._machines[machine] = RollingMachineAggregate(
+                        machine, self.window
+                    )
+                aggregate.extend(rows)
+
+    # The first refresh loads every stored row
+    seed = refresh
+
+    def dataset(self, now=None, manifest=None):
+        """Return a :class:`ReportDataset` for the window ending at ``now``.
+
+        Machines come from ``manifest`` or, when omitted, the saved layout.
+        """
+        now = now or datetime.datetime.now()
+        manifest = resolve_report_manifest(self.export_dir, manifest)
+        self.refresh()
+        with self._lock:
+            machine_data = {}
+            for machine, aggregate in self._machines.items():
+                if manifest is not None and machine not in manifest:
+                    continue
+                aggregate.expire(now)
+                machine_data[machine] = aggregate.snapshot()
+        return ReportDataset.from_machine_data(machine_data, self.export_dir, manifest)
+
+
+# Candidate filenames for the Audiowide title font, in order of preference
+AUDIOWIDE_FONT_FILES = [
+    'Audiowide-Regular.ttf',  # This is the actual Google Fonts filename
+    'Audiowide.ttf',
+    'audiowide-regular.ttf',
+    'audiowide.ttf'
+]
+
+HEADER_FORM_NAME = 'EnpresorReportHeader'
+
+
+class ReportResources:
+    """Fonts and colour palettes shared by every report page.
+
+    Resources are resolved and registered with reportlab once per process by
+    :func:`get_report_resources`; drawing code only reads the attributes.
+    """
+
+    def __init__(self, resource_dir):
+        self.resource_dir = resource_dir
+        self.title_font = self._register_title_font()
+
+        # Colour palettes
+        self.summary_blue = colors.HexColor('#1f77b4')
+        self.trend_colors = [colors.blue, colors.red, colors.green, colors.orange, colors.purple]
+        self.bar_colors = [colors.red, colors.blue, colors.green, colors.orange,
+                           colors.purple, colors.brown, colors.pink, colors.gray,
+                           colors.cyan, colors.magenta, colors.yellow, colors.black]
+
+    def _register_title_font(self):
+        """Register the Audiowide font and return its name, or a built-in fallback."""
+        for font_filename in AUDIOWIDE_FONT_FILES:
+            font_path = os.path.join(self.resource_dir, font_filename)
+            if not os.path.isfile(font_path):
+                continue
             try:
                 pdfmetrics.registerFont(TTFont('Audiowide', font_path))
-                font_enpresor = 'Audiowide'
-                logger.debug(f"\u2705 Successfully registered Audiowide from: {font_path}")
-                font_found = True
-                break
+                logger.debug(f"Registered Audiowide from: {font_path}")
+                return 'Audiowide'
             except Exception as e:
-                logger.debug(f"\u274C Error registering font from {font_path}: {e}")
-        else:
-            logger.debug(f"\u274C Font file not found: {font_path}")
-    
-    if not font_found:
-        logger.debug("\u26A0\ufe0f  No Audiowide font file found.")
-        logger.debug("The file you downloaded might be named 'Audiowide-Regular.ttf'")
-        logger.debug("Either rename it to 'Audiowide.ttf' or ensure 'Audiowide-Regular.ttf' is in:")
-        logger.debug(f"{script_dir}")
+                logger.debug(f"Error registering font from {font_path}: {e}")
+
+        logger.debug(
+            f"No Audiowide font file found in {self.resource_dir}; using Helvetica-Bold"
+        )
+        return 'Helvetica-Bold'
+
+
+_report_resources = None
+_report_resources_lock = threading.Lock()
 
+
+def get_report_resources():
+    """Return the process-wide :class:`ReportResources`, creating it on first use."""
+    global _report_resources
+    if _report_resources is None:
+        with _report_resources_lock:
+            if _report_resources is None:
+                _report_resources = ReportResources(
+                    os.path.dirname(os.path.abspath(__file__))
+                )
+    return _report_resources
+
+
+def _draw_header_artwork(c, width, height, font_enpresor):
+    """Draw the static title and date stamp shared by every page."""
     # Document title
     title_size = 24
     x_center = width / 2
@@ -96,7 +575,6 @@ def draw_header(c, width, height, page_number=None):
     c.setFont(font_enpresor, title_size)
     c.setFillColor(colors.red)
     c.drawString(start_x + w_sat, y_title, enpresor)
-    logger.debug(f"Drawing 'Enpresor' with font: {font_enpresor}")
     
     # Draw " Data Report" in black
     c.setFont(font_default, title_size)
@@ -108,10 +586,24 @@ def draw_header(c, width, height, page_number=None):
     c.setFont('Helvetica', 10)
     c.setFillColor(colors.black)
     c.drawCentredString(x_center, height - 70, date_str)
+
+
+def draw_header(c, width, height, page_number=None):
+    """Draw the header section on each page with optional page number
+
+    The static artwork is recorded once per document as a reusable form and
+    referenced from every page; only the page number is drawn per page.
+    """
+    if not c.hasForm(HEADER_FORM_NAME):
+        resources = get_report_resources()
+        c.beginForm(HEADER_FORM_NAME)
+        _draw_header_artwork(c, width, height, resources.title_font)
+        c.endForm()
+    c.doForm(HEADER_FORM_NAME)
     
     # Add page number in bottom right corner
     if page_number is not None:
-        margin = 40  # Same margin as used in layout
+        margin = PAGE_MARGIN  # Same margin as used in layout
         c.setFont('Helvetica', 10)
         c.setFillColor(colors.black)
         page_text = f"Page {page_number}"
@@ -119,14 +611,18 @@ def draw_header(c, width, height, page_number=None):
         text_width = c.stringWidth(page_text, 'Helvetica', 10)
         c.drawString(width - margin - text_width, margin - 10, page_text)
     
-    return height - 100  # Return the Y position where content can start
+    return height - HEADER_HEIGHT  # Return the Y position where content can start
+
 
 
+def draw_global_summary(c, dataset, x0, y0, total_w, available_height):
+    """Draw the global summary sections (totals, pie, trend, counts)
 
-def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
-    """Draw the global summary sections (totals, pie, trend, counts)"""
-    machines = sorted([d for d in os.listdir(csv_parent_dir)
-                       if os.path.isdir(os.path.join(csv_parent_dir, d)) and d.isdigit()])
+    ``dataset`` is a :class:`ReportDataset`; an export directory path is also
+    accepted and loaded on the fly.
+    """
+    dataset = _as_dataset(dataset)
+    resources = get_report_resources()
     
     # Calculate section heights
     h1 = available_height * 0.1  # Totals
@@ -141,20 +637,13 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
     w_right = total_w * 0.6
     
     # Aggregate global data
-    total_capacity = total_accepts = total_rejects = 0
-    for m in machines:
-        fp = os.path.join(csv_parent_dir, m, 'last_24h_metrics.csv')
-        if os.path.isfile(fp):
-            df = pd.read_csv(fp)
-            total_capacity += df['capacity'].sum() if 'capacity' in df.columns else 0
-            ac = next((c for c in df.columns if c.lower()=='accepts'), None)
-            rj = next((c for c in df.columns if c.lower()=='rejects'), None)
-            if ac: total_accepts += df[ac].sum()
-            if rj: total_rejects += df[rj].sum()
+    total_capacity = dataset.total_capacity
+    total_accepts = dataset.total_accepts
+    total_rejects = dataset.total_rejects
 
     # Section 1: Totals
     y_sec1 = current_y - h1
-    c.setFillColor(colors.HexColor('#1f77b4'))
+    c.setFillColor(resources.summary_blue)
     c.rect(x0, y_sec1, total_w, h1, fill=1, stroke=0)
     c.setFillColor(colors.white); c.setFont('Helvetica-Bold', 10)
     c.drawString(x0+10, y_sec1+h1-14, '24hr Production Totals:')
@@ -208,7 +697,7 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
         percentages = [(val/total)*100 for val in values]
         angles = [45, -50]
         
-        for i, (label, pct, angle) in enumerate(zip(['Accepts','Rejects'], percentages, angles)):
+        for i, (slice_label, pct, angle) in enumerate(zip(['Accepts','Rejects'], percentages, angles)):
             angle_rad = math.radians(angle)
             radius = psz/2 * 0.9
             cx = px + psz/2 + math.cos(angle_rad) * radius
@@ -223,7 +712,7 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
             
             c.setFont('Helvetica-Bold', 8)
             c.setFillColor(colors.black)
-            label_text = f"{label}"
+            label_text = f"{slice_label}"
             pct_text = f"{pct:.1f}%"
             
             if math.cos(angle_rad) >= 0:
@@ -242,30 +731,17 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
     c.setFont('Helvetica-Bold',12); c.setFillColor(colors.black)
     c.drawCentredString(x0+w_left+w_right/2, y_sec2+h2-15,'Production Rates')
     
-    # Your existing trend graph code here
-    all_t, mx, series = [], 0, []
-    
-    for m in machines:
-        fp = os.path.join(csv_parent_dir, m, 'last_24h_metrics.csv')
-        if os.path.isfile(fp):
-            try:
-                df = pd.read_csv(fp, parse_dates=['timestamp'])
-                if 'capacity' in df.columns and 'timestamp' in df.columns and not df.empty:
-                    valid_data = df.dropna(subset=['timestamp', 'capacity'])
-                    if not valid_data.empty:
-                        t = valid_data['timestamp']
-                        capacity_vals = valid_data['capacity']
-                        if not all_t:
-                            base_time = t.min()
-                        else:
-                            base_time = min(min(all_t), t.min())
-                        pts = [((ts - base_time).total_seconds() / 3600.0, float(v)) 
-                               for ts, v in zip(t, capacity_vals)]
-                        series.append((m, pts))
-                        all_t.extend(t)
-                        mx = max(mx, capacity_vals.max())
-            except Exception as e:
-                logger.error(f"Error processing trend data for machine {m}: {e}")
+    # Trend series share one time origin so the axis labels line up
+    series = [(m, d) for m, d in dataset.machine_data.items() if d.trend_times]
+    all_t = [ts for _, d in series for ts in d.trend_times]
+    mx = max((max(d.trend_values) for _, d in series), default=0)
+    if all_t:
+        base_time = min(all_t)
+        series = [
+            (m, [((ts - base_time).total_seconds() / 3600.0, v)
+                 for ts, v in zip(d.trend_times, d.trend_values)])
+            for m, d in series
+        ]
     
     # Draw the trend graph
     tp=10; bw, bh=w_right-2*tp, h2-2*tp
@@ -275,9 +751,14 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
     if series:
         dln=Drawing(tw,th); lp=LinePlot()
         lp.x=lp.y=0; lp.width=tw; lp.height=th; 
-        lp.data=[pts for _,pts in series]
+        # LinePlot cannot show more than about one point per unit of width
+        plot_points = max(2, int(tw))
+        lp.data=[
+            list(zip(*downsample_series([x for x, _ in pts], [y for _, y in pts], plot_points)))
+            for _, pts in series
+        ]
         
-        cols=[colors.blue,colors.red,colors.green,colors.orange,colors.purple]
+        cols=resources.trend_colors
         for i in range(len(series)): 
             if i < len(cols):
                 lp.lines[i].strokeColor=cols[i]; 
@@ -305,7 +786,7 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
                 c.setStrokeColor(cols[idx]); c.setLineWidth(2)
                 yL=ly-idx*15; c.line(lx,yL,lx+10,yL)
                 c.setFont('Helvetica',8); c.setFillColor(colors.black)
-                c.drawString(lx+15,yL-3,f'Machine {m}')
+                c.drawString(lx+15,yL-3,dataset.label(m))
     else:
         c.setFont('Helvetica',12); c.setFillColor(colors.gray)
         c.drawCentredString(x0+w_left+w_right/2, y_sec2+h2/2, 'No Data Available')
@@ -313,17 +794,10 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
     # Section 4: Counts
     y_sec4 = y_sec2 - h4 - spacing_gap
     c.rect(x0, y_sec4, total_w, h4)
-    c.setFillColor(colors.HexColor('#1f77b4')); c.rect(x0, y_sec4, total_w, h4, fill=1, stroke=0)
-    
-    total_objs=total_rem=0
-    for m in machines:
-        fp=os.path.join(csv_parent_dir,m,'last_24h_metrics.csv')
-        if os.path.isfile(fp):
-            df=pd.read_csv(fp)
-            total_objs+=df['objects_per_min'].sum() if 'objects_per_min' in df else 0
-            for i in range(1,13):
-                col=next((c for c in df.columns if c.lower()==f'counter_{i}'),None)
-                if col: total_rem+=df[col].sum()
+    c.setFillColor(resources.summary_blue); c.rect(x0, y_sec4, total_w, h4, fill=1, stroke=0)
+    
+    total_objs=dataset.total_objects
+    total_rem=dataset.total_removed
     
     c.setFillColor(colors.white); c.setFont('Helvetica-Bold',10)
     c.drawString(x0+10,y_sec4+h4-14,'Counts:')
@@ -344,29 +818,9 @@ def draw_global_summary(c, csv_parent_dir, x0, y0, total_w, available_height):
     # Return the Y position where the next content should start
     return y_sec4 - spacing_gap
 
-def calculate_global_max_firing_average(csv_parent_dir):
+def calculate_global_max_firing_average(dataset):
     """Calculate the global maximum firing average across all machines"""
-    machines = sorted([d for d in os.listdir(csv_parent_dir)
-                       if os.path.isdir(os.path.join(csv_parent_dir, d)) and d.isdigit()])
-    
-    global_max = 0
-    
-    for machine in machines:
-        fp = os.path.join(csv_parent_dir, machine, 'last_24h_metrics.csv')
-        if os.path.isfile(fp):
-            try:
-                df = pd.read_csv(fp)
-                # Find counter averages for this machine
-                for i in range(1, 13):
-                    col_name = next((c for c in df.columns if c.lower() == f'counter_{i}'), None)
-                    if col_name and col_name in df.columns:
-                        avg_val = df[col_name].mean()
-                        if not pd.isna(avg_val):
-                            global_max = max(global_max, avg_val)
-            except Exception as e:
-                logger.error(f"Error calculating max for machine {machine}: {e}")
-    
-    return global_max
+    return _as_dataset(dataset).global_max_firing
 
 def generate_report_filename(script_dir):
     """Generate date-stamped filename for the report"""
@@ -407,29 +861,163 @@ def fetch_last_24h_metrics(export_dir: str = METRIC_EXPORT_DIR):
 
 
 def build_report(metrics: dict, pdf_path: str, *, use_optimized: bool = False,
-                 export_dir: str = METRIC_EXPORT_DIR) -> None:
+                 export_dir: str = METRIC_EXPORT_DIR, parallel: bool = False,
+                 max_workers: Optional[int] = None,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 dataset: Optional[ReportDataset] = None,
+                 manifest: Optional[dict] = None) -> None:
     """Generate a PDF report and write it to ``pdf_path``.
 
     The ``metrics`` argument is currently unused but is accepted for
-    compatibility with :func:`fetch_last_24h_metrics`.
+    compatibility with :func:`fetch_last_24h_metrics`.  Set ``parallel`` to
+    render machine pages in a process pool (see :func:`draw_layout_parallel`).
+    ``progress`` is called as ``progress(done, total)`` while machines are
+    rendered; an exception raised from it aborts the report.  ``pdf_path``
+    may also be a writable binary buffer such as :class:`io.BytesIO`.  Pass a
+    prepared ``dataset`` (e.g. from :class:`ReportAggregator`) to skip reading
+    the CSV exports.  Machines are taken from ``manifest`` or, by default,
+    the saved floor/machine layout (see :func:`load_report_manifest`).
     """
 
-    if use_optimized:
-        draw_layout_optimized(pdf_path, export_dir)
+    if dataset is None:
+        dataset = ReportDataset(export_dir, resolve_report_manifest(export_dir, manifest))
+    source = dataset
+    if parallel:
+        draw_layout_parallel(pdf_path, source, use_optimized=use_optimized,
+                             max_workers=max_workers, progress=progress)
+    elif use_optimized:
+        draw_layout_optimized(pdf_path, source, progress=progress)
     else:
-        draw_layout_standard(pdf_path, export_dir)
+        draw_layout_standard(pdf_path, source, progress=progress)
+
+def _form_name(prefix, *key):
+    """Return a PDF-safe form name unique to ``key``."""
+    digest = hashlib.md5(repr(key).encode()).hexdigest()[:12]
+    return f"{prefix}{digest}"
+
+
+@functools.lru_cache(maxsize=None)
+def _pie_label_geometry(psz, angles=(45, -52), line_len=15):
+    """Return leader line end points and text side for each pie label.
+
+    Coordinates are relative to the pie centre.  The result only depends on
+    the pie size, so the trigonometry runs once per report layout.
+    """
+    geometry = []
+    for angle in angles:
+        angle_rad = math.radians(angle)
+        radius = psz/2 * 0.9
+        cx = math.cos(angle_rad) * radius
+        cy = math.sin(angle_rad) * radius
+        ex = cx + math.cos(angle_rad) * line_len  # Shorter line
+        ey = cy + math.sin(angle_rad) * line_len
+        geometry.append((cx, cy, ex, ey, math.cos(angle_rad) >= 0))
+    return tuple(geometry)
+
 
-def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, available_height, global_max_firing=None):
+def _machine_frame_form(c, total_w, pie_height, counts_height, spacing):
+    """Return the form holding a machine section's borders and static labels.
+
+    The form origin is the section's top-left corner.
+    """
+    name = _form_name('EnpresorMachineFrame', total_w, pie_height, counts_height, spacing)
+    if c.hasForm(name):
+        return name
+    resources = get_report_resources()
+    w_left = total_w * 0.4
+    w_right = total_w * 0.6
+    y_counts = -pie_height - counts_height - spacing
+    half_counts = total_w / 2
+
+    c.beginForm(name, lowerx=0, lowery=y_counts, upperx=total_w, uppery=0)
+    c.setStrokeColor(colors.black)
+    c.rect(0, -pie_height, w_left, pie_height)
+    c.rect(w_left, -pie_height, w_right, pie_height)
+
+    c.setFillColor(resources.summary_blue)
+    c.rect(0, y_counts, total_w, counts_height, fill=1, stroke=0)
+    c.setFillColor(colors.white)
+    c.setFont('Helvetica-Bold', 8)
+    for row, labs in ((0.7, ['Objects Processed:', 'Impurities Removed:']),
+                      (0.3, ['Accepts:', 'Rejects:'])):
+        for i, lab in enumerate(labs):
+            center_x = half_counts * i + half_counts/2
+            lw = c.stringWidth(lab, 'Helvetica-Bold', 8)
+            c.drawString(center_x - lw/2, y_counts + counts_height * row, lab)
+    c.setStrokeColor(colors.black)
+    c.rect(0, y_counts, total_w, counts_height)
+    c.endForm()
+    return name
+
+
+def _bar_axes_form(c, chart_w, chart_h, counter_names, max_avg):
+    """Return the form with the bar chart axes, ticks and counter labels.
+
+    The form origin is the chart's lower-left corner.
+    """
+    # Key on the tick labels actually drawn so every scale gets its own ticks
+    ticks = tuple(f"{(max_avg * i / 3) if max_avg > 0 else 0:.0f}" for i in range(4))
+    name = _form_name('EnpresorBarAxes', chart_w, chart_h, counter_names, ticks)
+    if c.hasForm(name):
+        return name
+    bar_spacing = chart_w / len(counter_names)
+
+    c.beginForm(name, lowerx=-60, lowery=-10, upperx=chart_w, uppery=chart_h)
+    c.setFont('Helvetica', 8)  # Increased X-axis label size from 6 to 8
+    c.setFillColor(colors.black)
+    for i, counter_name in enumerate(counter_names):
+        c.drawCentredString(i * bar_spacing + bar_spacing/2, -8, counter_name)
+
+    # Draw axes with LARGER fonts
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.line(-5, 0, -5, chart_h)
+    c.line(-5, 0, chart_w, 0)
+
+    # Y-axis tick marks and values with LARGER font
+    c.setFont('Helvetica', 7)  # Increased Y-axis label size from 5 to 7
+    for i, tick in enumerate(ticks):  # Reduced tick marks
+        y_pos = chart_h * i / 3
+        c.line(-5, y_pos, -2, y_pos)
+        c.drawRightString(-6, y_pos - 1, tick)
+    c.endForm()
+    return name
+
+
+def _pie_labels_form(c, psz):
+    """Return the form with the pie leader lines and slice names.
+
+    The form origin is the pie centre.
+    """
+    name = _form_name('EnpresorPieLabels', psz)
+    if c.hasForm(name):
+        return name
+    half = psz/2 + 60
+    c.beginForm(name, lowerx=-half, lowery=-half, upperx=half, uppery=half)
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1)
+    c.setFont('Helvetica-Bold', 7)  # Smaller font
+    c.setFillColor(colors.black)
+    for label_text, (cx, cy, ex, ey, right) in zip(['Accepts', 'Rejects'],
+                                                   _pie_label_geometry(psz)):
+        c.line(cx, cy, ex, ey)
+        if right:
+            c.drawString(ex + 2, ey + 1, label_text)
+        else:
+            label_width = c.stringWidth(label_text, 'Helvetica-Bold', 7)
+            c.drawString(ex - 2 - label_width, ey + 1, label_text)
+    c.endForm()
+    return name
+
+
+def draw_machine_sections(c, dataset, machine, x0, y_start, total_w, available_height, global_max_firing=None):
     """Draw the three sections for a single machine - OPTIMIZED FOR 2 MACHINES PER PAGE"""
-    fp = os.path.join(csv_parent_dir, machine, 'last_24h_metrics.csv')
-    if not os.path.isfile(fp):
+    dataset = _as_dataset(dataset)
+    data = dataset.get(machine)
+    if data is None:
         return y_start  # Return same position if no data
-    
-    try:
-        df = pd.read_csv(fp)
-    except Exception as e:
-        logger.error(f"Error reading data for machine {machine}: {e}")
-        return y_start
+    label = dataset.label(machine)
+    resources = get_report_resources()
     
     # OPTIMIZED DIMENSIONS FOR 2 MACHINES PER PAGE
     w_left = total_w * 0.4
@@ -443,19 +1031,19 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
     
     current_y = y_start
     
+    # Section borders, the counts background and static labels are one form
+    c.saveState()
+    c.translate(x0, y_start)
+    c.doForm(_machine_frame_form(c, total_w, pie_height, counts_height, spacing))
+    c.restoreState()
+    
     # Section 1: Machine pie chart (left side)
     y_pie = current_y - pie_height
-    ac_col = next((c for c in df.columns if c.lower()=='accepts'), None)
-    rj_col = next((c for c in df.columns if c.lower()=='rejects'), None)
-    a_val = df[ac_col].sum() if ac_col else 0
-    r_val = df[rj_col].sum() if rj_col else 0
-    
-    # Draw pie chart section border
-    c.setStrokeColor(colors.black)
-    c.rect(x0, y_pie, w_left, pie_height)
+    a_val = data.accepts
+    r_val = data.rejects
     
     # Pie chart title
-    title_pie = f"Machine {machine}"
+    title_pie = label
     c.setFont('Helvetica-Bold', 10)  # Smaller font
     c.setFillColor(colors.black)
     c.drawCentredString(x0 + w_left/2, y_pie + pie_height - 12, title_pie)
@@ -486,62 +1074,39 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
         renderPDF.draw(d_pie, c, -psz/2, -psz/2)
         c.restoreState()
         
-        # Add labels with smaller fonts
+        # Leader lines and slice names come from a cached form; only the
+        # percentages are drawn per machine
         total_pie = a_val + r_val
         if total_pie > 0:
-            percentages = [(a_val/total_pie)*100, (r_val/total_pie)*100]
-            angles = [45, -52]
-            labels = ['Accepts', 'Rejects']
+            center_x, center_y = px + psz/2, py + psz/2
+            c.saveState()
+            c.translate(center_x, center_y)
+            c.doForm(_pie_labels_form(c, psz))
+            c.restoreState()
             
-            for i, (label, pct, angle) in enumerate(zip(labels, percentages, angles)):
-                angle_rad = math.radians(angle)
-                radius = psz/2 * 0.9
-                cx = px + psz/2 + math.cos(angle_rad) * radius
-                cy = py + psz/2 + math.sin(angle_rad) * radius
-                ex = cx + math.cos(angle_rad) * 15  # Shorter line
-                ey = cy + math.sin(angle_rad) * 15
-                
-                c.setStrokeColor(colors.black)
-                c.setLineWidth(1)
-                c.line(cx, cy, ex, ey)
-                
-                c.setFont('Helvetica-Bold', 7)  # Smaller font
-                c.setFillColor(colors.black)
-                label_text = f"{label}"
+            percentages = [(a_val/total_pie)*100, (r_val/total_pie)*100]
+            c.setFont('Helvetica', 6)
+            c.setFillColor(colors.black)
+            for pct, (_, _, ex, ey, right) in zip(percentages, _pie_label_geometry(psz)):
                 pct_text = f"{pct:.1f}%"
-                
-                if math.cos(angle_rad) >= 0:
-                    c.drawString(ex + 2, ey + 1, label_text)
-                    c.setFont('Helvetica', 6)
-                    c.drawString(ex + 2, ey - 6, pct_text)
+                if right:
+                    c.drawString(center_x + ex + 2, center_y + ey - 6, pct_text)
                 else:
-                    label_width = c.stringWidth(label_text, 'Helvetica-Bold', 7)
                     pct_width = c.stringWidth(pct_text, 'Helvetica', 6)
-                    c.drawString(ex - 2 - label_width, ey + 1, label_text)
-                    c.setFont('Helvetica', 6)
-                    c.drawString(ex - 2 - pct_width, ey - 6, pct_text)
+                    c.drawString(center_x + ex - 2 - pct_width, center_y + ey - 6, pct_text)
     else:
         c.setFont('Helvetica', 8)
         c.setFillColor(colors.gray)
         c.drawCentredString(x0 + w_left/2, y_pie + pie_height/2, 'No Data Available')
     
     # Section 2: Bar chart (right side) - IMPROVED VERSION
-    c.setStrokeColor(colors.black)
-    c.rect(x0 + w_left, y_pie, w_right, bar_height)
-    
-    title_bar = f"Machine {machine} - Sensitivity Firing Averages"
+    title_bar = f"{label} - Sensitivity Firing Averages"
     c.setFont('Helvetica-Bold', 12)  # Increased from 9 to 12
     c.setFillColor(colors.black)
     c.drawCentredString(x0 + w_left + w_right/2, y_pie + bar_height - 10, title_bar)
     
     # Draw bar chart with counter averages
-    count_averages = []
-    for i in range(1, 13):
-        col_name = next((c for c in df.columns if c.lower() == f'counter_{i}'), None)
-        if col_name and col_name in df.columns:
-            avg_val = df[col_name].mean()
-            if not pd.isna(avg_val):
-                count_averages.append((f"S{i}", avg_val))
+    count_averages = data.counter_averages
     
     if count_averages:
         # UPDATED: Reduced width by 5%, increased height by 5%
@@ -561,43 +1126,30 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
         # Use global max if provided, otherwise use local max
         max_avg = global_max_firing if global_max_firing and global_max_firing > 0 else max(avg for _, avg in count_averages)
         
-        bar_colors = [colors.red, colors.blue, colors.green, colors.orange, 
-                    colors.purple, colors.brown, colors.pink, colors.gray,
-                    colors.cyan, colors.magenta, colors.yellow, colors.black]
+        bar_colors = resources.bar_colors
         
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(1)
         for i, (counter_name, avg_val) in enumerate(count_averages):
             bar_x = chart_x + i * bar_spacing + (bar_spacing - bar_width)/2
             bar_height_val = (avg_val / max_avg) * chart_h if max_avg > 0 else 0
             bar_y = chart_y
             
             c.setFillColor(bar_colors[i % len(bar_colors)])
-            c.setStrokeColor(colors.black)
             c.rect(bar_x, bar_y, bar_width, bar_height_val, fill=1, stroke=1)
             
-            c.setFont('Helvetica', 8)  # Increased X-axis label size from 6 to 8
-            c.setFillColor(colors.black)
-            label_x = bar_x + bar_width/2
-            c.drawCentredString(label_x, bar_y - 8, counter_name)
-            
             c.setFont('Helvetica', 5)  # Smaller font
-            c.drawCentredString(label_x, bar_y + bar_height_val + 2, f"{avg_val:.1f}")
-        
-        # Draw axes with LARGER fonts
-        c.setStrokeColor(colors.black)
-        c.setLineWidth(1)
-        c.line(chart_x - 5, chart_y, chart_x - 5, chart_y + chart_h)
-        c.line(chart_x - 5, chart_y, chart_x + chart_w, chart_y)
-        
-        # Y-axis tick marks and values with LARGER font
-        c.setFont('Helvetica', 7)  # Increased Y-axis label size from 5 to 7
-        c.setFillColor(colors.black)
-        for i in range(4):  # Reduced tick marks
-            y_val = (max_avg * i / 3) if max_avg > 0 else 0
-            y_pos = chart_y + (chart_h * i / 3)
-            c.line(chart_x - 5, y_pos, chart_x - 2, y_pos)
-            c.drawRightString(chart_x - 6, y_pos - 1, f"{y_val:.0f}")
+            c.setFillColor(colors.black)
+            c.drawCentredString(bar_x + bar_width/2, bar_y + bar_height_val + 2, f"{avg_val:.1f}")
         
+        # Axes, ticks and counter labels are shared by machines with the
+        # same counters and scale
         # NOTE: Y-axis title/label has been removed as requested
+        c.saveState()
+        c.translate(chart_x, chart_y)
+        c.doForm(_bar_axes_form(c, chart_w, chart_h,
+                                tuple(name for name, _ in count_averages), max_avg))
+        c.restoreState()
     else:
         c.setFont('Helvetica', 8)
         c.setFillColor(colors.gray)
@@ -607,39 +1159,23 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
     y_counts = y_pie - counts_height - spacing
     
     # Calculate machine totals
-    machine_objs = df['objects_per_min'].sum() if 'objects_per_min' in df.columns else 0
-    machine_rem = 0
-    for i in range(1, 13):
-        col = next((c for c in df.columns if c.lower() == f'counter_{i}'), None)
-        if col:
-            machine_rem += df[col].sum()
-    
-    machine_accepts = df[ac_col].sum() if ac_col else 0
-    machine_rejects = df[rj_col].sum() if rj_col else 0
+    machine_objs = data.objects_total
+    machine_rem = data.removed_total
     
-    # Draw SMALLER blue counts section
-    c.setFillColor(colors.HexColor('#1f77b4'))
-    c.rect(x0, y_counts, total_w, counts_height, fill=1, stroke=0)
+    machine_accepts = data.accepts
+    machine_rejects = data.rejects
     
-    # Draw section title
+    # Blue background and labels come from the frame form; draw the values
     c.setFillColor(colors.white)
     c.setFont('Helvetica-Bold', 8)  # Smaller font
-    c.drawString(x0 + 8, y_counts + counts_height - 10, f'Machine {machine} Counts:')
+    c.drawString(x0 + 8, y_counts + counts_height - 10, f'{label} Counts:')
     
     # Two columns layout with smaller fonts
     half_counts = total_w / 2
     
     # TOP ROW: Objects and Impurities
-    labs_top = [f'Objects Processed:', f'Impurities Removed:']  # Shortened labels
     vals_top = [f"{int(machine_objs):,}", f"{int(machine_rem):,}"]
     
-    # Center the labels over their data
-    c.setFont('Helvetica-Bold', 8)  # Keep label font size the same
-    for i, lab in enumerate(labs_top):
-        center_x = x0 + half_counts * i + half_counts/2
-        lw = c.stringWidth(lab, 'Helvetica-Bold', 8)
-        c.drawString(center_x - lw/2, y_counts + counts_height * 0.7, lab)
-    
     # Increase data text size and center over labels
     c.setFont('Helvetica-Bold', 14)  # Increased from 10 to 14
     for i, val in enumerate(vals_top):
@@ -648,16 +1184,8 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
         c.drawString(center_x - vw/2, y_counts + counts_height * 0.7 - 14, val)
     
     # BOTTOM ROW: Accepts and Rejects
-    labs_bottom = ['Accepts:', 'Rejects:']  # Shortened labels
     vals_bottom = [f"{int(machine_accepts):,} lbs", f"{int(machine_rejects):,} lbs"]
     
-    # Center the labels over their data
-    c.setFont('Helvetica-Bold', 8)  # Keep label font size the same
-    for i, lab in enumerate(labs_bottom):
-        center_x = x0 + half_counts * i + half_counts/2
-        lw = c.stringWidth(lab, 'Helvetica-Bold', 8)
-        c.drawString(center_x - lw/2, y_counts + counts_height * 0.3, lab)
-    
     # Increase data text size and center over labels
     c.setFont('Helvetica-Bold', 14)  # Increased from 10 to 14
     for i, val in enumerate(vals_bottom):
@@ -667,147 +1195,243 @@ def draw_machine_sections(c, csv_parent_dir, machine, x0, y_start, total_w, avai
     
     c.setFillColor(colors.black)
     c.setStrokeColor(colors.black)
-    c.rect(x0, y_counts, total_w, counts_height)
     
     # Return the Y position where the next content should start
     return y_counts - spacing
 
 
-def draw_layout_optimized(pdf_path, csv_parent_dir):
-    """Optimized version - CONSISTENT SIZING, 2 machines per page"""
-    logger.debug("=== DEBUGGING MACHINE DATA ===")
-    logger.debug("==============================")
-    
-    # Calculate global maximum firing average first
-    logger.debug("Calculating global maximum firing average...")
-    global_max_firing = calculate_global_max_firing_average(csv_parent_dir)
-    logger.debug(f"Global maximum firing average: {global_max_firing:.2f}")
-    
-    c = canvas.Canvas(pdf_path, pagesize=letter)
+def machine_section_extent(dataset, machine, available_height=MACHINE_SECTION_HEIGHT):
+    """Return the vertical space :func:`draw_machine_sections` uses for ``machine``."""
+    if dataset.get(machine) is None:
+        return 0
+    # Pie/bar row (75%) plus counts row (30%) plus two 1pt spacers
+    return available_height * 1.05 + 2
+
+
+def paginate_machines(dataset, use_optimized=False):
+    """Return the machines drawn on each page that follows the summary page.
+
+    The optimized layout places a fixed number of machines per page while the
+    standard layout breaks pages dynamically based on the remaining height.
+    """
+    machines = dataset.machines
+    if use_optimized:
+        n = OPTIMIZED_MACHINES_PER_PAGE
+        return [machines[i:i + n] for i in range(0, len(machines), n)]
+
+    content_start_y = letter[1] - HEADER_HEIGHT
+    pages = []
+    next_y = None
+    for machine in machines:
+        # Check if we need a new page or if this is the first machine
+        if next_y is None or (next_y - PAGE_MARGIN) < MACHINE_SECTION_HEIGHT:
+            pages.append([])
+            next_y = content_start_y
+        pages[-1].append(machine)
+        next_y -= machine_section_extent(dataset, machine) + MACHINE_SPACING
+    return pages
+
+
+def _draw_summary_page(c, dataset):
+    """Draw page 1: the header and global summary."""
     width, height = letter
-    
-    margin = 40
-    x0 = margin
-    total_w = width - 2 * margin
-    
-    machines = sorted([d for d in os.listdir(csv_parent_dir)
-                       if os.path.isdir(os.path.join(csv_parent_dir, d)) and d.isdigit()])
-    
-    logger.debug(f"Processing {len(machines)} machines: {machines}")
-    
-    # PAGE 1: Global summary ONLY
-    page_number = 1
     logger.debug("Creating Page 1: Global Summary Only")
-    content_start_y = draw_header(c, width, height, page_number)
-    available_height = content_start_y - margin - 50
-    
-    # Draw global summary (takes full page)
-    draw_global_summary(c, csv_parent_dir, x0, margin, total_w, available_height)
-    
-    # Process machines in groups of 2 (HARD LIMIT)
-    machines_per_page = 2
-    machine_batches = [machines[i:i + machines_per_page] 
-                      for i in range(0, len(machines), machines_per_page)]
-    
-    for batch_idx, machine_batch in enumerate(machine_batches):
-        # Start new page for machines (page 2, 3, 4, etc.)
-        c.showPage()
-        page_number += 1
+    content_start_y = draw_header(c, width, height, 1)
+    available_height = content_start_y - PAGE_MARGIN - 50
+    draw_global_summary(c, dataset, PAGE_MARGIN, PAGE_MARGIN,
+                        width - 2 * PAGE_MARGIN, available_height)
+
+
+def _draw_machine_pages(c, dataset, pages, first_page_number, new_page_first=True,
+                        on_machine=None):
+    """Draw ``pages`` of machines onto ``c`` numbering from ``first_page_number``.
+
+    ``on_machine`` is called with each machine id once its sections are drawn.
+    """
+    width, height = letter
+    total_w = width - 2 * PAGE_MARGIN
+    for offset, machine_batch in enumerate(pages):
+        if offset or new_page_first:
+            c.showPage()
+        page_number = first_page_number + offset
         logger.debug(f"Creating Page {page_number}: Machines {machine_batch}")
-        
-        # Draw header with page number
-        content_start_y = draw_header(c, width, height, page_number)
-        available_height = content_start_y - margin - 50
-        
-        # INCREASED height per machine to accommodate larger sections
-        fixed_height_per_machine = 260  # INCREASED from 220 to 260
-        
-        current_y = content_start_y
-        
-        for machine_idx, machine in enumerate(machine_batch):
-            logger.debug(
-                f"  Drawing Machine {machine} ({machine_idx + 1}/{len(machine_batch)}) - FIXED SIZE"
-            )
-            current_y = draw_machine_sections(c, csv_parent_dir, machine, x0, 
-                                            current_y, total_w, fixed_height_per_machine, global_max_firing)
+
+        next_y = draw_header(c, width, height, page_number)
+        for machine in machine_batch:
+            next_y = draw_machine_sections(c, dataset, machine, PAGE_MARGIN, next_y,
+                                           total_w, MACHINE_SECTION_HEIGHT,
+                                           dataset.global_max_firing)
             # FIXED spacing between machines
-            current_y -= 20
-    
+            next_y -= MACHINE_SPACING
+            if on_machine is not None:
+                on_machine(machine)
+
+
+def _progress_counter(total, progress):
+    """Return an ``on_machine`` hook forwarding running counts to ``progress``."""
+    if progress is None:
+        return None
+    done = [0]
+
+    def on_machine(_machine):
+        done[0] += 1
+        progress(done[0], total)
+
+    return on_machine
+
+
+def _draw_layout(pdf_path, dataset, use_optimized, progress=None):
+    """Render the whole report serially on one canvas and return the page count."""
+    pages = paginate_machines(dataset, use_optimized)
+    total = len(dataset.machines)
+    if progress is not None:
+        progress(0, total)
+    c = canvas.Canvas(pdf_path, pagesize=letter)
+    _draw_summary_page(c, dataset)
+    _draw_machine_pages(c, dataset, pages, 2,
+                        on_machine=_progress_counter(total, progress))
     c.save()
-    logger.info(f"Optimized multi-page layout saved at: {os.path.abspath(pdf_path)}")
-    logger.info(f"Total pages created: {page_number}")
+    return 1 + len(pages)
+
+
+def _describe_target(pdf_path):
+    """Return a printable name for a report path or in-memory buffer."""
+    if hasattr(pdf_path, 'write'):
+        return '<in-memory buffer>'
+    return os.path.abspath(pdf_path)
+
+
+def _load_dataset(csv_parent_dir):
+    """Load the report dataset and log the machines it covers.
+
+    ``csv_parent_dir`` may also be a prepared :class:`ReportDataset`.
+    """
+    # Load every machine once and derive the global maximum firing average
+    dataset = _as_dataset(csv_parent_dir)
+    logger.debug(f"Processing {len(dataset.machines)} machines: {dataset.machines}")
+    logger.debug(f"Global maximum firing average: {dataset.global_max_firing:.2f}")
+    return dataset
+
+
+def draw_layout_optimized(pdf_path, csv_parent_dir, progress=None):
+    """Optimized version - CONSISTENT SIZING, 2 machines per page
+
+    Returns the number of pages written.
+    """
+    dataset = _load_dataset(csv_parent_dir)
+    page_count = _draw_layout(pdf_path, dataset, use_optimized=True, progress=progress)
+
+    logger.info(f"Optimized multi-page layout saved at: {_describe_target(pdf_path)}")
+    logger.info(f"Total pages created: {page_count}")
     logger.info("Page 1: Global Summary")
     logger.info(
-        f"Pages 2+: Individual machines (CONSISTENT sizing, max {machines_per_page} per page)"
+        f"Pages 2+: Individual machines (CONSISTENT sizing, max {OPTIMIZED_MACHINES_PER_PAGE} per page)"
     )
+    return page_count
 
 
-def draw_layout_standard(pdf_path, csv_parent_dir):
-    """Standard layout - CONSISTENT SIZING with dynamic page breaks"""
-    logger.debug("=== DEBUGGING MACHINE DATA ===")
-    logger.debug("==============================")
-    
-    # Calculate global maximum firing average first
-    logger.debug("Calculating global maximum firing average...")
-    global_max_firing = calculate_global_max_firing_average(csv_parent_dir)
-    logger.debug(f"Global maximum firing average: {global_max_firing:.2f}")
-    
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-    width, height = letter
-    
-    margin = 40
-    x0 = margin
-    total_w = width - 2 * margin
-    fixed_machine_height = 260  # INCREASED from 220 to 260 for larger sections
-    
-    machines = sorted([d for d in os.listdir(csv_parent_dir)
-                       if os.path.isdir(os.path.join(csv_parent_dir, d)) and d.isdigit()])
-    
-    logger.debug(f"Processing {len(machines)} machines: {machines}")
-    
-    # PAGE 1: Global summary ONLY
-    page_number = 1
-    logger.debug("Creating Page 1: Global Summary Only")
-    content_start_y = draw_header(c, width, height, page_number)
-    available_height = content_start_y - margin - 50
-    
-    # Draw global summary (takes full page)
-    draw_global_summary(c, csv_parent_dir, x0, margin, total_w, available_height)
-    
-    # Process machines starting on page 2
-    machines_processed = 0
-    next_y = None  # Will be set when we start page 2
-    
-    for machine in machines:
-        logger.debug(f"Processing Machine {machine}")
-        
-        # Check if we need a new page or if this is the first machine
-        if next_y is None or (next_y - margin) < fixed_machine_height:
-            # Start new page
-            logger.debug(f"Starting new page for Machine {machine}")
-            c.showPage()
-            page_number += 1
-            logger.debug(f"Creating Page {page_number}: Machine {machine}")
-            
-            # Draw header on new page with page number
-            content_start_y = draw_header(c, width, height, page_number)
-            next_y = content_start_y
-        
-        # Draw machine sections with FIXED height and global max
-        logger.debug(f"  Drawing Machine {machine} - FIXED SIZE ({fixed_machine_height}px)")
-        next_y = draw_machine_sections(c, csv_parent_dir, machine, x0, next_y, 
-                                     total_w, fixed_machine_height, global_max_firing)
-        
-        machines_processed += 1
-        
-        # FIXED spacing between machines
-        next_y -= 20
-    
-    c.save()
-    logger.info(f"Standard multi-page layout saved at: {os.path.abspath(pdf_path)}")
-    logger.info(f"Total pages created: {page_number}")
+def draw_layout_standard(pdf_path, csv_parent_dir, progress=None):
+    """Standard layout - CONSISTENT SIZING with dynamic page breaks
+
+    Returns the number of pages written.
+    """
+    dataset = _load_dataset(csv_parent_dir)
+    page_count = _draw_layout(pdf_path, dataset, use_optimized=False, progress=progress)
+
+    logger.info(f"Standard multi-page layout saved at: {_describe_target(pdf_path)}")
+    logger.info(f"Total pages created: {page_count}")
     logger.info("Page 1: Global Summary")
     logger.info("Pages 2+: Individual machines (CONSISTENT sizing)")
+    return page_count
+
+
+def _render_summary_part(pdf_path, dataset):
+    """Process-pool worker rendering the summary page into ``pdf_path``."""
+    c = canvas.Canvas(pdf_path, pagesize=letter)
+    _draw_summary_page(c, dataset)
+    c.save()
+    return pdf_path
+
+
+def _render_machine_part(pdf_path, dataset, pages, first_page_number):
+    """Process-pool worker rendering a contiguous group of machine pages."""
+    c = canvas.Canvas(pdf_path, pagesize=letter)
+    _draw_machine_pages(c, dataset, pages, first_page_number, new_page_first=False)
+    c.save()
+    return pdf_path
+
+
+def draw_layout_parallel(pdf_path, csv_parent_dir, use_optimized=False, max_workers=None,
+                         progress=None):
+    """Render machine pages in a process pool and merge them after the summary.
+
+    Pages are planned up front with :func:`paginate_machines`, split into
+    contiguous groups (one per worker) and rendered to temporary PDFs which
+    are then concatenated in page order.  Small reports, or environments
+    without ``pypdf``, fall back to the serial renderer.  ``progress`` is
+    reported as each group of machines finishes.
+    """
+    dataset = _load_dataset(csv_parent_dir)
+    pages = paginate_machines(dataset, use_optimized)
+    workers = max_workers or os.cpu_count() or 1
+
+    if PdfWriter is None or workers < 2 or len(pages) < PARALLEL_MIN_PAGES:
+        if PdfWriter is None:
+            logger.warning("pypdf is not installed; rendering report serially")
+        page_count = _draw_layout(pdf_path, dataset, use_optimized, progress)
+        logger.info(f"Report saved at: {_describe_target(pdf_path)} ({page_count} pages)")
+        return page_count
+
+    group_size = math.ceil(len(pages) / workers)
+    groups = [pages[i:i + group_size] for i in range(0, len(pages), group_size)]
+
+    total = len(dataset.machines)
+    if progress is not None:
+        progress(0, total)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups) + 1)) as pool:
+            futures = [pool.submit(_render_summary_part,
+                                   os.path.join(tmp_dir, 'summary.pdf'), dataset)]
+            group_sizes = {}
+            first_page_number = 2
+            for idx, group in enumerate(groups):
+                machines = [m for page in group for m in page]
+                future = pool.submit(
+                    _render_machine_part,
+                    os.path.join(tmp_dir, f'machines_{idx}.pdf'),
+                    dataset.subset(machines),
+                    group,
+                    first_page_number,
+                )
+                futures.append(future)
+                group_sizes[future] = len(machines)
+                first_page_number += len(group)
+            try:
+                done = 0
+                for future in as_completed(futures):
+                    future.result()
+                    if future in group_sizes and progress is not None:
+                        done += group_sizes[future]
+                        progress(done, total)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            parts = [f.result() for f in futures]
+
+        writer = PdfWriter()
+        for part in parts:
+            writer.append(part)
+        if hasattr(pdf_path, 'write'):
+            writer.write(pdf_path)
+        else:
+            with open(pdf_path, 'wb') as fh:
+                writer.write(fh)
+
+    logger.info(f"Parallel report saved at: {_describe_target(pdf_path)}")
+    logger.info(f"Total pages created: {1 + len(pages)} across {len(groups)} workers")
+    return 1 + len(pages)
 
 
 if __name__=='__main__':
@@ -817,12 +1441,19 @@ if __name__=='__main__':
     # Generate date-stamped filename automatically
     pdf_path = generate_report_filename(sd)
     
-    # Check if user wants optimized layout
-    use_optimized = len(sys.argv) > 2 and sys.argv[2] == '--optimized'
+    # Check if user wants optimized layout and/or parallel rendering
+    use_optimized = '--optimized' in sys.argv[2:]
+    use_parallel = '--parallel' in sys.argv[2:]
     
-    if use_optimized:
+    # Machines come from the saved floor/machine layout when there is one
+    source = ReportDataset(exp_arg, resolve_report_manifest(exp_arg))
+    
+    if use_parallel:
+        logger.info("Using parallel rendering...")
+        draw_layout_parallel(pdf_path, source, use_optimized=use_optimized)
+    elif use_optimized:
         logger.info("Using optimized layout (2 machines per page)...")
-        draw_layout_optimized(pdf_path, exp_arg)
+        draw_layout_optimized(pdf_path, source)
     else:
         logger.info("Using standard layout (dynamic page breaks)...")
-        draw_layout_standard(pdf_path, exp_arg)
+        draw_layout_standard(pdf_path, source)
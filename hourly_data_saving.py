@@ -4,13 +4,16 @@ import os
 import csv
 from datetime import datetime, timedelta
 from typing import Optional, List
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None
 
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), "exports")
 METRICS_FILENAME = "last_24h_metrics.csv"
 CONTROL_LOG_FILENAME = "last_24h_control_log.csv"
 
-
-
 def initialize_data_saving(export_dir: str = EXPORT_DIR,
                            machine_ids: Optional[List[str]] = None):
     """Set up periodic CSV export directory and optional per-machine folders."""
@@ -21,9 +24,71 @@ def initialize_data_saving(export_dir: str = EXPORT_DIR,
     return {"export_dir": export_dir}
 
 
+def _minmax_bucket_indices(values: List[float], max_points: int) -> List[int]:
+    """Return sorted indices of ``values`` kept by min/max bucket downsampling.
+
+    The first and last samples are always kept.  The interior is split into
+    equally sized buckets and the minimum and maximum of each bucket are
+    retained so spikes and dips survive the reduction.
+    """
+    n = len(values)
+    buckets = max(1, (max_points - 2) // 2)
+    interior = n - 2
+    size = -(-interior // buckets)  # ceiling division
+
+    if np is not None:
+        arr = np.asarray(values[1:-1], dtype=float)
+        padded = np.full(buckets * size, np.nan)
+        padded[:interior] = arr
+        grid = padded.reshape(buckets, size)
+        valid = ~np.isnan(grid).all(axis=1)
+        offsets = np.arange(buckets)[valid] * size + 1
+        mins = np.nanargmin(grid[valid], axis=1) + offsets
+        maxs = np.nanargmax(grid[valid], axis=1) + offsets
+        keep = np.unique(np.concatenate(([0, n - 1], mins, maxs)))
+        return keep.tolist()
+
+    keep = {0, n - 1}
+    for start in range(1, n - 1, size):
+        stop = min(start + size, n - 1)
+        idx = range(start, stop)
+        keep.add(min(idx, key=values.__getitem__))
+        keep.add(max(idx, key=values.__getitem__))
+    return sorted(keep)
+
+
+def downsample_series(times: list, values: list, max_points: Optional[int]):
+    """Return ``(times, values)`` reduced to at most ``max_points`` samples.
+
+    Series that already fit within the budget, or a ``max_points`` of
+    ``None``, are returned unchanged.
+    """
+    if not max_points or len(values) <= max_points or max_points < 4:
+        return times, values
+
+    keep = _minmax_bucket_indices(values, max_points)
+    return [times[i] for i in keep], [values[i] for i in keep]
+
+
+def _downsample_history(history: dict, max_points: Optional[int]) -> dict:
+    """Apply :func:`downsample_series` to every series in ``history``."""
+    if not max_points:
+        return history
+    for series in history.values():
+        series["times"], series["values"] = downsample_series(
+            series["times"], series["values"], max_points
+        )
+    return history
+
+
 def get_historical_data(timeframe: str = "24h", export_dir: str = EXPORT_DIR,
-                        machine_id: Optional[str] = None):
-    """Return capacity and counter history filtered to the given timeframe."""
+                        machine_id: Optional[str] = None,
+                        max_points: Optional[int] = None):
+    """Return capacity and counter history filtered to the given timeframe.
+
+    When ``max_points`` is given each series is reduced with a min/max bucket
+    downsampler so the payload size is bounded regardless of ``timeframe``.
+    """
     history = load_recent_metrics(export_dir, machine_id=machine_id)
 
     # Parse the timeframe string like "24h" into an integer hour count
@@ -33,7 +98,7 @@ def get_historical_data(timeframe: str = "24h", export_dir: str = EXPORT_DIR,
         hours = 24
 
     if hours >= 24:
-        return history
+        return _downsample_history(history, max_points)
 
     cutoff = datetime.now() - timedelta(hours=hours)
     filtered = {
@@ -63,7 +128,7 @@ def get_historical_data(timeframe: str = "24h", export_dir: str = EXPORT_DIR,
                 filtered[i]["times"].append(t)
                 filtered[i]["values"].append(v)
 
-    return filtered
+    return _downsample_history(filtered, max_points)
 
 
 def append_metrics(metrics: dict, machine_id: str,
@@ -34,6 +34,12 @@ TRANSLATIONS = {
         'switch_dashboards': 'Switch Dashboards',
         'export_data': 'Export Data',
         'generate_report': 'Generate Report',
+        'cancel_report': 'Cancel',
+        'report_queued': 'Report queued...',
+        'report_progress': 'Report {progress}%',
+        'report_ready': 'Report ready',
+        'report_cancelled': 'Report cancelled',
+        'report_failed': 'Report failed',
         'dashboard_title': 'Satake Enpresor Data Monitor',
         'update_counts_title': 'Update Counts',
         'accepts': 'Accepts',
@@ -147,6 +153,12 @@ TRANSLATIONS = {
         'switch_dashboards': 'Cambiar tableros',
         'export_data': 'Exportar datos',
         'generate_report': 'Generar reporte',
+        'cancel_report': 'Cancelar',
+        'report_queued': 'Reporte en cola...',
+        'report_progress': 'Reporte {progress}%',
+        'report_ready': 'Reporte listo',
+        'report_cancelled': 'Reporte cancelado',
+        'report_failed': 'Error al generar el reporte',
         'dashboard_title': 'Monitor de datos Satake Enpresor',
         'update_counts_title': 'Actualizar conteos',
         'accepts': 'Aceptados',
@@ -260,6 +272,12 @@ TRANSLATIONS = {
         'switch_dashboards': 'ダッシュボードを切り替え',
         'export_data': 'データをエクスポート',
         'generate_report': 'レポート生成',
+        'cancel_report': 'キャンセル',
+        'report_queued': 'レポート待機中...',
+        'report_progress': 'レポート {progress}%',
+        'report_ready': 'レポート完成',
+        'report_cancelled': 'レポートはキャンセルされました',
+        'report_failed': 'レポート生成に失敗しました',
         'dashboard_title': 'Satake Enpresor データモニター',
         'update_counts_title': 'カウント更新',
         'accepts': '受入',
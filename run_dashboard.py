@@ -27,6 +27,7 @@ from dashboard import (
 )
 
 from dashboard.layout import render_dashboard_shell
+from dashboard.report_scheduler import start_report_scheduler
 from dashboard.state import app_state
 
 logger = logging.getLogger(__name__)
@@ -101,6 +102,7 @@ if __name__ == "__main__":
             machine_ids = [m.get("id") for m in machines_data.get("machines", [])]
 
         initialize_data_saving(machine_ids=machine_ids)
+        start_report_scheduler()
 
         import socket
 
@@ -0,0 +1,78 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard.alarms import AlarmEngine, machine_counters
+from dashboard.state import TagData
+from dashboard.trends import DEFECT_COUNT_TAG
+
+
+def _settings(**extra):
+    return {
+        1: {"min_enabled": True, "min_value": 5},
+        2: {"max_enabled": True, "max_value": 10},
+        **extra,
+    }
+
+
+def test_alarms_are_tracked_per_machine():
+    engine = AlarmEngine(_settings())
+
+    assert engine.check({"m1": [6, 20], "m2": [1, 0]}, now=0.0)
+    assert engine.active("m1") == ("Sens. 2 above max",)
+    assert engine.active("m2") == ("Sens. 1 below min",)
+    seq = engine.seq
+
+    # Same alarms again publish nothing new
+    assert not engine.check({"m1": [6, 30], "m2": [2, 0]}, now=1.0)
+    assert engine.seq == seq
+
+    # A machine that disconnects takes its alarms with it
+    assert engine.check({"m1": [6, 30]}, now=2.0)
+    assert engine.active("m2") == ()
+
+
+def test_notification_after_sustained_violation():
+    sent = []
+    engine = AlarmEngine(
+        _settings(email_enabled=True, email_minutes=1),
+        notify=lambda machine, counter, high: sent.append((machine, counter, high)) or True,
+    )
+
+    engine.check({"m1": [6, 20]}, now=0.0)
+    engine.check({"m1": [6, 20]}, now=59.0)
+    assert sent == []
+    engine.check({"m1": [6, 20]}, now=60.0)
+    engine.check({"m1": [6, 20]}, now=120.0)
+    assert sent == [("m1", 2, True)]
+
+    # Clearing the violation re-arms the notification
+    engine.check({"m1": [6, 0]}, now=121.0)
+    engine.check({"m1": [6, 20]}, now=122.0)
+    engine.check({"m1": [6, 20]}, now=182.0)
+    assert len(sent) == 2
+
+
+def test_machine_counters_read_connection_tags():
+    data = TagData(DEFECT_COUNT_TAG.format(3))
+    data.add_value(7)
+    connection = {"tags": {DEFECT_COUNT_TAG.format(3): {"data": data}}}
+    assert machine_counters(connection) == [0, 0, 7] + [0] * 9
+
+
+def test_rearm_notifies_again():
+    sent = []
+    engine = AlarmEngine(
+        _settings(email_enabled=True, email_minutes=1),
+        notify=lambda machine, counter, high: sent.append(counter) or True,
+    )
+    engine.check({"m1": [6, 20]}, now=0.0)
+    engine.check({"m1": [6, 20]}, now=60.0)
+    engine.check({"m1": [6, 20]}, now=61.0)
+    assert sent == [2]
+
+    # The queued email was given up, so the next cycle sends it again
+    engine.rearm("m1", 2)
+    engine.check({"m1": [6, 20]}, now=62.0)
+    assert sent == [2, 2]
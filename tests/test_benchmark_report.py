@@ -0,0 +1,70 @@
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import benchmark_report
+import hourly_data_saving as hds
+
+
+def test_synthesize_exports_matches_metrics_format(tmp_path):
+    rows = benchmark_report.synthesize_exports(tmp_path, 3, hours=1, sample_seconds=30)
+
+    assert rows == 120
+    assert sorted(os.listdir(tmp_path)) == ["1", "2", "3"]
+    with open(tmp_path / "2" / hds.METRICS_FILENAME, newline="") as fh:
+        data = list(csv.DictReader(fh))
+    assert len(data) == rows
+    assert {"timestamp", "capacity", "accepts", "rejects", "counter_12"} <= set(data[0])
+
+    loaded = hds.load_recent_metrics(export_dir=tmp_path, machine_id="2")
+    assert len(loaded["capacity"]["values"]) == rows
+
+
+def test_run_benchmark_reports_each_case():
+    report = benchmark_report.run_benchmark(
+        2, hours=1, sources=benchmark_report.SOURCES, isolate=False
+    )
+
+    assert report["config"]["machines"] == 2
+    assert report["config"]["rows_per_machine"] == 60
+    cases = {(r["layout"], r["source"]) for r in report["results"]}
+    assert cases == {
+        (layout, source)
+        for layout in benchmark_report.LAYOUTS
+        for source in benchmark_report.SOURCES
+    }
+    for result in report["results"]:
+        assert result["pages"] >= 2
+        assert result["output_bytes"] > 0
+        assert result["wall_time_s"] >= 0
+
+
+def test_sources_report_the_same_machines(tmp_path, monkeypatch):
+    import generate_report
+
+    benchmark_report.synthesize_exports(tmp_path, 3, hours=1)
+    # A saved layout naming other machines must not change the benchmarked fleet
+    layout = tmp_path / "layout.json"
+    layout.write_text('{"machines": {"machines": [{"id": 1, "name": "Only"}]}}')
+    monkeypatch.setattr(generate_report, "LAYOUT_PATH", str(layout))
+
+    drawn = []
+
+    def draw(pdf_path, dataset):
+        drawn.append(dataset.machines)
+        open(pdf_path, "wb").close()
+        return 1
+
+    monkeypatch.setattr(generate_report, "draw_layout_standard", draw)
+    manifest = benchmark_report.synthetic_manifest(3)
+    for source in benchmark_report.SOURCES:
+        benchmark_report.run_case(tmp_path, "standard", source, manifest)
+    assert drawn == [["1", "2", "3"], ["1", "2", "3"]]
+
+
+def test_failed_isolated_case_is_reported(tmp_path):
+    result = benchmark_report.run_isolated(tmp_path, "missing", "csv", timeout=30)
+    assert result["layout"] == "missing"
+    assert "exited with code" in result["error"]
@@ -9,6 +9,8 @@ import json
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from tests.test_dashboard_utils import load_modules
+from dashboard.alarms import AlarmEngine
+from dashboard.trends import TrendRecorder
 
 
 def load_callbacks(monkeypatch):
@@ -16,9 +18,8 @@ def load_callbacks(monkeypatch):
     report_mod = ModuleType("generate_report")
     report_mod.fetch_last_24h_metrics = lambda: {}
 
-    def _build_report(data, path):
-        with open(path, "wb") as fh:
-            fh.write(b"PDF")
+    def _build_report(data, buffer, **kwargs):
+        buffer.write(b"PDF")
 
     report_mod.build_report = _build_report
     monkeypatch.setitem(sys.modules, "generate_report", report_mod)
@@ -62,26 +63,226 @@ def test_section_callbacks_exist(monkeypatch):
     callbacks, registered = load_callbacks(monkeypatch)
 
     expected = {
-        "update_section_2",
-        "update_section_3_1",
-        "update_section_4",
-        "update_section_5_1",
-        "update_section_6_1",
-        "update_section_7_1",
+        "update_dashboard_sections",
+        "update_image_section",
         "generate_report_callback",
     }
 
     assert expected.issubset(set(registered))
+    assert not any(name.startswith("update_section_") for name in registered)
 
-    for name in expected:
-        func = registered[name]
-        params = inspect.signature(func).parameters
-        args = [None] * len(params)
-        if name == "generate_report_callback":
-            args = [1]
-        result = func(*args)
-        comp = result[0] if isinstance(result, tuple) else result
-        assert comp is not None
+    result = registered["generate_report_callback"](1)
+    assert result[0] is not None
+    assert registered["update_image_section"](None, "en") is not None
+
+    tick = registered["update_dashboard_sections"]
+    result = tick(1, None, "main", None, None, None, "en")
+    sections = result[: len(callbacks.LIVE_SECTIONS)]
+    assert all(comp is not None for comp in sections)
+    assert set(callbacks.LIVE_SECTIONS) <= set(result[-1])
+
+
+def _tick_context(callbacks, graphs):
+    sections = [{"id": s, "property": "children"} for s in callbacks.LIVE_SECTIONS]
+    trend = [
+        {"id": {"type": "trend-graph", "index": g}, "property": "extendData"}
+        for g in graphs
+    ]
+    return SimpleNamespace(triggered=[], outputs_list=[*sections, trend, {}, {}])
+
+
+def _live_tags(monkeypatch, callbacks, **values):
+    from dashboard.state import TagData
+
+    tags = {}
+    for name, value in values.items():
+        data = TagData(name)
+        data.add_value(value)
+        tags[getattr(callbacks, name)] = {"data": data}
+    monkeypatch.setattr(callbacks.app_state, "connected", True)
+    monkeypatch.setattr(callbacks.app_state, "tags", tags)
+    monkeypatch.setattr(callbacks, "trend_buffers", TrendRecorder())
+    return {name: tags[getattr(callbacks, name)]["data"] for name in values}
+
+
+def _clock(monkeypatch, callbacks, start=1000.0):
+    clock = [start]
+    monkeypatch.setattr(callbacks, "time", SimpleNamespace(time=lambda: clock[0]))
+    return clock
+
+
+def _expect_prevent_update(func, *args):
+    try:
+        func(*args)
+    except Exception as exc:
+        assert type(exc).__name__ == "PreventUpdate"
+    else:
+        raise AssertionError("tick should not update")
+
+
+def test_dashboard_tick_skips_unchanged_sections(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    count = len(callbacks.LIVE_SECTIONS)
+
+    first = tick(1, None, "main", None, None, None, "en")
+    assert first[count] == []
+
+    # No tag version moved, so the tick stops before computing anything
+    renderers = callbacks.live_section_renderers
+    monkeypatch.setattr(callbacks, "live_section_renderers", None)
+    _expect_prevent_update(tick, 2, None, "main", None, first[-1], None, "en")
+    monkeypatch.setattr(callbacks, "live_section_renderers", renderers)
+
+    # Changing the language re-renders every section with translated text
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    first = tick(1, None, "main", None, None, None, "en")
+    third = tick(3, None, "main", None, first[-1], None, "es")
+    unchanged = {
+        section
+        for section, comp in zip(callbacks.LIVE_SECTIONS, third)
+        if comp is callbacks.no_update
+    }
+    assert unchanged == {"section-5-2"}
+
+
+def test_dashboard_tick_recomputes_only_dependent_sections(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    tags = _live_tags(monkeypatch, callbacks, AIR_PRESSURE_TAG=5000, SERIAL_TAG="A1")
+    clock = _clock(monkeypatch, callbacks)
+
+    first = tick(1, None, "main", None, None, None, "en")
+
+    computed = []
+    renderers = callbacks.live_section_renderers
+
+    def spy(values, trend, pref, lang, sections=None, *args):
+        computed.extend(sections)
+        return renderers(values, trend, pref, lang, sections, *args)
+
+    monkeypatch.setattr(callbacks, "live_section_renderers", spy)
+
+    # The same value again keeps the version, so nothing is computed
+    tags["AIR_PRESSURE_TAG"].add_value(5000)
+    _expect_prevent_update(tick, 2, None, "main", None, first[-1], None, "en")
+    assert computed == []
+
+    # Air pressure refreshes slowly, so the change waits for the next period
+    tags["AIR_PRESSURE_TAG"].add_value(6000)
+    _expect_prevent_update(tick, 3, None, "main", None, first[-1], None, "en")
+    assert computed == []
+
+    clock[0] += callbacks.REFRESH_PERIODS[callbacks.SECTION_REFRESH["section-7-1"]]
+    second = tick(4, None, "main", None, first[-1], None, "en")
+    assert computed == ["section-7-1"]
+    sections = dict(zip(callbacks.LIVE_SECTIONS, second))
+    assert sections["section-7-1"] is not callbacks.no_update
+    assert sections["section-3-2"] is callbacks.no_update
+    assert second[-1]["version"] == tags["AIR_PRESSURE_TAG"].version
+
+
+def test_dashboard_tick_shows_engine_alarms(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    _live_tags(monkeypatch, callbacks, SERIAL_TAG="A1")
+    engine = AlarmEngine({1: {"max_enabled": True, "max_value": 1}})
+    monkeypatch.setattr(callbacks, "alarm_engine", engine)
+
+    first = tick(1, None, "main", None, None, None, "en")
+    _expect_prevent_update(tick, 2, None, "main", None, first[-1], None, "en")
+
+    # The poller publishing a new alarm re-renders just the alarm section
+    engine.check({callbacks.app_state.machine_id: [5]})
+    second = tick(3, None, "main", None, first[-1], None, "en")
+    sections = dict(zip(callbacks.LIVE_SECTIONS, second))
+    assert "Sens. 1 above max" in repr(sections["section-6-2"])
+    assert all(
+        comp is callbacks.no_update
+        for section, comp in sections.items()
+        if section != "section-6-2"
+    )
+
+
+def test_dashboard_tick_extends_trend_graphs(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    count = len(callbacks.LIVE_SECTIONS)
+    tags = _live_tags(monkeypatch, callbacks, OBJECTS_PER_MIN_TAG=10)
+    trends = TrendRecorder()
+    monkeypatch.setattr(callbacks, "trend_buffers", trends)
+
+    def poll(value, now):
+        tags["OBJECTS_PER_MIN_TAG"].add_value(value)
+        trends.sample(None, {callbacks.OBJECTS_PER_MIN_TAG: value}, now=now)
+
+    poll(10, 0.0)
+    first = tick(1, None, "main", None, None, None, "en")
+    monkeypatch.setattr(
+        callbacks, "callback_context", _tick_context(callbacks, ["production", "counters"])
+    )
+    poll(11, 1.0)
+    second = tick(2, None, "main", None, first[-1], None, "en")
+    # Every client reads the same buffer, so a second viewer adds no samples
+    assert tick(2, None, "main", None, first[-1], None, "en")[count] == second[count]
+    poll(12, 2.0)
+    third = tick(3, None, "main", None, second[-1], None, "en")
+
+    for result, value in ((second, 11), (third, 12)):
+        sections = dict(zip(callbacks.LIVE_SECTIONS, result))
+        assert sections["section-5-1"] is callbacks.no_update
+        assert sections["section-6-1"] is callbacks.no_update
+
+        production, counters = result[count]
+        data, traces, max_points = production
+        assert traces == [0] and max_points == callbacks.TREND_WINDOW
+        # Only the newest sample is sent, numbered by its position overall
+        assert data["x"] == [[result[-1]["trend-sample"] - 1]]
+        assert data["y"] == [[value]]
+        data, traces, _ = counters
+        assert traces == list(range(12))
+        assert all(len(y) == 1 for y in data["y"])
+
+    assert third[-1]["trend-sample"] == second[-1]["trend-sample"] + 1 == 3
+
+
+class _RecordingPatch:
+    """Minimal ``dash.Patch`` stand-in recording assignments."""
+
+    def __init__(self, ops=None, path=()):
+        self.ops = [] if ops is None else ops
+        self.path = path
+
+    def __getitem__(self, key):
+        return _RecordingPatch(self.ops, self.path + (key,))
+
+    def __setitem__(self, key, value):
+        self.ops.append((self.path + (key,), value))
+
+
+def test_dashboard_tick_patches_changed_leaves(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    tick = registered["update_dashboard_sections"]
+    monkeypatch.setattr(callbacks, "Patch", _RecordingPatch)
+    tags = _live_tags(monkeypatch, callbacks, SERIAL_TAG="A1")
+
+    first = tick(1, None, "main", None, None, None, "en")
+    assert not isinstance(first[callbacks.LIVE_SECTIONS.index("section-3-2")], _RecordingPatch)
+
+    tags["SERIAL_TAG"].add_value("B2")
+    second = tick(2, None, "main", None, first[-1], None, "en")
+    sections = dict(zip(callbacks.LIVE_SECTIONS, second))
+
+    patch = sections["section-3-2"]
+    assert isinstance(patch, _RecordingPatch)
+    path, value = patch.ops[0]
+    assert len(patch.ops) == 1
+    assert path == callbacks.SECTION_LEAVES["section-3-2"]["serial"]
+    assert path == ("props", "children", 1, "props", "children")
+    assert value.endswith("B2")
+    for section in ("section-1-1", "section-2", "section-4"):
+        assert sections[section] is callbacks.no_update
 
 
 def test_manage_dashboard_toggle(monkeypatch):
@@ -220,6 +421,100 @@ def test_machine_filter_by_floor(monkeypatch):
     assert len(children) == 2
 
 
+def test_machine_grid_renders_one_page(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    render_cards = registered["render_machine_cards"]
+    built = []
+    monkeypatch.setattr(
+        callbacks, "build_machine_card", lambda m, opts: built.append(m["id"]) or m["id"]
+    )
+
+    size = callbacks.MACHINE_PAGE_SIZE
+    floors = {"floors": [{"id": 1, "name": "F1"}], "selected_floor": 1}
+    machines = {
+        "machines": [
+            {"id": i, "floor_id": 1, "capacity": "1,000", "accepts": 2, "rejects": 1}
+            for i in range(size + 6)
+        ]
+    }
+
+    cards = render_cards(floors, machines, "new", [2])
+    assert built == list(range(size, size + 6))
+    row, pagination, summary = cards[1][0]
+    assert pagination[2]["active_page"] == 2
+    assert pagination[2]["max_value"] == 2
+    assert callbacks._machine_totals(machines["machines"])["capacity"] == 1000.0 * (size + 6)
+
+    # Out of range pages are clamped to the last one
+    built.clear()
+    render_cards(floors, machines, "new", [9])
+    assert len(built) == 6
+
+
+def test_machine_cards_use_summary_store(monkeypatch):
+    callbacks, registered = load_callbacks(monkeypatch)
+    render_cards = registered["render_machine_cards"]
+    built = []
+    monkeypatch.setattr(
+        callbacks, "build_machine_card", lambda m, opts: built.append(m) or m["id"]
+    )
+    monkeypatch.setattr(callbacks, "load_weight_preference", lambda: {"unit": "kg"})
+
+    floors = {"floors": [{"id": 1, "name": "F1"}], "selected_floor": "all"}
+    machines = {
+        "machines": [
+            {"id": 1, "floor_id": 1, "selected_ip": "10.0.0.5"},
+            {"id": 2, "floor_id": 1, "selected_ip": "10.0.0.6"},
+        ]
+    }
+    summaries = {
+        "seq": 3,
+        "machines": {
+            "Line A": {
+                "connected": True,
+                "ip": "10.0.0.5",
+                "serial": "S1",
+                "model": "RGB400",
+                "status": "GOOD",
+                "preset": "1",
+                "feeder": "Running",
+                "capacity": 1200.0,
+                "accepts": 1100.0,
+                "rejects": 100.0,
+            }
+        },
+    }
+
+    render_cards(floors, machines, "new", [], summaries)
+    assert built[0]["connected"] and built[0]["capacity"] == "1,200"
+    assert "capacity" not in built[1]
+
+    # Later snapshots update the rendered cards in place
+    summaries["machines"]["Line A"]["capacity"] = 1500.0
+    value_ids = [
+        {"type": "machine-card-value", "index": mid, "field": field}
+        for mid in (1, 2)
+        for field in ("capacity", "status")
+    ]
+    card_ids = [{"type": "machine-card", "index": mid} for mid in (1, 2)]
+    total_ids = [{"type": "machine-total", "index": "capacity"}]
+    values, labels, styles, classes, totals = registered["update_machine_cards"](
+        summaries, value_ids, card_ids, total_ids, floors, machines
+    )
+    assert values == ["1,500", "GOOD", "0", "Unknown"]
+    assert labels == ["(Connected)", "(Not Connected)"]
+    assert classes == ["mb-2 machine-card-connected", "mb-2 machine-card-disconnected"]
+    assert totals == ["1,500 kg/hr"]
+    assert len(built) == 2
+    _expect_prevent_update(
+        registered["update_machine_cards"], summaries, [], [], [], floors, machines
+    )
+
+    update = registered["update_machine_summary_store"]
+    snapshot = update(1, None, None)
+    _expect_prevent_update(update, 2, None, snapshot)
+
+
 def test_add_floor_then_machine_filters(monkeypatch):
     callbacks, registered = load_callbacks(monkeypatch)
     add_floor = registered["add_floor_cb"]
@@ -386,8 +681,14 @@ def test_load_initial_theme(monkeypatch):
     assert func(None) == "dark"
 
 
-def test_add_and_delete_ip_address(monkeypatch):
+def test_add_and_delete_ip_address(monkeypatch, tmp_path):
     callbacks, registered = load_callbacks(monkeypatch)
+    save = callbacks.save_ip_addresses
+    monkeypatch.setattr(
+        callbacks,
+        "save_ip_addresses",
+        lambda data: save(data, path=tmp_path / "ip_addresses.json"),
+    )
     add_ip = registered["add_ip_address"]
     delete_ip = registered["delete_ip_address"]
     render_list = registered["update_saved_ip_list"]
@@ -23,9 +23,8 @@ def load_modules(monkeypatch, src_patches=None):
     report_mod = ModuleType("generate_report")
     report_mod.fetch_last_24h_metrics = lambda: {}
 
-    def _build_report(data, path):
-        with open(path, "wb") as fh:
-            fh.write(b"PDF")
+    def _build_report(data, buffer, **kwargs):
+        buffer.write(b"PDF")
 
     report_mod.build_report = _build_report
     monkeypatch.setitem(sys.modules, "generate_report", report_mod)
@@ -271,8 +270,14 @@ def test_reconnection_helpers_execute(monkeypatch):
         finally:
             loop.close()
 
+    async def fake_connect_to_server(server_url, server_name=None):
+        calls.setdefault("server", []).append(server_url)
+        return False
+
     state_obj = SimpleNamespace(thread_stop_flag=False)
     patches = {
+        # The real connection dumps discovered tags into the working directory
+        "connect_to_server": fake_connect_to_server,
         "connect_and_monitor_machine_with_timeout": fake_connect,
         "run_async": fake_run_async,
         "resume_update_thread": lambda: None,
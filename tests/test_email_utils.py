@@ -1,3 +1,4 @@
+import smtplib
 import sys
 from pathlib import Path
 
@@ -54,3 +55,128 @@ def test_send_threshold_email(monkeypatch):
     assert captured["mail"][0] == "from@example.com"
     assert captured["mail"][1] == "user@example.com"
     assert "lower" in captured["mail"][2]
+
+
+def test_email_sender_reuses_connection(monkeypatch):
+    import dashboard.email_utils as email_utils
+
+    connections = []
+
+    class DummySMTP:
+        def __init__(self, host, port):
+            self.sent = []
+            connections.append(self)
+
+        def starttls(self):
+            pass
+
+        def login(self, username, password):
+            pass
+
+        def sendmail(self, from_addr, to_addr, msg):
+            self.sent.append((from_addr, to_addr, msg))
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(email_utils.smtplib, "SMTP", DummySMTP)
+    sender = email_utils.EmailSender(
+        settings={"smtp_server": "localhost", "smtp_port": 25, "from_address": "r@example.com"}
+    )
+
+    for i in range(3):
+        msg = email_utils.build_report_email(["a@example.com"], b"%PDF-", f"r{i}.pdf")
+        sender.send(msg, ["a@example.com"])
+    assert sender.flush(timeout=5)
+
+    assert len(connections) == 1
+    assert len(connections[0].sent) == 3
+    assert 'filename="r2.pdf"' in connections[0].sent[2][2]
+
+
+def test_threshold_digest_retries_without_blocking_the_queue(monkeypatch):
+    import dashboard.email_utils as email_utils
+
+    delivered = []
+    failures = {"ops@example.com": 1}
+
+    class FlakySMTP:
+        def __init__(self, host, port):
+            pass
+
+        def starttls(self):
+            pass
+
+        def sendmail(self, from_addr, to_addr, msg):
+            # The relay defers the first digest once
+            if failures.get(to_addr[0]):
+                failures[to_addr[0]] -= 1
+                raise smtplib.SMTPDataError(451, "try again later")
+            delivered.append((to_addr, msg))
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(email_utils.smtplib, "SMTP", FlakySMTP)
+    sender = email_utils.EmailSender(settings={"from_address": "r@example.com"}, backoff=0.2)
+    digest = email_utils.ThresholdDigest(sender, window=60)
+
+    digest.add("ops@example.com", 2, True, "Line A")
+    digest.add("ops@example.com", 5, False, "Line B")
+    assert digest.flush() == 1
+    report = email_utils.build_report_email(["boss@example.com"], b"%PDF-", "r.pdf")
+    sender.send(report, ["boss@example.com"])
+    assert sender.flush(timeout=5)
+
+    # The report went out while the deferred digest waited for its retry
+    assert [to_addr for to_addr, _ in delivered] == [["boss@example.com"], ["ops@example.com"]]
+    text = delivered[1][1]
+    assert "Enpresor Alarms (2)" in text
+    assert "Line A: Sensitivity 2 has reached the upper threshold." in text
+    assert "Line B: Sensitivity 5 has reached the lower threshold." in text
+
+
+def test_given_up_digest_reports_failure(monkeypatch):
+    import dashboard.email_utils as email_utils
+
+    class DownSMTP:
+        def __init__(self, host, port):
+            raise OSError("connection refused")
+
+    monkeypatch.setattr(email_utils.smtplib, "SMTP", DownSMTP)
+    sender = email_utils.EmailSender(settings={}, retries=2, backoff=0.01)
+    digest = email_utils.ThresholdDigest(sender, window=60)
+    failed = []
+
+    digest.add("ops@example.com", 3, True, "Line A", on_failure=lambda: failed.append(3))
+    digest.flush()
+    assert sender.flush(timeout=5)
+    assert failed == [3]
+
+
+def test_refused_recipient_does_not_report_failure(monkeypatch):
+    import dashboard.email_utils as email_utils
+
+    class RefusingSMTP:
+        def __init__(self, host, port):
+            pass
+
+        def starttls(self):
+            pass
+
+        def sendmail(self, from_addr, to_addr, msg):
+            raise smtplib.SMTPRecipientsRefused({to_addr[0]: (550, b"no such user")})
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(email_utils.smtplib, "SMTP", RefusingSMTP)
+    sender = email_utils.EmailSender(settings={}, retries=2, backoff=0.01)
+    digest = email_utils.ThresholdDigest(sender, window=60)
+    failed = []
+
+    # Re-arming the alarm would only get the same address refused again
+    digest.add("nobody@example.com", 3, True, "Line A", on_failure=lambda: failed.append(3))
+    digest.flush()
+    assert sender.flush(timeout=5)
+    assert failed == []
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard import figures
+from i18n import tr
+
+
+def test_skeletons_are_cached_per_theme_and_language():
+    light = figures.figure_skeleton("split-pie", "light", "en")
+    assert figures.figure_skeleton("split-pie", "light", "en") is light
+    assert light["data"][0]["labels"] == [tr("accepts", "en"), tr("rejects", "en")]
+
+    dark = figures.figure_skeleton("split-pie", "dark", "es")
+    assert dark is not light
+    assert dark["layout"]["paper_bgcolor"] == "rgba(0,0,0,0)"
+    assert dark["data"][0]["labels"][0] == tr("accepts", "es")
+
+
+def test_build_figure_fills_data_without_touching_skeleton():
+    skeleton = figures.figure_skeleton("counter-trend", "light", "en")
+    fig = figures.build_figure("counter-trend", "light", "en", {"x": [0], "y": [5]})
+
+    assert fig["layout"] is skeleton["layout"]
+    assert fig["data"][0]["y"] == [5] and fig["data"][0]["name"] == "1"
+    assert "y" not in skeleton["data"][0]
+    assert len(fig["data"]) == 12 and fig["data"][1] is skeleton["data"][1]
@@ -0,0 +1,263 @@
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+pytest.importorskip("pandas")
+pytest.importorskip("reportlab")
+
+import generate_report
+import hourly_data_saving
+
+
+@pytest.fixture(autouse=True)
+def _no_saved_layout(tmp_path_factory, monkeypatch):
+    layout = tmp_path_factory.mktemp("layout") / "floor_machine_layout.json"
+    monkeypatch.setattr(generate_report, "LAYOUT_PATH", str(layout))
+    return layout
+
+
+def _write_metrics(export_dir, machine, rows):
+    machine_dir = export_dir / str(machine)
+    machine_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    lines = ["timestamp,capacity,Accepts,rejects,objects_per_min,counter_1,COUNTER_2"]
+    for i, (cap, acc, rej, objs, c1, c2) in enumerate(rows):
+        ts = (now - timedelta(minutes=len(rows) - i)).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(f"{ts},{cap},{acc},{rej},{objs},{c1},{c2}")
+    (machine_dir / generate_report.METRICS_FILENAME).write_text("\n".join(lines) + "\n")
+
+
+def test_report_dataset_aggregates(tmp_path):
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6), (20, 15, 5, 200, 8, 10)])
+    _write_metrics(tmp_path, 2, [(5, 4, 1, 50, 30, 0)])
+
+    dataset = generate_report.ReportDataset(str(tmp_path))
+
+    assert dataset.machines == ["1", "2"]
+    assert dataset.total_capacity == 35
+    assert dataset.total_accepts == 27
+    assert dataset.total_rejects == 8
+    assert dataset.total_objects == 350
+    assert dataset.total_removed == 58
+    assert dataset.global_max_firing == 30
+    assert dataset.get("1").counter_averages == [("S1", 6.0), ("S2", 8.0)]
+    assert len(dataset.get("1").trend_values) == 2
+
+
+def test_report_dataset_reads_each_machine_once(tmp_path, monkeypatch):
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6)])
+    _write_metrics(tmp_path, 2, [(5, 4, 1, 50, 30, 0)])
+
+    reads = []
+    real_read_csv = generate_report.pd.read_csv
+
+    def counting_read_csv(path, *args, **kwargs):
+        reads.append(path)
+        return real_read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(generate_report.pd, "read_csv", counting_read_csv)
+
+    pdf_path = tmp_path / "report.pdf"
+    generate_report.build_report({}, str(pdf_path), export_dir=str(tmp_path))
+
+    assert len(reads) == 2
+    assert pdf_path.read_bytes().startswith(b"%PDF")
+
+
+def test_header_resources_registered_once(tmp_path):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    resources = generate_report.get_report_resources()
+    assert generate_report.get_report_resources() is resources
+
+    c = canvas.Canvas(str(tmp_path / "header.pdf"), pagesize=letter)
+    width, height = letter
+    generate_report.draw_header(c, width, height, 1)
+    assert c.hasForm(generate_report.HEADER_FORM_NAME)
+    c.showPage()
+    generate_report.draw_header(c, width, height, 2)
+    c.save()
+
+    assert (tmp_path / "header.pdf").read_bytes().count(b"/Subtype /Form") == 1
+
+
+def test_paginate_machines_layouts(tmp_path):
+    for machine in range(1, 6):
+        _write_metrics(tmp_path, machine, [(10, 8, 2, 100, 4, 6)])
+
+    dataset = generate_report.ReportDataset(str(tmp_path))
+
+    assert generate_report.paginate_machines(dataset, use_optimized=True) == [
+        ["1", "2"],
+        ["3", "4"],
+        ["5"],
+    ]
+    standard = generate_report.paginate_machines(dataset)
+    assert [m for page in standard for m in page] == dataset.machines
+
+
+def test_parallel_report_matches_serial_page_count(tmp_path, monkeypatch):
+    pypdf = pytest.importorskip("pypdf")
+    for machine in range(1, 8):
+        _write_metrics(tmp_path, machine, [(10, 8, 2, 100, 4, 6)])
+    monkeypatch.setattr(generate_report, "PARALLEL_MIN_PAGES", 1)
+
+    serial = tmp_path / "serial.pdf"
+    parallel = tmp_path / "parallel.pdf"
+    generate_report.build_report({}, str(serial), export_dir=str(tmp_path))
+    generate_report.build_report(
+        {}, str(parallel), export_dir=str(tmp_path), parallel=True, max_workers=2
+    )
+
+    serial_pages = pypdf.PdfReader(str(serial)).pages
+    parallel_pages = pypdf.PdfReader(str(parallel)).pages
+    assert len(parallel_pages) == len(serial_pages)
+    assert "Page 1" in parallel_pages[0].extract_text()
+    assert f"Page {len(serial_pages)}" in parallel_pages[-1].extract_text()
+
+
+def test_report_fingerprint_tracks_inputs(tmp_path):
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6)])
+    base = generate_report.report_fingerprint(str(tmp_path))
+
+    assert generate_report.report_fingerprint(str(tmp_path)) == base
+    assert generate_report.report_fingerprint(str(tmp_path), use_optimized=True) != base
+
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6), (20, 15, 5, 200, 8, 10)])
+    assert generate_report.report_fingerprint(str(tmp_path)) != base
+
+
+def test_report_aggregator_matches_csv_dataset(tmp_path, monkeypatch):
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6), (20, 15, 5, 200, 8, 10)])
+    _write_metrics(tmp_path, 2, [(5, 4, 1, 50, 30, 0)])
+
+    aggregator = generate_report.ReportAggregator(str(tmp_path))
+    aggregator.seed()
+    expected = generate_report.ReportDataset(str(tmp_path))
+    dataset = aggregator.dataset()
+
+    assert dataset.machines == expected.machines
+    for attr in ("total_capacity", "total_accepts", "total_rejects",
+                 "total_objects", "total_removed", "global_max_firing"):
+        assert getattr(dataset, attr) == pytest.approx(getattr(expected, attr))
+    assert dataset.get("1").counter_averages == expected.get("1").counter_averages
+
+    # Rows appended to the CSVs after seeding are picked up on the next render
+    hourly_data_saving.append_metrics(
+        {"capacity": 7, "counter_1": 1}, machine_id="2", export_dir=str(tmp_path)
+    )
+    assert aggregator.dataset().total_capacity == pytest.approx(42)
+    # Unchanged files are not re-read
+    monkeypatch.setattr(generate_report.pd, "read_csv", None)
+    assert aggregator.dataset().total_capacity == pytest.approx(42)
+
+    # Rows older than the window drop out
+    later = datetime.now() + timedelta(hours=30)
+    assert aggregator.dataset(later).total_capacity == 0
+
+
+def test_report_manifest_from_saved_layout(tmp_path, _no_saved_layout):
+    exports = tmp_path / "exports"
+    for machine in ["2", "10", "Sorter A", "99"]:
+        _write_metrics(exports, machine, [(10, 8, 2, 100, 4, 6)])
+
+    # Without a layout every machine directory is reported, numbers first
+    scanned = generate_report.ReportDataset(str(exports))
+    assert scanned.machines == ["2", "10", "99", "Sorter A"]
+
+    _no_saved_layout.write_text(json.dumps({
+        "floors": {"floors": [{"id": 1, "name": "F1"}, {"id": 2, "name": "F2"}]},
+        "machines": {"machines": [
+            {"id": 10, "floor_id": 2, "name": "Line 10"},
+            {"id": 2, "floor_id": 1, "name": "Line 2"},
+            {"id": 5, "floor_id": 1, "name": "Sorter A"},
+        ]},
+    }))
+    manifest = generate_report.load_report_manifest(csv_parent_dir=str(exports))
+    assert manifest == {"2": "Line 2", "Sorter A": "Sorter A", "10": "Line 10"}
+
+    dataset = generate_report.ReportDataset(str(exports), manifest)
+    assert dataset.machines == ["2", "Sorter A", "10"]
+    assert dataset.label("2") == "Line 2"
+    assert dataset.total_capacity == 30
+
+    pdf = tmp_path / "report.pdf"
+    generate_report.build_report({}, str(pdf), export_dir=str(exports))
+    pypdf = pytest.importorskip("pypdf")
+    text = "".join(page.extract_text() for page in pypdf.PdfReader(str(pdf)).pages)
+    assert "Line 10" in text
+    assert "Machine 99" not in text
+
+
+def test_machine_trend_is_bounded(tmp_path):
+    rows = [(i, 1, 0, 1, 1, 1) for i in range(1000)]
+    _write_metrics(tmp_path, 1, rows)
+
+    data = generate_report.ReportDataset(str(tmp_path)).get("1")
+    assert len(data.trend_values) <= generate_report.TREND_MAX_POINTS
+    assert max(data.trend_values) == 999
+    assert data.capacity_total == sum(range(1000))
+
+
+def test_machine_chart_templates_are_shared(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    for machine in range(1, 7):
+        _write_metrics(tmp_path, machine, [(10, 8, 2, 100, 4, 6)])
+    pdf = tmp_path / "report.pdf"
+    generate_report.build_report({}, str(pdf), export_dir=str(tmp_path))
+
+    forms = set()
+    for page in pypdf.PdfReader(str(pdf)).pages[1:]:
+        xobjects = page["/Resources"].get("/XObject", {})
+        for ref in xobjects.values():
+            forms.add(ref.idnum)
+        assert b"Machine" in page.get_contents().get_data()
+    # Header, section frame, bar axes and pie labels: one form each for all machines
+    assert len(forms) == 4
+
+
+def test_machine_titles_use_labels(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    _write_metrics(tmp_path, 1, [(10, 8, 2, 100, 4, 6)])
+    pdf = tmp_path / "report.pdf"
+    generate_report.build_report({}, str(pdf), export_dir=str(tmp_path),
+                                 manifest={"1": "Line 1"})
+
+    content = pypdf.PdfReader(str(pdf)).pages[1].get_contents().get_data()
+    assert b"(Line 1 - Sensitivity Firing Averages)" in content
+    assert b"(Line 1 Counts:)" in content
+
+
+def test_section_titles_name_each_machine(tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    for machine in (1, 2):
+        _write_metrics(tmp_path, machine, [(10, 8, 2, 100, 4, 6)])
+    pdf = tmp_path / "report.pdf"
+    generate_report.build_report({}, str(pdf), export_dir=str(tmp_path),
+                                 manifest={"1": "Line 1", "2": "Line 2"})
+
+    content = pypdf.PdfReader(str(pdf)).pages[1].get_contents().get_data()
+    for name in (b"Line 1", b"Line 2"):
+        assert b"(" + name + b" - Sensitivity Firing Averages)" in content
+        assert b"(" + name + b" Counts:)" in content
+    # Drawing the pie slice names must not leak into the section titles
+    assert b"(Rejects - Sensitivity" not in content
+    assert b"(Rejects Counts:)" not in content
+
+
+def test_bar_axes_forms_follow_tick_labels(tmp_path):
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(tmp_path / "axes.pdf"))
+    names = ("1", "2")
+    # Both maxima round to 10 but their intermediate ticks differ (7 vs 6)
+    first = generate_report._bar_axes_form(c, 100, 50, names, 10.4)
+    second = generate_report._bar_axes_form(c, 100, 50, names, 9.6)
+    assert first != second
+    assert generate_report._bar_axes_form(c, 100, 50, names, 10.3) == first
@@ -1,6 +1,6 @@
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -44,3 +44,37 @@ def test_append_and_load_control_log(tmp_path):
 def test_load_recent_control_log_empty(tmp_path):
     log = hds.load_recent_control_log(export_dir=tmp_path, machine_id="missing")
     assert log == []
+
+
+def test_downsample_series_keeps_extremes():
+    times = list(range(1000))
+    values = [0.0] * 1000
+    values[437] = 50.0
+    values[802] = -20.0
+
+    ds_times, ds_values = hds.downsample_series(times, values, 100)
+
+    assert len(ds_values) <= 100
+    assert ds_times[0] == 0 and ds_times[-1] == 999
+    assert ds_times == sorted(ds_times)
+    assert 50.0 in ds_values and -20.0 in ds_values
+
+
+def test_get_historical_data_max_points(tmp_path):
+    machine_dir = tmp_path / "m1"
+    machine_dir.mkdir()
+    now = datetime.now().replace(microsecond=0)
+    rows = ["timestamp,capacity"]
+    for i in range(300):
+        ts = (now - timedelta(seconds=300 - i)).strftime("%Y-%m-%d %H:%M:%S")
+        rows.append(f"{ts},{i}")
+    (machine_dir / hds.METRICS_FILENAME).write_text("\n".join(rows) + "\n")
+
+    full = hds.get_historical_data("24h", export_dir=tmp_path, machine_id="m1")
+    reduced = hds.get_historical_data(
+        "24h", export_dir=tmp_path, machine_id="m1", max_points=50
+    )
+
+    assert len(full["capacity"]["values"]) == 300
+    assert len(reduced["capacity"]["values"]) <= 50
+    assert reduced["capacity"]["values"][-1] == 299.0
@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard import live_updates as lu
+
+
+def _parse(message):
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_publish_sends_only_changed_tags():
+    broker = lu.LiveUpdateBroker()
+    subscriber = broker.subscribe()
+
+    first = broker.publish({"a": 1, "b": 2})
+    assert first["changed"] == ["a", "b"]
+    assert broker.publish({"a": 1, "b": 2}) is None
+
+    delta = broker.publish({"a": 1, "b": 3})
+    # Only the names of the changed tags are sent, never their values
+    assert delta == {"seq": 2, "connected": True, "changed": ["b"], "removed": []}
+
+    delta = broker.publish({}, connected=False)
+    assert delta["removed"] == ["a", "b"] and delta["connected"] is False
+
+    assert [subscriber.queue.get_nowait()["seq"] for _ in range(3)] == [1, 2, 3]
+    assert broker.snapshot() == {"seq": 3, "connected": False, "tags": []}
+
+
+def test_slow_subscriber_is_resynchronised():
+    broker = lu.LiveUpdateBroker(queue_size=2)
+    subscriber = broker.subscribe()
+    for value in range(5):
+        broker.publish({"a": value})
+
+    assert subscriber.queue.get_nowait() is None
+    assert subscriber.queue.empty()
+
+
+def test_stream_yields_snapshot_then_deltas():
+    broker = lu.LiveUpdateBroker()
+    broker.publish({"a": 1})
+    stream = broker.stream(keepalive=0.01)
+
+    event, payload = _parse(next(stream))
+    assert event == "snapshot"
+    assert payload == {"seq": 1, "connected": True, "tags": ["a"]}
+    assert broker.subscriber_count == 1
+
+    assert next(stream) == ": keepalive\n\n"
+
+    broker.publish({"a": 2})
+    event, payload = _parse(next(stream))
+    assert event == "delta"
+    assert payload["changed"] == ["a"]
+
+    stream.close()
+    assert broker.subscriber_count == 0
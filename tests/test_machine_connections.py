@@ -38,3 +38,20 @@ def test_connect_and_monitor_failure(monkeypatch):
     )
     assert result is False
     assert 'm2' not in opc_client.machine_connections
+
+
+def test_alarm_counters_check_active_machine_once(monkeypatch):
+    legacy, _, opc_client, _, _ = load_modules(monkeypatch)
+    opc_client.machine_connections.clear()
+    monkeypatch.setattr(opc_client.app_state, 'client', object(), raising=False)
+    monkeypatch.setattr(opc_client.app_state, 'connected', True, raising=False)
+    monkeypatch.setattr(
+        opc_client.app_state, 'machine_id', 'opc.tcp://1.2.3.4:4840', raising=False
+    )
+    opc_client.machine_connections['m1'] = {'ip': '1.2.3.4', 'connected': True, 'tags': {}}
+    opc_client.machine_connections['m2'] = {'ip': '5.6.7.8', 'connected': True, 'tags': {}}
+
+    machines = opc_client.alarm_counters()
+
+    assert sorted(machines) == ['m2', 'opc.tcp://1.2.3.4:4840']
+    opc_client.machine_connections.clear()
@@ -0,0 +1,52 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard import machine_summary as ms
+from dashboard.state import TagData
+
+
+def _connection(**values):
+    tags = {}
+    for name, value in values.items():
+        data = TagData(name)
+        data.add_value(value)
+        tags[name] = {"data": data}
+    return {"connected": True, "ip": "10.0.0.5", "tags": tags}
+
+
+def test_summarize_machine_matches_legacy_fields():
+    record = ms.summarize_machine(
+        _connection(
+            **{
+                ms.CAPACITY_TAG: 1000,
+                ms.REJECT_PERCENT_TAG: 5,
+                ms.GLOBAL_WARNING_TAG: True,
+                ms.MODEL_TAG: "RGB400",
+                ms.FEEDER_RUNNING_TAG.format(3): True,
+                ms.PRESET_NUMBER_TAG: 2,
+                ms.PRESET_NAME_TAG: "Beans",
+            }
+        )
+    )
+    assert record["status"] == "WARNING"
+    # The RGB400 only has two feeders
+    assert record["feeder"] == "Stopped"
+    assert record["preset"] == "2 Beans"
+    assert (record["capacity"], record["accepts"], record["rejects"]) == (1000, 950, 50)
+    assert ms.summarize_machine({"connected": False, "ip": "x"})["status"] == "Offline"
+
+
+def test_refresh_bumps_sequence_only_on_change():
+    summaries = ms.MachineSummaries()
+    connections = {"m1": _connection(**{ms.CAPACITY_TAG: 10})}
+
+    assert summaries.refresh(connections)
+    assert not summaries.refresh(connections)
+    connections["m1"]["tags"][ms.CAPACITY_TAG]["data"].add_value(20)
+    assert summaries.refresh(connections)
+
+    snapshot = summaries.snapshot()
+    assert snapshot["seq"] == 2
+    assert snapshot["machines"]["m1"]["capacity"] == 20
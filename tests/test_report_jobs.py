@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+from types import ModuleType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard import report_jobs as rj
+
+
+def _stub_report(monkeypatch, build, fingerprint=None):
+    report_mod = ModuleType("generate_report")
+    report_mod.METRIC_EXPORT_DIR = "exports"
+    report_mod.build_report = build
+    if fingerprint is not None:
+        report_mod.report_fingerprint = fingerprint
+    monkeypatch.setitem(sys.modules, "generate_report", report_mod)
+
+
+def test_job_reports_progress_and_result(monkeypatch):
+    seen = []
+
+    def build(data, buffer, progress=None):
+        assert data is None
+        for done in range(4):
+            progress(done, 3)
+            seen.append(done)
+        buffer.write(b"PDF")
+
+    _stub_report(monkeypatch, build)
+    manager = rj.ReportJobManager()
+    job = manager.submit()
+    job.future.result(timeout=5)
+
+    assert seen == [0, 1, 2, 3]
+    status = manager.status(job.id)
+    assert status["status"] == rj.DONE
+    assert status["progress"] == 100
+    assert manager.result(job.id) == b"PDF"
+    assert manager.cancel(job.id) is False
+
+
+def test_job_cancellation(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def build(data, buffer, progress=None):
+        progress(0, 2)
+        started.set()
+        release.wait(5)
+        progress(1, 2)
+
+    _stub_report(monkeypatch, build)
+    manager = rj.ReportJobManager()
+    job = manager.submit()
+    assert started.wait(5)
+    assert manager.status(job.id)["status"] == rj.RUNNING
+
+    assert manager.cancel(job.id) is True
+    release.set()
+    job.future.result(timeout=5)
+
+    assert manager.status(job.id)["status"] == rj.CANCELLED
+    assert manager.result(job.id) is None
+
+
+def test_failed_job_keeps_error(monkeypatch):
+    def build(data, buffer, progress=None):
+        raise RuntimeError("boom")
+
+    _stub_report(monkeypatch, build)
+    manager = rj.ReportJobManager()
+    job = manager.submit()
+    job.future.result(timeout=5)
+
+    status = manager.status(job.id)
+    assert status["status"] == rj.FAILED
+    assert status["error"] == "boom"
+
+
+def test_identical_requests_share_cached_job(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    builds = []
+    key = {"value": "a"}
+
+    def build(data, buffer, progress=None, **kwargs):
+        builds.append(kwargs)
+        started.set()
+        release.wait(5)
+        buffer.write(b"PDF")
+
+    def fingerprint(export_dir, use_optimized=False):
+        return f"{key['value']}|{use_optimized}"
+
+    _stub_report(monkeypatch, build, fingerprint)
+    manager = rj.ReportJobManager()
+
+    first = manager.submit()
+    assert started.wait(5)
+    # A concurrent identical request joins the in-flight render
+    assert manager.submit() is first
+    release.set()
+    first.future.result(timeout=5)
+
+    # Later identical requests get the cached bytes without re-rendering
+    assert manager.submit() is first
+    assert len(builds) == 1
+
+    other = manager.submit(use_optimized=True)
+    other.future.result(timeout=5)
+    key["value"] = "b"
+    changed = manager.submit()
+    changed.future.result(timeout=5)
+
+    assert other is not first and changed is not first
+    assert len(builds) == 3
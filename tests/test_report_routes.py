@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+flask = pytest.importorskip("flask")
+
+from dashboard import report_jobs as rj
+from dashboard import report_routes
+
+
+class _Jobs:
+    def __init__(self, *jobs):
+        self.jobs = {job.id: job for job in jobs}
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+
+def _client(monkeypatch, *jobs):
+    monkeypatch.setattr(report_routes, "report_jobs", _Jobs(*jobs))
+    server = flask.Flask(__name__)
+    assert report_routes.register_report_routes(server)
+    return server.test_client()
+
+
+def test_iter_chunks_splits_bytes():
+    chunks = list(report_routes.iter_chunks(b"abcdefg", chunk_size=3))
+    assert chunks == [b"abc", b"def", b"g"]
+
+
+def test_download_streams_finished_report(monkeypatch):
+    job = rj.ReportJob(fingerprint="abc123")
+    job.status = rj.DONE
+    job.pdf_bytes = b"%PDF-" + b"x" * (report_routes.CHUNK_SIZE * 2 + 10)
+    pending = rj.ReportJob()
+    client = _client(monkeypatch, job, pending)
+
+    resp = client.get(report_routes.report_url(job.id))
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/pdf"
+    assert resp.headers["Content-Length"] == str(len(job.pdf_bytes))
+    assert "max-age" in resp.headers["Cache-Control"]
+    assert resp.data == job.pdf_bytes
+
+    cached = client.get(
+        report_routes.report_url(job.id), headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    assert client.get(report_routes.report_url(pending.id)).status_code == 404
+    assert client.get(report_routes.report_url("missing")).status_code == 404
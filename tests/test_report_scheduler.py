@@ -0,0 +1,104 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from types import ModuleType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard import report_scheduler as rs
+
+
+def test_cron_schedule_matching():
+    shift_end = rs.CronSchedule("0 6,14,22 * * 1-5")
+    assert shift_end.matches(datetime(2024, 5, 6, 14, 0))  # Monday
+    assert not shift_end.matches(datetime(2024, 5, 6, 14, 1))
+    assert not shift_end.matches(datetime(2024, 5, 5, 14, 0))  # Sunday
+
+    every_quarter = rs.CronSchedule("*/15 * * * *")
+    assert every_quarter.matches(datetime(2024, 5, 5, 3, 45))
+    assert not every_quarter.matches(datetime(2024, 5, 5, 3, 50))
+
+    sunday = rs.CronSchedule("30 7 * * 7")
+    assert sunday.matches(datetime(2024, 5, 5, 7, 30))
+
+
+def test_run_due_renders_each_layout_once(monkeypatch):
+    rendered = []
+
+    def build(data, buffer, use_optimized=False, dataset=None):
+        rendered.append((use_optimized, dataset))
+        buffer.write(b"PDF")
+
+    report_mod = ModuleType("generate_report")
+    report_mod.build_report = build
+    monkeypatch.setitem(sys.modules, "generate_report", report_mod)
+
+    class Aggregator:
+        calls = 0
+
+        def dataset(self, now):
+            Aggregator.calls += 1
+            return "snapshot"
+
+    class Sender:
+        def __init__(self):
+            self.sent = []
+
+        def send(self, msg, to_addrs):
+            self.sent.append((msg["Subject"], to_addrs))
+
+    schedules = [
+        {"name": "A", "cron": "0 14 * * *", "recipients": ["a@example.com"]},
+        {"name": "B", "cron": "0 14 * * *", "recipients": ["b@example.com"]},
+        {"name": "C", "cron": "0 14 * * *", "recipients": ["c@example.com"],
+         "use_optimized": True},
+        {"name": "Later", "cron": "0 22 * * *", "recipients": ["d@example.com"]},
+        {"name": "Off", "cron": "0 14 * * *", "recipients": ["e@example.com"],
+         "enabled": False},
+    ]
+    sender = Sender()
+    scheduler = rs.ReportScheduler(Aggregator(), sender, lambda: schedules)
+
+    futures = scheduler.run_due(datetime(2024, 5, 6, 14, 0, 12))
+    assert all(f.result(timeout=5) for f in futures)
+    # The same minute is not fired twice
+    assert scheduler.run_due(datetime(2024, 5, 6, 14, 0, 40)) == []
+
+    assert Aggregator.calls == 1
+    assert sorted(r[0] for r in rendered) == [False, True]
+    assert all(r[1] == "snapshot" for r in rendered)
+    assert sorted(to for _, to in sender.sent) == [
+        ["a@example.com"], ["b@example.com"], ["c@example.com"]
+    ]
+
+
+def test_scheduled_report_includes_rows_appended_after_seed(tmp_path, monkeypatch):
+    import generate_report
+    import hourly_data_saving
+
+    rendered = []
+
+    def build(data, buffer, use_optimized=False, dataset=None):
+        rendered.append(dataset.total_capacity)
+        buffer.write(b"PDF")
+
+    monkeypatch.setattr(generate_report, "build_report", build)
+
+    hourly_data_saving.append_metrics(
+        {"capacity": 10, "counter_1": 1}, machine_id="1", export_dir=str(tmp_path)
+    )
+    aggregator = generate_report.ReportAggregator(str(tmp_path))
+    aggregator.seed()
+    hourly_data_saving.append_metrics(
+        {"capacity": 5, "counter_1": 2}, machine_id="1", export_dir=str(tmp_path)
+    )
+
+    class Sender:
+        def send(self, msg, to_addrs):
+            pass
+
+    schedules = [{"name": "A", "cron": "* * * * *", "recipients": ["a@example.com"]}]
+    scheduler = rs.ReportScheduler(aggregator, Sender(), lambda: schedules)
+    futures = scheduler.run_due(datetime.now() + timedelta(seconds=1))
+    assert all(f.result(timeout=5) for f in futures)
+    assert rendered == [15]
@@ -1,5 +1,7 @@
+import json
 import os
 import sys
+import threading
 from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
@@ -27,3 +29,67 @@ def test_ip_addresses_roundtrip(tmp_path):
     assert settings.save_ip_addresses(addresses, path=path)
     loaded = settings.load_ip_addresses(path=path)
     assert loaded == addresses
+
+
+def test_settings_are_parsed_once_and_reloaded_on_change(tmp_path, monkeypatch):
+    path = tmp_path / "display.json"
+    path.write_text('{"language": "es"}')
+
+    parsed = []
+    parse = settings.SettingsCache._parse
+    monkeypatch.setattr(
+        settings.SettingsCache, "_parse", staticmethod(lambda p: parsed.append(p) or parse(p))
+    )
+    for _ in range(5):
+        assert settings.load_language_preference(path=path) == "es"
+    assert len(parsed) == 1
+
+    # Saves are visible at once, before they reach the disk
+    assert settings.save_theme_preference("dark", path=path)
+    assert settings.load_theme_preference(path=path) == "dark"
+    assert settings.settings_writer.flush()
+    assert json.loads(path.read_text()) == {"language": "es", "app_theme": "dark"}
+    assert len(parsed) == 1
+
+    # Outside edits are noticed once the check interval has passed
+    path.write_text('{"language": "de", "extra": [1]}')
+    monkeypatch.setattr(settings.settings_cache, "check_interval", 0)
+    assert settings.load_language_preference(path=path) == "de"
+
+    view = settings.settings_cache.get(path)
+    try:
+        view["language"] = "fr"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("cached settings must be read-only")
+    loaded = settings.load_display_settings(path=path)
+    loaded["extra"].append(2)
+    assert view["extra"] == (1,)
+
+
+def test_settings_writer_batches_atomic_writes(tmp_path, monkeypatch):
+    path = tmp_path / "display.json"
+    writer = settings.SettingsWriter(settings.SettingsCache(), delay=60)
+    writes = []
+    atomic = settings._atomic_write_json
+    monkeypatch.setattr(
+        settings, "_atomic_write_json", lambda p, d: writes.append(p) or atomic(p, d)
+    )
+
+    def save(key, value):
+        writer.update(path, lambda current: current.update({key: value}))
+
+    threads = [
+        threading.Thread(target=save, args=(f"key{i}", i)) for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert writes == []
+    assert writer.flush()
+    assert writes == [path]
+    assert json.loads(path.read_text()) == {f"key{i}": i for i in range(20)}
+    assert [p.name for p in tmp_path.iterdir()] == ["display.json"]
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dashboard.trends import (
+    DEFECT_COUNT_TAG,
+    OBJECTS_PER_MIN_TAG,
+    TrendRecorder,
+)
+
+
+def test_samples_are_taken_at_a_fixed_rate():
+    trends = TrendRecorder(window=3, interval=1.0)
+
+    assert trends.sample("m1", {OBJECTS_PER_MIN_TAG: 1}, now=0.0)
+    # Faster polls (or more viewers) do not advance the trend
+    assert not trends.sample("m1", {OBJECTS_PER_MIN_TAG: 99}, now=0.2)
+    assert trends.sample("m1", {OBJECTS_PER_MIN_TAG: 2}, now=0.9)
+    # A stalled poller resumes without back-filling the gap
+    assert trends.sample("m1", {OBJECTS_PER_MIN_TAG: 3}, now=10.0)
+    assert not trends.sample("m1", {OBJECTS_PER_MIN_TAG: 99}, now=10.4)
+    assert trends.sample("m1", {OBJECTS_PER_MIN_TAG: 4}, now=11.0)
+
+    view = trends.view("m1")
+    assert view.samples == 4
+    assert view.production == (2, 3, 4)
+
+
+def test_buffers_are_per_machine_and_views_are_copies():
+    trends = TrendRecorder()
+    trends.sample("m1", {DEFECT_COUNT_TAG.format(2): 5}, now=0.0)
+    view = trends.view("m1")
+
+    assert view.latest_counters == [0, 5] + [0] * 10
+    assert trends.view("m2").samples == 0
+
+    # Missing counters repeat their last value
+    trends.sample("m1", {OBJECTS_PER_MIN_TAG: 7}, now=1.0)
+    assert trends.view("m1").counters[1] == (5, 5)
+    assert view.samples == 1 and view.production == (0,)